@@ -1,40 +1,182 @@
+import io
+import csv
+import json
 import time
+import zlib
+import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import Optional
-from fastapi import APIRouter, HTTPException, Depends, Query
-from fastapi.responses import JSONResponse
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List
+from fastapi import APIRouter, HTTPException, Depends, Query, Header, Request, UploadFile, File, Form
+from fastapi.responses import JSONResponse, Response, StreamingResponse, PlainTextResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, func, or_, and_, update
 from app.models.schemas import (
     TextTransformRequest,
     TextTransformResponse,
+    DocumentTransformRequest,
+    DocumentTransformResponse,
     BatchTransformRequest,
     BatchTransformResponse,
+    DiffRequest,
+    DiffResponse,
+    JobCreateRequest,
+    JobResponse,
+    JobResultsResponse,
+    JobItemResult,
+    QualityMode,
+    ExportFormat,
+    TransformationType,
     HealthResponse,
     ErrorResponse,
     HistoryResponse,
     HistoryItem,
     SaveHistoryRequest,
-    DeleteHistoryRequest
+    DeleteHistoryRequest,
+    BulkHistoryAction,
+    BulkHistoryRequest,
+    BulkHistoryResponse,
+    ProfilingConfigRequest
 )
-from app.models.database import TransformationHistory
+from app.models.database import TransformationHistory, TransformationJob, TransformationJobItem
 from app.services.text_processor_simple import text_processor
+from app.services.document_processor import document_processor
+from app.services.quality_gate import quality_gate, QUALITY_FIELDS
+from app.services.model_router import model_router
+from app.services.prompt_registry import prompt_registry
+from app.services.job_manager import job_manager
+from app.services.history_version import history_versions
+from app.services.usage_rollup import usage_rollups
+from app.services.admission import admission_controller
+from app.services.cache_warmer import cache_warmer
+from app.services.profiler import profiler
 from app.utils.helpers import (
     cache,
     validate_text_input,
-    sanitize_text,
+    prepare_text,
+    count_words,
+    PreparedText,
     create_error_response,
-    format_processing_time
+    format_processing_time,
+    make_etag,
+    etag_matches
 )
+from app.utils.diff import diff_service
+from app.utils.metrics import metrics
+from app.utils.cancellation import run_until_disconnect, stream_until_disconnect
+from app.utils.deadline import Deadline, DeadlineExceeded
+from app.utils.timing import span
 from app.core.config import settings
-from app.core.database import get_db, check_db_connection
+from app.core.security import require_admin
+from app.core.database import get_db, check_db_connection, SessionLocal, limit_statement_time
+from app.core.responses import ORJSONResponse, ndjson_line
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Response fields with their defaults, so hot routes can serialize result
+# dicts and ORM rows directly instead of building Pydantic models first
+TRANSFORM_RESPONSE_FIELDS = {
+    name: field.get_default(call_default_factory=True)
+    for name, field in TextTransformResponse.model_fields.items()
+}
+HISTORY_COLUMNS = [
+    getattr(TransformationHistory, name)
+    for name in HistoryItem.model_fields if name != "diff"
+]
+
+HISTORY_TEXT_FIELDS = ("original_text", "transformed_text")
+
+def _history_columns(fields: Optional[str], preview_chars: Optional[int], include_diff: bool) -> list:
+    """Select requested history columns, truncating the texts in SQL."""
+    names = [column.key for column in HISTORY_COLUMNS]
+    if fields:
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = requested - set(names) - {"diff"}
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown history fields: {', '.join(sorted(unknown))}"
+            )
+        # Diffs need both texts; id is always returned so items can be fetched in full
+        if include_diff:
+            requested.update(HISTORY_TEXT_FIELDS)
+        names = [name for name in names if name in requested or name == "id"]
+    
+    columns = []
+    for name in names:
+        column = getattr(TransformationHistory, name)
+        if preview_chars and name in HISTORY_TEXT_FIELDS:
+            column = func.substr(column, 1, preview_chars).label(name)
+        columns.append(column)
+    return columns
+
+async def _attach_diffs(items: list, include_diff: bool):
+    """Set each item's diff spans (or None) in place."""
+    diffs = [None] * len(items)
+    if include_diff:
+        diffs = await asyncio.gather(*[
+            diff_service.diff(item['original_text'], item['transformed_text'])
+            for item in items
+        ])
+    for item, diff in zip(items, diffs):
+        item['diff'] = diff['spans'] if diff else None
+
+def _direct_response(data: dict, fields: dict) -> ORJSONResponse:
+    """Serialize a result dict as-is, limited to a response model's fields."""
+    return ORJSONResponse({name: data.get(name, default) for name, default in fields.items()})
+
+# Static catalog, serialized once; its ETag changes only when the content does
+TRANSFORMATIONS_CATALOG = {
+    "grammar_fix": {
+        "name": "Grammar Fix",
+        "description": "Fix grammar, spelling, and punctuation errors",
+        "icon": "✏️"
+    },
+    "formal": {
+        "name": "Formal",
+        "description": "Convert to formal, professional tone",
+        "icon": "👔"
+    },
+    "friendly": {
+        "name": "Friendly",
+        "description": "Make text warm and conversational",
+        "icon": "😊"
+    },
+    "shorten": {
+        "name": "Shorten",
+        "description": "Make text more concise",
+        "icon": "✂️"
+    },
+    "expand": {
+        "name": "Expand",
+        "description": "Add more details and explanations",
+        "icon": "📝"
+    },
+    "bullet": {
+        "name": "Bullet Points",
+        "description": "Convert to bullet point format",
+        "icon": "•"
+    },
+    "emoji": {
+        "name": "Add Emojis",
+        "description": "Add appropriate emojis to text",
+        "icon": "😎"
+    },
+    "tweetify": {
+        "name": "Tweetify",
+        "description": "Convert to tweet format",
+        "icon": "🐦"
+    }
+}
+CATALOG_BODY = ORJSONResponse({
+    "transformations": TRANSFORMATIONS_CATALOG,
+    "total_count": len(TRANSFORMATIONS_CATALOG)
+}).body
+CATALOG_ETAG = make_etag(CATALOG_BODY.decode())
+
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint."""
@@ -47,7 +189,6 @@ async def health_check():
             app_name=settings.app_name,
             version=settings.app_version,
             groq_api_status=groq_status.get("status", "unknown"),
-            langchain_status="active" if settings.langchain_tracing_v2 else "inactive",
             database_status=db_status,
             timestamp=datetime.now().isoformat()
         )
@@ -58,53 +199,83 @@ async def health_check():
             app_name=settings.app_name,
             version=settings.app_version,
             groq_api_status="error",
-            langchain_status="disabled",
             database_status="error",
             timestamp=datetime.now().isoformat()
         )
 
+def _request_deadline(header: Optional[str], field: Optional[float]) -> Deadline:
+    """Deadline from the request's timeout field or X-Request-Timeout header."""
+    try:
+        return Deadline.from_request(header, field)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="X-Request-Timeout must be a positive number of seconds")
+
+def _deadline_exceeded(route: str, error: DeadlineExceeded) -> HTTPException:
+    metrics.increment("deadlines_exceeded", route=route)
+    logger.warning(f"⏱️ {route}: {str(error)}")
+    return HTTPException(status_code=504, detail=str(error))
+
+def _limit_history_write(db: Session, deadline: Deadline):
+    """Give the history write the remaining budget, but never less than the floor."""
+    limit_statement_time(db, max(deadline.remaining(), settings.db_write_min_budget))
+
 @router.post("/transform", response_model=TextTransformResponse)
-async def transform_text(request: TextTransformRequest, db: Session = Depends(get_db)):
+async def transform_text(
+    request: TextTransformRequest,
+    http_request: Request,
+    db: Session = Depends(get_db),
+    x_request_timeout: Optional[str] = Header(None)
+):
     """Transform text using the specified transformation type."""
+    deadline = _request_deadline(x_request_timeout, request.timeout)
+    return await run_until_disconnect(http_request, _transform_text(request, db, deadline), "transform")
+
+async def _transform_text(request: TextTransformRequest, db: Session, deadline: Deadline):
     history_id = None
     
     try:
         logger.info(f"Transform request from user: {request.user_id}")
         
-        is_valid, error_msg = validate_text_input(request.text)
-        if not is_valid:
-            raise HTTPException(status_code=400, detail=error_msg)
-        
-        cleaned_text = sanitize_text(request.text)
+        with span("sanitize"):
+            try:
+                prepared = prepare_text(request.text)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        prompt_version = prompt_registry.version(request.transformation_type)
         
-        cached_result = cache.get(
-            cleaned_text,
-            request.transformation_type.value,
-            request.additional_instructions
-        )
+        with span("cache"):
+            cached_entry = cache.get_entry(
+                prepared,
+                request.transformation_type.value,
+                request.additional_instructions,
+                prompt_version
+            )
         
-        if cached_result:
+        if cached_entry:
             logger.info(f"Returning cached result for {request.transformation_type}")
+            cached_result = cached_entry['result']
             response_data = {
-                "original_text": request.text,
+                "original_text": prepared.text,
                 "transformed_text": cached_result,
                 "transformation_type": request.transformation_type,
                 "processing_time": 0.01,
-                "word_count_original": len(request.text.split()),
-                "word_count_transformed": len(cached_result.split())
+                "word_count_original": prepared.word_count,
+                "word_count_transformed": len(cached_result.split()),
+                # Entries warmed from history don't know which provider produced them
+                "engine": cached_entry['meta'].get('engine', "cache"),
+                "model": cached_entry['meta'].get('model'),
+                "prompt_version": prompt_version,
+                "cached": True,
+                # Scored when it was cached
+                **{name: cached_entry['meta'][name] for name in QUALITY_FIELDS if name in cached_entry['meta']}
             }
         else:
             result = await text_processor.transform_text(
-                cleaned_text,
+                prepared,
                 request.transformation_type,
-                request.additional_instructions
-            )
-            
-            cache.set(
-                cleaned_text,
-                request.transformation_type.value,
-                result['transformed_text'],
-                request.additional_instructions
+                request.additional_instructions,
+                request.quality,
+                deadline
             )
             
             response_data = {
@@ -113,9 +284,45 @@ async def transform_text(request: TextTransformRequest, db: Session = Depends(ge
                 "transformation_type": result['transformation_type'],
                 "processing_time": result['processing_time'],
                 "word_count_original": result['word_count_original'],
-                "word_count_transformed": result['word_count_transformed']
+                "word_count_transformed": result['word_count_transformed'],
+                "engine": result['engine'],
+                "model": result.get('model'),
+                "prompt_version": result.get('prompt_version')
             }
         
+        if 'quality_flags' not in response_data:
+            with span("quality"):
+                response_data = (await quality_gate.review(
+                    [response_data],
+                    request.transformation_type,
+                    request.additional_instructions,
+                    deadline
+                ))[0]
+        
+        # Local results are approximations; leave the slot for Groq
+        cache_key = None
+        if response_data.get('cached') or response_data['engine'] != "local":
+            cache_key = cache.make_key(
+                prepared,
+                request.transformation_type.value,
+                request.additional_instructions,
+                response_data['prompt_version']
+            )
+        if not response_data.get('cached') and response_data['engine'] != "local":
+            cache.set(
+                prepared,
+                request.transformation_type.value,
+                response_data['transformed_text'],
+                request.additional_instructions,
+                response_data['prompt_version'],
+                processing_time=response_data['processing_time'],
+                meta={
+                    "engine": response_data['engine'],
+                    "model": response_data.get('model'),
+                    **{name: response_data[name] for name in QUALITY_FIELDS if name in response_data}
+                }
+            )
+        
         # Save to history
         try:
             logger.info(f"Attempting to save history for user: {request.user_id}")
@@ -123,6 +330,9 @@ async def transform_text(request: TextTransformRequest, db: Session = Depends(ge
             # Use the true original text if provided (for multi-transform chains)
             # Otherwise use the input text
             true_original_text = request.original_text if request.original_text else request.text
+            word_count_original = (
+                count_words(request.original_text) if request.original_text else prepared.word_count
+            )
             
             history_record = TransformationHistory(
                 user_id=request.user_id or "anonymous",
@@ -131,14 +341,21 @@ async def transform_text(request: TextTransformRequest, db: Session = Depends(ge
                 transformation_type=request.transformation_type.value,
                 additional_instructions=request.additional_instructions,
                 processing_time=response_data['processing_time'],
-                word_count_original=len(true_original_text.split()),
+                word_count_original=word_count_original,
                 word_count_transformed=response_data['word_count_transformed'],
+                prompt_version=response_data.get('prompt_version'),
+                cache_key=cache_key,
+                cache_hit=bool(response_data.get('cached')),
                 is_saved=False
             )
             
-            db.add(history_record)
-            db.commit()
-            db.refresh(history_record)
+            with span("db"):
+                _limit_history_write(db, deadline)
+                db.add(history_record)
+                history_versions.bump(db, [history_record.user_id])
+                usage_rollups.record(db, [history_record])
+                db.commit()
+                db.refresh(history_record)
             
             history_id = history_record.id
             logger.info(f"✅ Successfully saved to history with ID: {history_id}")
@@ -151,10 +368,17 @@ async def transform_text(request: TextTransformRequest, db: Session = Depends(ge
         
         response_data['history_id'] = history_id
         
-        return TextTransformResponse(**response_data)
+        if request.include_diff:
+            with span("diff"):
+                diff = await diff_service.diff(response_data['original_text'], response_data['transformed_text'])
+            response_data['diff'] = diff['spans']
+        
+        return _direct_response(response_data, TRANSFORM_RESPONSE_FIELDS)
         
     except HTTPException:
         raise
+    except DeadlineExceeded as e:
+        raise _deadline_exceeded("transform", e)
     except Exception as e:
         logger.error(f"Error in transform_text: {str(e)}")
         error_response = create_error_response(str(e), 500)
@@ -163,47 +387,191 @@ async def transform_text(request: TextTransformRequest, db: Session = Depends(ge
             detail=error_response["message"]
         )
 
-@router.post("/batch-transform", response_model=BatchTransformResponse)
-async def batch_transform_text(request: BatchTransformRequest, db: Session = Depends(get_db)):
-    """Transform multiple texts at once."""
+@router.post("/transform/document", response_model=DocumentTransformResponse)
+async def transform_document(
+    request: DocumentTransformRequest,
+    http_request: Request,
+    db: Session = Depends(get_db),
+    x_request_timeout: Optional[str] = Header(None)
+):
+    """Transform a long document in chunks, optionally streaming the result."""
+    deadline = _request_deadline(x_request_timeout, request.timeout)
+    return await run_until_disconnect(
+        http_request,
+        _transform_document(request, http_request, db, deadline),
+        "transform_document"
+    )
+
+async def _transform_document(request: DocumentTransformRequest, http_request: Request, db: Session, deadline: Deadline):
     try:
-        for i, text in enumerate(request.texts):
-            is_valid, error_msg = validate_text_input(text)
-            if not is_valid:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Text at index {i}: {error_msg}"
-                )
+        logger.info(f"Document transform request from user: {request.user_id}")
         
-        cleaned_texts = [sanitize_text(text) for text in request.texts]
+        is_valid, error_msg = validate_text_input(request.text, settings.max_document_length)
+        if not is_valid:
+            raise HTTPException(status_code=400, detail=error_msg)
         
-        result = await text_processor.batch_transform(
-            cleaned_texts,
+        if request.stream:
+            return StreamingResponse(
+                stream_until_disconnect(http_request, _stream_document(request, deadline), "transform_document_stream"),
+                media_type="application/x-ndjson"
+            )
+        
+        result = await document_processor.transform_document(
+            request.text,
             request.transformation_type,
-            request.additional_instructions
+            request.additional_instructions,
+            request.quality,
+            deadline
         )
         
         try:
-            for i, res in enumerate(result['results']):
-                history_record = TransformationHistory(
-                    user_id=request.user_id or "anonymous",
-                    original_text=res['original_text'],
-                    transformed_text=res['transformed_text'],
-                    transformation_type=request.transformation_type.value,
-                    additional_instructions=request.additional_instructions,
-                    processing_time=res['processing_time'],
-                    word_count_original=res['word_count_original'],
-                    word_count_transformed=res['word_count_transformed'],
-                    is_saved=False
-                )
+            history_record = TransformationHistory(
+                user_id=request.user_id or "anonymous",
+                original_text=result['original_text'],
+                transformed_text=result['transformed_text'],
+                transformation_type=request.transformation_type.value,
+                additional_instructions=request.additional_instructions,
+                processing_time=result['processing_time'],
+                word_count_original=result['word_count_original'],
+                word_count_transformed=result['word_count_transformed'],
+                is_saved=False
+            )
+            with span("db"):
+                _limit_history_write(db, deadline)
                 db.add(history_record)
-            
-            db.commit()
-            logger.info(f"Saved {len(result['results'])} items to history")
+                history_versions.bump(db, [history_record.user_id])
+                usage_rollups.record(db, [history_record])
+                db.commit()
+                db.refresh(history_record)
+            result['history_id'] = history_record.id
         except Exception as e:
-            logger.error(f"Failed to save batch history: {str(e)}")
+            logger.error(f"Failed to save document history: {str(e)}")
             db.rollback()
         
+        return DocumentTransformResponse(**result)
+        
+    except HTTPException:
+        raise
+    except DeadlineExceeded as e:
+        raise _deadline_exceeded("transform_document", e)
+    except Exception as e:
+        logger.error(f"Error in transform_document: {str(e)}")
+        error_response = create_error_response(str(e), 500)
+        raise HTTPException(
+            status_code=error_response["status_code"],
+            detail=error_response["message"]
+        )
+
+async def _stream_document(request: DocumentTransformRequest, deadline: Deadline):
+    """Yield NDJSON lines for each chunk in order, then a summary line."""
+    start_time = time.time()
+    original_parts = []
+    transformed_parts = []
+    cached_chunks = 0
+    local_chunks = 0
+    skipped_chunks = 0
+    
+    try:
+        async for chunk in document_processor.stream_document(
+            request.text,
+            request.transformation_type,
+            request.additional_instructions,
+            request.quality,
+            deadline
+        ):
+            original_parts.append(chunk['original_text'] + chunk['separator'])
+            transformed_parts.append(chunk['transformed_text'] + chunk['separator'])
+            cached_chunks += chunk['cached']
+            local_chunks += chunk['engine'] == "local"
+            skipped_chunks += chunk['skipped']
+            yield ndjson_line({"type": "chunk", **chunk})
+    except Exception as e:
+        logger.error(f"Error streaming document: {str(e)}")
+        yield ndjson_line({"type": "error", "message": str(e)})
+        return
+    
+    original_text = "".join(original_parts).strip()
+    transformed_text = "".join(transformed_parts).strip()
+    summary = {
+        "type": "summary",
+        "transformation_type": request.transformation_type.value,
+        "processing_time": round(time.time() - start_time, 2),
+        "word_count_original": len(original_text.split()),
+        "word_count_transformed": len(transformed_text.split()),
+        "total_chunks": len(transformed_parts),
+        "cached_chunks": cached_chunks,
+        "local_chunks": local_chunks,
+        "skipped_chunks": skipped_chunks,
+        "history_id": None
+    }
+    if skipped_chunks:
+        metrics.increment("deadlines_exceeded", route="transform_document_stream")
+    
+    # The request-scoped session is closed once streaming starts
+    db = SessionLocal()
+    try:
+        history_record = TransformationHistory(
+            user_id=request.user_id or "anonymous",
+            original_text=original_text,
+            transformed_text=transformed_text,
+            transformation_type=request.transformation_type.value,
+            additional_instructions=request.additional_instructions,
+            processing_time=summary['processing_time'],
+            word_count_original=summary['word_count_original'],
+            word_count_transformed=summary['word_count_transformed'],
+            is_saved=False
+        )
+        _limit_history_write(db, deadline)
+        db.add(history_record)
+        history_versions.bump(db, [history_record.user_id])
+        usage_rollups.record(db, [history_record])
+        db.commit()
+        summary['history_id'] = history_record.id
+    except Exception as e:
+        logger.error(f"Failed to save document history: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
+    
+    yield ndjson_line(summary)
+
+@router.post("/batch-transform", response_model=BatchTransformResponse)
+async def batch_transform_text(
+    request: BatchTransformRequest,
+    http_request: Request,
+    db: Session = Depends(get_db),
+    x_request_timeout: Optional[str] = Header(None)
+):
+    """Transform multiple texts at once; texts unfinished at the deadline are returned as failed."""
+    deadline = _request_deadline(x_request_timeout, request.timeout)
+    return await run_until_disconnect(http_request, _batch_transform_text(request, db, deadline), "batch_transform")
+
+async def _batch_transform_text(request: BatchTransformRequest, db: Session, deadline: Deadline):
+    try:
+        with span("sanitize"):
+            prepared_texts = _prepare_batch_texts(request.texts)
+        
+        result = await text_processor.batch_transform(
+            prepared_texts,
+            request.transformation_type,
+            request.additional_instructions,
+            request.quality,
+            deadline
+        )
+        if result['deadline_exceeded']:
+            metrics.increment("deadlines_exceeded", route="batch_transform")
+        
+        with span("quality"):
+            result['results'] = await quality_gate.review(
+                result['results'],
+                request.transformation_type,
+                request.additional_instructions,
+                deadline
+            )
+        
+        with span("db"):
+            _save_batch_history(db, request, result['results'], deadline)
+        
         return BatchTransformResponse(**result)
         
     except HTTPException:
@@ -216,6 +584,294 @@ async def batch_transform_text(request: BatchTransformRequest, db: Session = Dep
             detail=error_response["message"]
         )
 
+def _prepare_batch_texts(texts: list) -> List[PreparedText]:
+    """Prepare every text in a batch, rejecting the batch if any text is invalid."""
+    prepared_texts = []
+    for i, text in enumerate(texts):
+        try:
+            prepared_texts.append(prepare_text(text))
+        except ValueError as e:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Text at index {i}: {str(e)}"
+            )
+    return prepared_texts
+
+def _save_batch_history(db: Session, request: BatchTransformRequest, results: list, deadline: Deadline):
+    """Save batch results to history in a single commit."""
+    try:
+        _limit_history_write(db, deadline)
+        records = []
+        for res in results:
+            history_record = TransformationHistory(
+                user_id=request.user_id or "anonymous",
+                original_text=res['original_text'],
+                transformed_text=res['transformed_text'],
+                transformation_type=request.transformation_type.value,
+                additional_instructions=request.additional_instructions,
+                processing_time=res['processing_time'],
+                word_count_original=res['word_count_original'],
+                word_count_transformed=res['word_count_transformed'],
+                prompt_version=res.get('prompt_version'),
+                is_saved=False
+            )
+            db.add(history_record)
+            records.append(history_record)
+        
+        history_versions.bump(db, [request.user_id or "anonymous"])
+        usage_rollups.record(db, records)
+        db.commit()
+        logger.info(f"Saved {len(results)} items to history")
+    except Exception as e:
+        logger.error(f"Failed to save batch history: {str(e)}")
+        db.rollback()
+
+@router.post("/batch-transform/stream")
+async def batch_transform_stream(
+    request: BatchTransformRequest,
+    http_request: Request,
+    x_request_timeout: Optional[str] = Header(None)
+):
+    """Transform multiple texts, streaming each result as NDJSON as it completes."""
+    prepared_texts = _prepare_batch_texts(request.texts)
+    deadline = _request_deadline(x_request_timeout, request.timeout)
+    return StreamingResponse(
+        stream_until_disconnect(
+            http_request,
+            _stream_batch(request, prepared_texts, deadline),
+            "batch_transform_stream"
+        ),
+        media_type="application/x-ndjson"
+    )
+
+async def _stream_batch(request: BatchTransformRequest, prepared_texts: List[PreparedText], deadline: Deadline):
+    """Yield one result line per text in completion order, then a summary line."""
+    start_time = time.time()
+    results = []
+    successful = 0
+    deadline_exceeded = False
+    
+    async for index, res in text_processor.iter_batch_transform(
+        prepared_texts,
+        request.transformation_type,
+        request.additional_instructions,
+        request.quality,
+        deadline
+    ):
+        deadline_exceeded = deadline_exceeded or res.get('deadline_exceeded', False)
+        if not res.get('failed'):
+            successful += 1
+            res = (await quality_gate.review(
+                [res],
+                request.transformation_type,
+                request.additional_instructions,
+                deadline
+            ))[0]
+        results.append(res)
+        yield ndjson_line({
+            "type": "result",
+            "index": index,
+            **{name: res.get(name, default) for name, default in TRANSFORM_RESPONSE_FIELDS.items()}
+        })
+    
+    # The request-scoped session is closed once streaming starts
+    db = SessionLocal()
+    try:
+        _save_batch_history(db, request, results, deadline)
+    finally:
+        db.close()
+    
+    if deadline_exceeded:
+        metrics.increment("deadlines_exceeded", route="batch_transform_stream")
+    yield ndjson_line({
+        "type": "summary",
+        "total_processing_time": round(time.time() - start_time, 2),
+        "successful_transformations": successful,
+        "failed_transformations": len(results) - successful,
+        "deadline_exceeded": deadline_exceeded
+    })
+
+def _validate_job_texts(texts: list):
+    """Reject a job whose size or items are out of bounds."""
+    if not texts:
+        raise HTTPException(status_code=400, detail="Job must contain at least one text")
+    if len(texts) > settings.max_job_items:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many texts. Maximum {settings.max_job_items} items per job"
+        )
+    for i, text in enumerate(texts):
+        is_valid, error_msg = validate_text_input(text)
+        if not is_valid:
+            raise HTTPException(status_code=400, detail=f"Text at index {i}: {error_msg}")
+
+def _get_job_or_404(db: Session, job_id: str) -> TransformationJob:
+    job = db.query(TransformationJob).filter(TransformationJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.post("/jobs", response_model=JobResponse, status_code=202)
+async def create_job(request: JobCreateRequest, db: Session = Depends(get_db)):
+    """Submit a bulk transformation job processed in the background."""
+    _validate_job_texts(request.texts)
+    try:
+        job = job_manager.submit(
+            db,
+            request.texts,
+            request.transformation_type,
+            request.additional_instructions,
+            request.quality,
+            request.user_id or "anonymous"
+        )
+        return JobResponse(**job.to_dict())
+    except Exception as e:
+        logger.error(f"Error creating job: {str(e)}")
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to create job: {str(e)}")
+
+@router.post("/jobs/upload", response_model=JobResponse, status_code=202)
+async def upload_job(
+    file: UploadFile = File(..., description="JSONL file: one JSON string or {\"text\": ...} object per line"),
+    transformation_type: TransformationType = Form(...),
+    additional_instructions: Optional[str] = Form(None),
+    user_id: str = Form("anonymous"),
+    quality: QualityMode = Form(QualityMode.STANDARD),
+    db: Session = Depends(get_db)
+):
+    """Submit a bulk transformation job from a JSONL upload."""
+    texts = []
+    line_number = 0
+    try:
+        async for line in _iter_upload_lines(file):
+            line_number += 1
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if isinstance(entry, dict):
+                if "text" not in entry:
+                    raise ValueError('missing "text"')
+                entry = entry["text"]
+                if not isinstance(entry, str):
+                    raise TypeError('"text" must be a string')
+            texts.append(entry if isinstance(entry, str) else str(entry))
+    except (ValueError, KeyError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSONL at line {line_number}: {str(e)}")
+    
+    _validate_job_texts(texts)
+    try:
+        job = job_manager.submit(db, texts, transformation_type, additional_instructions, quality, user_id)
+        return JobResponse(**job.to_dict())
+    except Exception as e:
+        logger.error(f"Error creating job from upload: {str(e)}")
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to create job: {str(e)}")
+
+async def _iter_upload_lines(file: UploadFile):
+    """Yield decoded lines from an upload without reading it all at once."""
+    buffer = b""
+    while chunk := await file.read(64 * 1024):
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8")
+    if buffer:
+        yield buffer.decode("utf-8")
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str, db: Session = Depends(get_db)):
+    """Get job status and progress."""
+    job = _get_job_or_404(db, job_id)
+    return JobResponse(**job.to_dict())
+
+@router.get("/jobs/{job_id}/results", response_model=JobResultsResponse)
+async def get_job_results(
+    job_id: str,
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(100, ge=1, le=1000, description="Items per page"),
+    status: Optional[str] = Query(None, description="Filter by item status"),
+    db: Session = Depends(get_db)
+):
+    """Get a page of job results in input order."""
+    job = _get_job_or_404(db, job_id)
+    try:
+        query = db.query(TransformationJobItem).filter(TransformationJobItem.job_id == job_id)
+        if status:
+            query = query.filter(TransformationJobItem.status == status)
+        
+        total_count = query.count()
+        items = query.order_by(TransformationJobItem.item_index)\
+            .offset((page - 1) * page_size)\
+            .limit(page_size)\
+            .all()
+        
+        return JobResultsResponse(
+            job_id=job_id,
+            status=job.status,
+            items=[JobItemResult(**item.to_dict()) for item in items],
+            total_count=total_count,
+            page=page,
+            page_size=page_size,
+            has_more=(page * page_size) < total_count
+        )
+    except Exception as e:
+        logger.error(f"Error fetching job results: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch job results: {str(e)}")
+
+@router.get("/jobs/{job_id}/results/stream")
+async def stream_job_results(job_id: str, db: Session = Depends(get_db)):
+    """Stream all finished job results as newline-delimited JSON."""
+    _get_job_or_404(db, job_id)
+    return StreamingResponse(_iter_job_results(job_id), media_type="application/x-ndjson")
+
+def _iter_job_results(job_id: str, batch_size: int = 500):
+    """Yield NDJSON lines for a job's items using keyset pagination."""
+    db = SessionLocal()
+    try:
+        last_index = -1
+        while True:
+            items = db.query(TransformationJobItem).filter(
+                TransformationJobItem.job_id == job_id,
+                TransformationJobItem.item_index > last_index
+            ).order_by(TransformationJobItem.item_index).limit(batch_size).all()
+            if not items:
+                break
+            for item in items:
+                yield ndjson_line(item.to_dict())
+            last_index = items[-1].item_index
+            db.expunge_all()
+    finally:
+        db.close()
+
+@router.post("/jobs/{job_id}/cancel", response_model=JobResponse)
+async def cancel_job(job_id: str, db: Session = Depends(get_db)):
+    """Cancel a queued or running job."""
+    job = _get_job_or_404(db, job_id)
+    try:
+        job = job_manager.cancel(db, job)
+        return JobResponse(**job.to_dict())
+    except Exception as e:
+        logger.error(f"Error cancelling job: {str(e)}")
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to cancel job: {str(e)}")
+
+@router.post("/diff", response_model=DiffResponse)
+async def diff_texts(request: DiffRequest):
+    """Compute word-level diff spans between two texts."""
+    for field, text in (("original_text", request.original_text), ("transformed_text", request.transformed_text)):
+        if len(text) > settings.max_document_length:
+            raise HTTPException(
+                status_code=400,
+                detail=f"{field} is too long. Maximum {settings.max_document_length} characters allowed"
+            )
+    
+    try:
+        result = await diff_service.diff(request.original_text, request.transformed_text)
+        return DiffResponse(**result)
+    except Exception as e:
+        logger.error(f"Error computing diff: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to compute diff")
+
 @router.get("/history", response_model=HistoryResponse)
 async def get_history(
     user_id: str = Query("anonymous", description="User ID"),
@@ -223,14 +879,38 @@ async def get_history(
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     transformation_type: Optional[str] = Query(None, description="Filter by transformation type"),
     saved_only: bool = Query(False, description="Show only saved items"),
+    include_diff: bool = Query(False, description="Include word-level diff spans per item"),
+    fields: Optional[str] = Query(None, description="Comma-separated item fields to return (id is always included)"),
+    preview_chars: Optional[int] = Query(None, ge=1, le=5000, description="Truncate original/transformed text to this many characters"),
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db)
 ):
     """Get transformation history for a user (last 7 days)."""
+    if include_diff and preview_chars:
+        raise HTTPException(
+            status_code=400,
+            detail="include_diff needs full texts; fetch GET /history/{id} for a single item's diff"
+        )
+    columns = _history_columns(fields, preview_chars, include_diff)
+    
     try:
         logger.info(f"Fetching history for user: {user_id}")
         
         seven_days_ago = datetime.now() - timedelta(days=settings.history_retention_days)
         
+        # Weak ETag from the user's history version and the query; the hourly
+        # retention bucket makes clients revalidate as old items age out
+        etag = make_etag(
+            user_id,
+            history_versions.get(db, user_id),
+            seven_days_ago.strftime("%Y%m%d%H"),
+            page, page_size, transformation_type, saved_only, include_diff, fields, preview_chars,
+            weak=True
+        )
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        
         query = db.query(TransformationHistory).filter(
             TransformationHistory.user_id == user_id,
             TransformationHistory.created_at >= seven_days_ago
@@ -245,25 +925,159 @@ async def get_history(
         total_count = query.count()
         logger.info(f"Found {total_count} history items")
         
-        items = query.order_by(desc(TransformationHistory.created_at))\
+        rows = query.with_entities(*columns)\
+            .order_by(desc(TransformationHistory.created_at))\
             .offset((page - 1) * page_size)\
             .limit(page_size)\
             .all()
+        items = [row._asdict() for row in rows]
         
-        history_items = [HistoryItem(**item.to_dict()) for item in items]
+        if not fields or include_diff:
+            await _attach_diffs(items, include_diff)
         
-        return HistoryResponse(
-            items=history_items,
-            total_count=total_count,
-            page=page,
-            page_size=page_size,
-            has_more=(page * page_size) < total_count
-        )
+        return ORJSONResponse({
+            "items": items,
+            "total_count": total_count,
+            "page": page,
+            "page_size": page_size,
+            "has_more": (page * page_size) < total_count
+        }, headers=headers)
         
     except Exception as e:
         logger.error(f"Error fetching history: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch history: {str(e)}")
 
+@router.get("/history/export")
+async def export_history(
+    user_id: str = Query("anonymous", description="User ID"),
+    all_users: bool = Query(False, description="Export every user's history (admin only)"),
+    format: ExportFormat = Query(ExportFormat.JSONL, description="jsonl or csv"),
+    since: Optional[datetime] = Query(None, description="Only items created at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only items created before this time"),
+    transformation_type: Optional[str] = Query(None, description="Filter by transformation type"),
+    saved_only: bool = Query(False, description="Export only saved items"),
+    gzip: bool = Query(False, description="Return a .gz file"),
+    x_admin_token: Optional[str] = Header(None)
+):
+    """Stream a user's whole history (or everyone's, for admins) as JSONL or CSV."""
+    if all_users:
+        await require_admin(x_admin_token)
+    # created_at is stored as naive UTC
+    since, until = (
+        value.astimezone(timezone.utc).replace(tzinfo=None) if value and value.tzinfo else value
+        for value in (since, until)
+    )
+    if since and until and since >= until:
+        raise HTTPException(status_code=400, detail="since must be before until")
+    
+    filters = []
+    if not all_users:
+        filters.append(TransformationHistory.user_id == user_id)
+    if since:
+        filters.append(TransformationHistory.created_at >= since)
+    if until:
+        filters.append(TransformationHistory.created_at < until)
+    if transformation_type:
+        filters.append(TransformationHistory.transformation_type == transformation_type)
+    if saved_only:
+        filters.append(TransformationHistory.is_saved == True)
+    
+    logger.info(f"Exporting history as {format.value} for {'all users' if all_users else user_id}")
+    filename = f"history.{format.value}" + (".gz" if gzip else "")
+    media_type = "application/x-ndjson" if format == ExportFormat.JSONL else "text/csv; charset=utf-8"
+    chunks = _iter_history_export(filters, format)
+    if gzip:
+        chunks = _gzip_chunks(chunks)
+        media_type = "application/gzip"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+def _iter_history_export(filters: list, format: ExportFormat):
+    """Yield export chunks one keyset page at a time, oldest first.
+    
+    Pages resume after the last (created_at, id) seen, so each query is an
+    index range scan and memory stays constant however large the history is.
+    """
+    names = [column.key for column in HISTORY_COLUMNS]
+    if format == ExportFormat.CSV:
+        yield _csv_rows([names])
+    db = SessionLocal()
+    try:
+        last = None
+        while True:
+            query = db.query(*HISTORY_COLUMNS).filter(*filters)
+            if last is not None:
+                query = query.filter(or_(
+                    TransformationHistory.created_at > last.created_at,
+                    and_(TransformationHistory.created_at == last.created_at, TransformationHistory.id > last.id)
+                ))
+            rows = query.order_by(TransformationHistory.created_at, TransformationHistory.id)\
+                .limit(settings.history_export_batch_size)\
+                .all()
+            if not rows:
+                break
+            if format == ExportFormat.CSV:
+                yield _csv_rows(rows)
+            else:
+                yield b"".join(ndjson_line(row._asdict()) for row in rows)
+            last = rows[-1]
+            # Release the read snapshot between pages
+            db.rollback()
+    finally:
+        db.close()
+
+def _csv_rows(rows) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_csv_value(value) for value in row])
+    return buffer.getvalue().encode("utf-8")
+
+def _csv_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, list):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+def _gzip_chunks(chunks):
+    """Compress a chunk stream into a single gzip member as it is produced."""
+    compressor = zlib.compressobj(min(settings.compression_level, 9), zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+@router.get("/history/{history_id}", response_model=HistoryItem)
+async def get_history_item(
+    history_id: str,
+    include_diff: bool = Query(False, description="Include word-level diff spans"),
+    db: Session = Depends(get_db)
+):
+    """Get a single history item with its full text."""
+    try:
+        row = db.query(TransformationHistory)\
+            .with_entities(*HISTORY_COLUMNS)\
+            .filter(TransformationHistory.id == history_id)\
+            .first()
+        
+        if not row:
+            raise HTTPException(status_code=404, detail="History item not found")
+        
+        item = row._asdict()
+        await _attach_diffs([item], include_diff)
+        return ORJSONResponse(item)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching history item: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch history item: {str(e)}")
+
 @router.post("/history/save")
 async def save_to_history(request: SaveHistoryRequest, db: Session = Depends(get_db)):
     """Mark a history item as saved (permanent)."""
@@ -276,6 +1090,7 @@ async def save_to_history(request: SaveHistoryRequest, db: Session = Depends(get
             raise HTTPException(status_code=404, detail="History item not found")
         
         history_item.is_saved = True
+        history_versions.bump(db, [history_item.user_id])
         db.commit()
         
         logger.info(f"Marked item {request.history_id} as saved")
@@ -293,14 +1108,72 @@ async def save_to_history(request: SaveHistoryRequest, db: Session = Depends(get
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to save item: {str(e)}")
 
+@router.post("/history/bulk", response_model=BulkHistoryResponse)
+async def bulk_update_history(request: BulkHistoryRequest, db: Session = Depends(get_db)):
+    """Save, unsave or tag many of a user's history items with one UPDATE."""
+    if request.action == BulkHistoryAction.TAG:
+        if request.tags is None:
+            raise HTTPException(status_code=400, detail="tags is required for action=tag")
+        values = {"tags": _normalize_tags(request.tags) or None}
+    elif request.tags is not None:
+        raise HTTPException(status_code=400, detail="tags is only used with action=tag")
+    else:
+        values = {"is_saved": request.action == BulkHistoryAction.SAVE}
+    
+    history_ids = list(dict.fromkeys(request.history_ids))
+    # Rows of other users are left alone and reported as not found
+    owned = (
+        TransformationHistory.id.in_(history_ids),
+        TransformationHistory.user_id == request.user_id
+    )
+    try:
+        statement = update(TransformationHistory).where(*owned).values(**values)
+        if db.get_bind().dialect.update_returning:
+            updated = set(db.execute(statement.returning(TransformationHistory.id)).scalars())
+        else:
+            updated = {history_id for (history_id,) in db.query(TransformationHistory.id).filter(*owned)}
+            db.execute(statement)
+        
+        if updated:
+            history_versions.bump(db, [request.user_id])
+        db.commit()
+        
+        logger.info(f"Bulk {request.action.value}: updated {len(updated)} of {len(history_ids)} items")
+        
+        return ORJSONResponse({
+            "action": request.action,
+            "updated_count": len(updated),
+            "not_found_count": len(history_ids) - len(updated),
+            "results": [
+                {"history_id": history_id, "status": "updated" if history_id in updated else "not_found"}
+                for history_id in history_ids
+            ]
+        })
+        
+    except Exception as e:
+        logger.error(f"Error in bulk history {request.action.value}: {str(e)}")
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to update items: {str(e)}")
+
+def _normalize_tags(tags: List[str]) -> List[str]:
+    """Strip and de-duplicate tags, keeping their order."""
+    normalized = list(dict.fromkeys(tag.strip() for tag in tags if tag.strip()))
+    too_long = [tag for tag in normalized if len(tag) > 50]
+    if too_long:
+        raise HTTPException(status_code=400, detail=f"Tags must be at most 50 characters: {too_long[0][:60]}")
+    return normalized
+
 @router.delete("/history")
 async def delete_history(request: DeleteHistoryRequest, db: Session = Depends(get_db)):
     """Delete history items by IDs."""
     try:
-        deleted_count = db.query(TransformationHistory).filter(
+        query = db.query(TransformationHistory).filter(
             TransformationHistory.id.in_(request.history_ids)
-        ).delete(synchronize_session=False)
+        )
+        affected_users = [user_id for (user_id,) in query.with_entities(TransformationHistory.user_id).distinct()]
+        deleted_count = query.delete(synchronize_session=False)
         
+        history_versions.bump(db, affected_users)
         db.commit()
         
         logger.info(f"Deleted {deleted_count} history items")
@@ -321,11 +1194,14 @@ async def cleanup_old_history(db: Session = Depends(get_db)):
     try:
         cutoff_date = datetime.now() - timedelta(days=settings.history_retention_days)
         
-        deleted_count = db.query(TransformationHistory).filter(
+        query = db.query(TransformationHistory).filter(
             TransformationHistory.created_at < cutoff_date,
             TransformationHistory.is_saved == False
-        ).delete(synchronize_session=False)
+        )
+        affected_users = [user_id for (user_id,) in query.with_entities(TransformationHistory.user_id).distinct()]
+        deleted_count = query.delete(synchronize_session=False)
         
+        history_versions.bump(db, affected_users)
         db.commit()
         
         return {
@@ -340,69 +1216,130 @@ async def cleanup_old_history(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to cleanup: {str(e)}")
 
 @router.get("/transformations")
-async def get_available_transformations():
+async def get_available_transformations(if_none_match: Optional[str] = Header(None)):
     """Get list of available transformation types."""
-    transformations = {
-        "grammar_fix": {
-            "name": "Grammar Fix",
-            "description": "Fix grammar, spelling, and punctuation errors",
-            "icon": "✏️"
-        },
-        "formal": {
-            "name": "Formal",
-            "description": "Convert to formal, professional tone",
-            "icon": "👔"
-        },
-        "friendly": {
-            "name": "Friendly",
-            "description": "Make text warm and conversational",
-            "icon": "😊"
-        },
-        "shorten": {
-            "name": "Shorten",
-            "description": "Make text more concise",
-            "icon": "✂️"
-        },
-        "expand": {
-            "name": "Expand",
-            "description": "Add more details and explanations",
-            "icon": "📝"
-        },
-        "bullet": {
-            "name": "Bullet Points",
-            "description": "Convert to bullet point format",
-            "icon": "•"
-        },
-        "emoji": {
-            "name": "Add Emojis",
-            "description": "Add appropriate emojis to text",
-            "icon": "😎"
-        },
-        "tweetify": {
-            "name": "Tweetify",
-            "description": "Convert to tweet format",
-            "icon": "🐦"
-        }
+    headers = {"ETag": CATALOG_ETAG, "Cache-Control": "public, max-age=3600"}
+    if etag_matches(if_none_match, CATALOG_ETAG):
+        return Response(status_code=304, headers=headers)
+    return Response(content=CATALOG_BODY, media_type="application/json", headers=headers)
+
+@router.get("/models")
+async def get_model_routes():
+    """Get registered providers and rolling per-model routing stats."""
+    return {
+        "default_provider": settings.default_provider,
+        "default_model": settings.default_model,
+        "providers": sorted(model_router.providers),
+        "preferences": settings.model_preferences,
+        "routes": model_router.get_stats(),
+        "timestamp": datetime.now().isoformat()
     }
-    
+
+@router.get("/prompts")
+async def get_prompt_versions():
+    """Get active prompt versions and estimated token savings per type."""
+    return {
+        "prompts": prompt_registry.token_savings(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@router.get("/metrics")
+async def get_metrics():
+    """Get this worker's request counters and admission state."""
+    return {
+        "counters": metrics.snapshot(),
+        "admission": admission_controller.get_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@router.get("/stats")
+async def get_usage_stats(
+    user_id: str = Query("anonymous", description="User ID"),
+    all_users: bool = Query(False, description="Usage across all users (admin only)"),
+    days: int = Query(30, ge=1, le=366, description="Number of UTC days, including today"),
+    x_admin_token: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Usage totals, per type and per day, read from the daily rollups."""
+    if all_users:
+        await require_admin(x_admin_token)
+    try:
+        return ORJSONResponse(usage_rollups.get_stats(db, None if all_users else user_id, days))
+    except Exception as e:
+        logger.error(f"Error fetching usage stats: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch usage stats: {str(e)}")
+
+@router.get("/admin/profiling", dependencies=[Depends(require_admin)])
+async def get_profiling_status():
+    """Get this worker's profiling settings and recent profiles."""
     return {
-        "transformations": transformations,
-        "total_count": len(transformations)
+        **profiler.get_status(),
+        "recent": [record.summary() for record in reversed(profiler.profiles)]
     }
 
+@router.put("/admin/profiling", dependencies=[Depends(require_admin)])
+async def configure_profiling(request: ProfilingConfigRequest):
+    """Set the fraction of requests profiled on this worker."""
+    profiler.sample_rate = request.sample_rate
+    logger.info(f"🔬 Profiling sample rate set to {request.sample_rate}")
+    return profiler.get_status()
+
+@router.get("/admin/profiling/{profile_id}", dependencies=[Depends(require_admin)])
+async def download_profile(
+    profile_id: str,
+    format: str = Query("text", pattern="^(text|pstats)$"),
+    sort: str = Query("cumulative", pattern="^(cumulative|tottime|calls)$"),
+    limit: int = Query(40, ge=1, le=500)
+):
+    """Get a profile as a text report, or as a .prof file for pstats/snakeviz."""
+    record = profiler.get(profile_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "pstats":
+        return Response(
+            content=record.dump(),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="{record.id}.prof"'}
+        )
+    return PlainTextResponse(record.text(sort, limit))
+
+@router.post("/admin/memory/snapshot", dependencies=[Depends(require_admin)])
+async def memory_snapshot(
+    limit: int = Query(20, ge=1, le=200),
+    rebase: bool = Query(False, description="Make this snapshot the new baseline")
+):
+    """Start memory tracing, or report allocation growth since the baseline."""
+    return profiler.memory_snapshot(limit, rebase)
+
+@router.delete("/admin/memory/snapshot", dependencies=[Depends(require_admin)])
+async def stop_memory_tracing():
+    """Stop memory tracing and drop the baseline."""
+    profiler.stop_memory_tracing()
+    return {"message": "Memory tracing stopped"}
+
 @router.get("/cache/stats")
-async def get_cache_stats():
+async def get_cache_stats(top: int = Query(10, ge=0, le=100, description="Number of most-hit keys to sample")):
     """Get cache statistics."""
     try:
-        stats = cache.get_stats()
+        stats = cache.get_stats(top)
         return {
             "cache_stats": stats,
+            "warmup": cache_warmer.report,
             "timestamp": datetime.now().isoformat()
         }
     except Exception as e:
         logger.error(f"Error getting cache stats: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to get cache statistics")
 
+@router.delete("/cache/stats")
+async def reset_cache_stats():
+    """Reset cache hit/miss counters without dropping entries."""
+    cache.reset_stats()
+    return {
+        "message": "Cache statistics reset",
+        "timestamp": datetime.now().isoformat()
+    }
+
 @router.delete("/cache")
 async def clear_cache():
     """Clear the cache."""
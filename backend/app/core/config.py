@@ -1,9 +1,10 @@
 import os
-from typing import List
+from typing import List, Dict, Any
 try:
     from pydantic_settings import BaseSettings
 except ImportError:
     from pydantic import BaseSettings
+from pydantic import model_validator
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -12,8 +13,26 @@ class Settings(BaseSettings):
     # FastAPI Configuration
     host: str = "127.0.0.1"
     port: int = 8000
+    # "development" runs one reloading worker; "production" runs a worker
+    # pool with uvloop/httptools and defaults debug/reload to off
+    environment: str = "production" if os.getenv("RENDER") else "development"
     debug: bool = True
     reload: bool = True
+    workers: int = 0  # 0 = one per usable CPU in production, up to max_workers
+    max_workers: int = 8
+    graceful_shutdown_timeout: int = 30
+    
+    # Response Compression
+    compression_enabled: bool = True
+    compression_min_size: int = 1024
+    compression_level: int = 6
+    # Brotli is used for clients that accept it when brotli-asgi is installed
+    brotli_enabled: bool = True
+    
+    # Outbound HTTP Settings (one pooled client per worker)
+    http_max_connections: int = 100
+    http_max_keepalive: int = 20
+    http_timeout: float = 30.0
     
     # API Keys
     groq_api_key: str = os.getenv("GROQ_API_KEY", "")
@@ -33,6 +52,21 @@ class Settings(BaseSettings):
     postgres_port: str = os.getenv("POSTGRES_PORT", "5432")
     postgres_db: str = os.getenv("POSTGRES_DB", "wordsmith_db")
     
+    # Connection Pool (file SQLite and PostgreSQL; in-memory SQLite uses one connection)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800  # seconds; PostgreSQL only
+    db_query_cache_size: int = 500  # compiled statements kept per engine
+    # PostgreSQL session statement_timeout in seconds (0 = none)
+    db_statement_timeout: float = 30.0
+    
+    # SQLite Settings
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"  # safe with WAL; FULL also fsyncs each commit
+    sqlite_busy_timeout: float = 5.0  # seconds a writer waits for the lock
+    sqlite_mmap_size_mb: int = 64
+    
     # Application Settings
     app_name: str = "WordSmith Backend"
     app_version: str = "1.0.0"
@@ -54,39 +88,155 @@ class Settings(BaseSettings):
     # Cache Settings
     cache_ttl: int = 3600
     max_cache_size: int = 1000
+    # Startup warm-up: reload the most repeated results from recent history
+    cache_warmup_enabled: bool = False
+    cache_warmup_window_hours: int = 24
+    cache_warmup_max_entries: int = 500  # also capped by max_cache_size
+    cache_warmup_max_mb: float = 10.0
+    cache_warmup_timeout: float = 10.0
+    
+    # Startup Settings
+    # Tables are created/migrated by `python migrate.py` (run.py does it before
+    # starting workers); set true to also do it on every app boot
+    auto_migrate: bool = False
+    
+    # Upstream Settings
+    max_concurrent_upstream: int = 5
+    upstream_timeout: float = 30.0  # per attempt, shortened to the request's remaining budget
+    
+    # Request Deadlines (seconds)
+    # Clients may set their own budget with an X-Request-Timeout header or a
+    # "timeout" field; it is capped at request_timeout_max
+    request_timeout_default: float = 60.0
+    request_timeout_max: float = 300.0
+    # History writes get at least this long even when the deadline has passed
+    db_write_min_budget: float = 1.0
+    
+    # Local Engine Settings
+    local_fallback_enabled: bool = True
+    local_fallback_when_saturated: bool = False
+    
+    # Long Document Settings
+    max_document_length: int = 100000
+    document_chunk_size: int = 2000
     
     # Model Configuration
+    default_provider: str = "groq"
     default_model: str = "llama-3.1-8b-instant"
+    # Extra OpenAI-compatible providers, e.g.
+    # {"openrouter": {"base_url": "https://openrouter.ai/api/v1", "api_key_env": "OPENROUTER_API_KEY"}}
+    providers: Dict[str, Dict[str, str]] = {}
+    # Per-type routes as "provider:model", e.g. {"expand": ["groq:llama-3.3-70b-versatile"]}
+    model_preferences: Dict[str, List[str]] = {}
+    router_window: int = 50
+    router_min_samples: int = 5
+    router_max_error_rate: float = 0.5
+    router_max_attempts: int = 2
+    # Seconds between probes of an unhealthy route; one success makes it healthy again
+    router_probe_interval: float = 30.0
+    # Pin a prompt version per type, e.g. {"formal": "v1"}
+    prompt_versions: Dict[str, str] = {}
     temperature: float = 0.3
     max_tokens: int = 1000
     
+    # Quality Gate Settings
+    quality_gate_enabled: bool = True
+    quality_gate_action: str = "flag"  # "flag" or "retry"
+    quality_thresholds: Dict[str, Dict[str, Any]] = {}
+    
+    # Request Timing
+    # Adds a Server-Timing header with per-stage durations to every response
+    server_timing_enabled: bool = True
+    # Log the full breakdown of requests slower than this (seconds, 0 = off)
+    slow_request_threshold: float = 0.0
+    
+    # Admin Settings
+    # Token for X-Admin-Token on /api/v1/admin/* routes; empty disables them
+    admin_token: str = ""
+    
+    # Profiling (per worker; see /api/v1/admin/profiling)
+    # Fraction of requests profiled with cProfile; admins can also flag one
+    # request with X-Profile: 1
+    profiling_sample_rate: float = 0.0
+    profiling_max_profiles: int = 20
+    profiling_traceback_frames: int = 1
+    
+    # Admission Control (per worker)
+    admission_enabled: bool = True
+    admission_max_in_flight: int = 100
+    admission_bulk_share: float = 0.5
+    # Above this interactive latency (seconds, moving average) bulk requests are shed
+    admission_target_latency: float = 10.0
+    admission_latency_alpha: float = 0.2
+    # With no interactive request in flight, the average halves for every this many
+    # seconds without a new sample, so one slow spike does not shed bulk work forever
+    admission_latency_half_life: float = 30.0
+    
+    # Bulk Job Settings
+    job_workers: int = 2
+    job_item_concurrency: int = 5
+    max_job_items: int = 10000
+    # A running job untouched this long is assumed orphaned by a dead worker
+    job_stale_after: int = 600
+    
+    # Diff Settings
+    diff_cache_size: int = 256
+    diff_workers: int = 2
+    diff_max_edits: int = 1000
+    
     # History Settings
     history_retention_days: int = 7
     max_history_per_user: int = 100
-    
-    # LangChain (optional)
-    langchain_tracing_v2: bool = False
+    history_export_batch_size: int = 1000  # rows fetched per keyset page
     
     class Config:
         env_file = ".env"
         case_sensitive = False
         extra = "ignore"
+    
+    @model_validator(mode="after")
+    def apply_environment_defaults(self):
+        """Derive the PostgreSQL URL and production defaults (no I/O here)."""
+        # Build PostgreSQL URL if credentials are provided
+        if self.postgres_password and "sqlite" not in self.database_url:
+            self.database_url = (
+                f"postgresql://{self.postgres_user}:{self.postgres_password}"
+                f"@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
+            )
+        if self.is_production:
+            if "debug" not in self.model_fields_set:
+                self.debug = False
+            if "reload" not in self.model_fields_set:
+                self.reload = False
+        return self
+    
+    @model_validator(mode="after")
+    def validate_sqlite_pragmas(self):
+        """Reject PRAGMA values SQLite would not accept (they are interpolated into SQL)."""
+        self.sqlite_journal_mode = self.sqlite_journal_mode.upper()
+        self.sqlite_synchronous = self.sqlite_synchronous.upper()
+        if self.sqlite_journal_mode not in {"WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY", "OFF"}:
+            raise ValueError(f"Invalid SQLITE_JOURNAL_MODE: {self.sqlite_journal_mode}")
+        if self.sqlite_synchronous not in {"OFF", "NORMAL", "FULL", "EXTRA"}:
+            raise ValueError(f"Invalid SQLITE_SYNCHRONOUS: {self.sqlite_synchronous}")
+        return self
+    
+    @property
+    def is_production(self) -> bool:
+        return self.environment.lower() == "production"
+    
+    @property
+    def worker_count(self) -> int:
+        if not self.is_production:
+            return 1
+        if self.workers:
+            return self.workers
+        # CPUs this process may run on (cgroup/taskset aware), not every host CPU
+        if hasattr(os, "sched_getaffinity"):
+            cpus = len(os.sched_getaffinity(0))
+        else:
+            cpus = os.cpu_count() or 1
+        return max(1, min(cpus, self.max_workers))
 
 # Global settings instance
 settings = Settings()
-
-# Build PostgreSQL URL if credentials are provided
-if settings.postgres_password and "sqlite" not in settings.database_url:
-    settings.database_url = (
-        f"postgresql://{settings.postgres_user}:{settings.postgres_password}"
-        f"@{settings.postgres_host}:{settings.postgres_port}/{settings.postgres_db}"
-    )
-
-# Validate required API key
-if not settings.groq_api_key:
-    print("⚠️  WARNING: GROQ_API_KEY not found in environment variables")
-    print("Please add your Groq API key to the .env file")
-else:
-    print("✅ Groq API key loaded successfully")
-
-print(f"✅ Database: {settings.database_url.split('@')[0]}@***")
\ No newline at end of file
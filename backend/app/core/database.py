@@ -1,26 +1,102 @@
-from sqlalchemy import create_engine, text
+from typing import Dict, Any
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool, StaticPool
 from app.core.config import settings
 from app.models.database import Base
 import logging
 
 logger = logging.getLogger(__name__)
 
+def _sqlite_options(in_memory: bool) -> Dict[str, Any]:
+    options: Dict[str, Any] = {"connect_args": {"check_same_thread": False}}
+    if in_memory:
+        # Every connection to an in-memory database is a separate database
+        options["poolclass"] = StaticPool
+    else:
+        # A connection per concurrent session; WAL lets readers run alongside the writer
+        options.update(
+            poolclass=QueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout
+        )
+    return options
+
+def _postgres_options() -> Dict[str, Any]:
+    options: Dict[str, Any] = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        # Replaces connections the server or a proxy dropped while idle
+        "pool_pre_ping": True
+    }
+    if settings.db_statement_timeout > 0:
+        # Session default; limit_statement_time() narrows it per transaction
+        timeout_ms = int(settings.db_statement_timeout * 1000)
+        options["connect_args"] = {"options": f"-c statement_timeout={timeout_ms}"}
+    return options
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    if not connection_record.info.get("in_memory"):
+        cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+        cursor.execute(f"PRAGMA mmap_size={settings.sqlite_mmap_size_mb * 1024 * 1024}")
+    cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout * 1000)}")
+    cursor.close()
+
+def create_db_engine(database_url: str) -> Engine:
+    """Create an engine with the pool and connection settings for its dialect."""
+    url = make_url(database_url)
+    # Compiled SQL is cached per engine; psycopg2 has no server-side prepared statements
+    options: Dict[str, Any] = {"echo": settings.debug, "query_cache_size": settings.db_query_cache_size}
+    if url.get_backend_name() == "sqlite":
+        in_memory = url.database in (None, "", ":memory:")
+        options.update(_sqlite_options(in_memory))
+        db_engine = create_engine(url, **options)
+
+        @event.listens_for(db_engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            connection_record.info["in_memory"] = in_memory
+            _apply_sqlite_pragmas(dbapi_connection, connection_record)
+
+        return db_engine
+    if url.get_backend_name() == "postgresql":
+        options.update(_postgres_options())
+    return create_engine(url, **options)
+
 # Create database engine
-engine = create_engine(
-    settings.database_url,
-    poolclass=StaticPool if "sqlite" in settings.database_url else None,
-    echo=settings.debug
-)
+engine = create_db_engine(settings.database_url)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def add_missing_columns():
+    """Add new nullable columns to existing tables (create_all skips them)."""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                logger.info(f"Added column {table.name}.{column.name}")
+                for index in table.indexes:
+                    if column.name in index.columns:
+                        index.create(bind=conn, checkfirst=True)
+
 def init_db():
     """Initialize database tables."""
     try:
         Base.metadata.create_all(bind=engine)
+        add_missing_columns()
         logger.info("✅ Database tables created successfully")
     except Exception as e:
         logger.error(f"❌ Error creating database tables: {e}")
@@ -43,4 +119,23 @@ def check_db_connection():
         return True
     except Exception as e:
         logger.error(f"Database connection failed: {e}")
-        return False
\ No newline at end of file
+        return False
+
+def upsert_insert(db: Session):
+    """Return the dialect's INSERT construct if it supports ON CONFLICT, else None."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        return insert
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+        return insert
+    return None
+
+def limit_statement_time(db: Session, seconds: float):
+    """Bound the statements of the current transaction to `seconds` (PostgreSQL only).
+
+    SQLite has no per-statement timeout; its writes are local and short.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text(f"SET LOCAL statement_timeout = {max(1, int(seconds * 1000))}"))
@@ -0,0 +1,44 @@
+import logging
+from typing import Optional
+import httpx
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class SharedHTTPClient:
+    """One pooled httpx.AsyncClient per worker process, opened on startup."""
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _create(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive
+            ),
+            timeout=settings.http_timeout
+        )
+
+    async def start(self):
+        """Open the pooled client for this worker."""
+        if self._client is None:
+            self._client = self._create()
+            logger.info("HTTP client pool opened")
+
+    async def stop(self):
+        """Close pooled connections once in-flight requests have drained."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("HTTP client pool closed")
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Scripts and tests that skip the startup hook get a client lazily
+        if self._client is None:
+            self._client = self._create()
+        return self._client
+
+# Global HTTP client instance
+http_client = SharedHTTPClient()
@@ -0,0 +1,30 @@
+import json
+from typing import Any
+from fastapi.responses import JSONResponse
+from app.utils.timing import span
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+def _dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered by orjson (stdlib json if it is not installed).
+
+    orjson serializes enums, datetimes and numpy values natively, so routes
+    can return processor results and ORM row mappings without converting
+    them through Pydantic models first.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with span("serialize"):
+            return _dumps(content)
+
+def ndjson_line(content: Any) -> bytes:
+    """Encode one NDJSON line for streaming responses."""
+    return _dumps(content) + b"\n"
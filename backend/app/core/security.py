@@ -0,0 +1,15 @@
+import secrets
+from typing import Optional
+from fastapi import Header, HTTPException
+from app.core.config import settings
+
+def is_admin_token(token: Optional[str]) -> bool:
+    """True if admin access is configured and the token matches it."""
+    return bool(settings.admin_token) and bool(token) and secrets.compare_digest(token, settings.admin_token)
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Dependency for admin-only routes; they are off unless ADMIN_TOKEN is set."""
+    if not settings.admin_token:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
@@ -1,14 +1,24 @@
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from starlette.middleware.gzip import GZipMiddleware, DEFAULT_EXCLUDED_CONTENT_TYPES
 from fastapi.exceptions import RequestValidationError
+import os
 import logging
 import time
 from datetime import datetime
 from app.core.config import settings
-from app.core.database import init_db, check_db_connection
+from app.core.database import init_db
+from app.core.http_client import http_client
+from app.core.responses import ORJSONResponse
 from app.api.routes import router
+from app.services.job_manager import job_manager
+from app.services.cache_warmer import cache_warmer
+from app.services.quality_gate import quality_gate
+from app.services.admission import AdmissionMiddleware
+from app.services.profiler import profiler
 from app.utils.helpers import create_error_response
+from app.utils.cancellation import ClientDisconnected
+from app.utils.timing import start_request_timer
 
 # Configure logging
 logging.basicConfig(
@@ -23,9 +33,14 @@ app = FastAPI(
     description="AI-powered text transformation service for WordSmith Chrome Extension",
     version=settings.app_version,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
+# Shed transform work early under overload (503 + Retry-After); added first
+# so CORS and compression wrap the 503 responses too
+app.add_middleware(AdmissionMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -35,26 +50,57 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses; NDJSON streams are left alone so lines arrive promptly
+if settings.compression_enabled:
+    try:
+        if not settings.brotli_enabled:
+            raise ImportError
+        from brotli_asgi import BrotliMiddleware
+        app.add_middleware(
+            BrotliMiddleware,
+            quality=min(settings.compression_level, 11),
+            minimum_size=settings.compression_min_size,
+            gzip_fallback=True,
+            # History export compresses itself when asked (gzip=true)
+            excluded_handlers=[r".*/stream$", r".*/history/export$"]
+        )
+    except ImportError:
+        app.add_middleware(
+            GZipMiddleware,
+            minimum_size=settings.compression_min_size,
+            compresslevel=settings.compression_level,
+            exclude_content_types=DEFAULT_EXCLUDED_CONTENT_TYPES + ("application/x-ndjson",)
+        )
+
 # Add request logging middleware
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     start_time = time.time()
+    # Set before call_next so the route's context inherits it
+    timer = start_request_timer()
     
     # Log request
     logger.info(f"Request: {request.method} {request.url}")
     
-    response = await call_next(request)
+    response = await profiler.dispatch(request, call_next)
     
     # Log response
     process_time = time.time() - start_time
     logger.info(f"Response: {response.status_code} - {process_time:.2f}s")
     
+    # Streaming responses only include the spans finished before the first byte
+    timer.finish()
+    if settings.server_timing_enabled:
+        response.headers["Server-Timing"] = timer.header()
+    if settings.slow_request_threshold and process_time >= settings.slow_request_threshold:
+        logger.warning(f"🐢 Slow request {request.method} {request.url.path}: {timer.summary()}")
+    
     return response
 
 # Global exception handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": "HTTP Error",
@@ -66,7 +112,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=422,
         content={
             "error": "Validation Error",
@@ -77,6 +123,11 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         }
     )
 
+@app.exception_handler(ClientDisconnected)
+async def client_disconnected_handler(request: Request, exc: ClientDisconnected):
+    # Nobody is listening; 499 (nginx's "client closed request") keeps logs honest
+    return Response(status_code=499)
+
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     logger.error(f"Unhandled exception: {str(exc)}")
@@ -84,7 +135,7 @@ async def general_exception_handler(request: Request, exc: Exception):
         "An unexpected error occurred. Please try again later.",
         500
     )
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content=error_response
     )
@@ -107,7 +158,7 @@ async def root():
 # Startup event
 @app.on_event("startup")
 async def startup_event():
-    logger.info(f"Starting {settings.app_name} v{settings.app_version}")
+    logger.info(f"Starting {settings.app_name} v{settings.app_version} (pid {os.getpid()}, {settings.environment})")
     logger.info(f"Debug mode: {settings.debug}")
     logger.info(f"CORS origins: {settings.cors_origins}")
     
@@ -116,25 +167,31 @@ async def startup_event():
         logger.warning("GROQ_API_KEY not set - API calls will fail")
     else:
         logger.info("✅ Groq API key configured successfully")
+    logger.info(f"Database: {settings.database_url.split('@')[-1] if '@' in settings.database_url else settings.database_url}")
     
-    # Initialize database
-    try:
-        logger.info("🔄 Initializing database...")
-        init_db()
-        
-        # Check database connection
-        if check_db_connection():
-            logger.info("✅ Database connected successfully")
-        else:
-            logger.error("❌ Database connection failed")
-    except Exception as e:
-        logger.error(f"❌ Database initialization error: {str(e)}")
-        logger.warning("⚠️  Application will continue but history features may not work")
+    # Schema changes normally run outside the boot path (migrate.py / run.py);
+    # the first request opens the database connection lazily
+    if settings.auto_migrate:
+        try:
+            logger.info("🔄 Initializing database...")
+            init_db()
+        except Exception as e:
+            logger.error(f"❌ Database initialization error: {str(e)}")
+            logger.warning("⚠️  Application will continue but history features may not work")
+    
+    # Per-worker resources: pooled upstream client, bulk job workers, cache and scorer warm-up
+    await http_client.start()
+    await job_manager.start()
+    cache_warmer.start()
+    quality_gate.start()
 
-# Shutdown event
+# Shutdown event (runs after uvicorn has drained in-flight requests)
 @app.on_event("shutdown")
 async def shutdown_event():
-    logger.info(f"Shutting down {settings.app_name}")
+    logger.info(f"Shutting down {settings.app_name} (pid {os.getpid()})")
+    await cache_warmer.stop()
+    await job_manager.stop()
+    await http_client.stop()
 
 if __name__ == "__main__":
     import uvicorn
@@ -143,5 +200,7 @@ if __name__ == "__main__":
         host=settings.host,
         port=settings.port,
         reload=settings.reload,
+        workers=settings.worker_count,
+        timeout_graceful_shutdown=settings.graceful_shutdown_timeout,
         log_level="info"
     )
\ No newline at end of file
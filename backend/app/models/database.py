@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Float, Integer, DateTime, Boolean
+from sqlalchemy import Column, String, Text, Float, Integer, Date, DateTime, Boolean, ForeignKey, Index, JSON
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -23,9 +23,17 @@ class TransformationHistory(Base):
     processing_time = Column(Float, nullable=False)
     word_count_original = Column(Integer, nullable=False)
     word_count_transformed = Column(Integer, nullable=False)
+    prompt_version = Column(String(20), nullable=True)
+    # Response cache key the result was stored under (null if not cacheable);
+    # lets the startup warm-up reload frequent results, including chain steps
+    cache_key = Column(String(32), nullable=True, index=True)
     
     # Saved status
     is_saved = Column(Boolean, default=False, index=True)
+    # User-assigned labels (list of strings), set in bulk via /history/bulk
+    tags = Column(JSON, nullable=True)
+    # Served from the response cache (null for rows written before this was tracked)
+    cache_hit = Column(Boolean, nullable=True, default=False)
     
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
@@ -47,6 +55,117 @@ class TransformationHistory(Base):
             "word_count_original": self.word_count_original,
             "word_count_transformed": self.word_count_transformed,
             "is_saved": self.is_saved,
+            "tags": self.tags,
+            "prompt_version": self.prompt_version,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None
-        }
\ No newline at end of file
+        }
+
+class TransformationJob(Base):
+    """Model for an asynchronous bulk transformation job."""
+    __tablename__ = "transformation_jobs"
+    
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String(100), nullable=False, index=True)
+    
+    # Job parameters
+    transformation_type = Column(String(50), nullable=False)
+    additional_instructions = Column(Text, nullable=True)
+    quality = Column(String(20), nullable=False, default="standard")
+    
+    # Progress: queued -> running -> completed | cancelled
+    status = Column(String(20), nullable=False, default="queued", index=True)
+    total_items = Column(Integer, nullable=False, default=0)
+    completed_items = Column(Integer, nullable=False, default=0)
+    failed_items = Column(Integer, nullable=False, default=0)
+    
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    updated_at = Column(DateTime, onupdate=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f"<TransformationJob {self.id} - {self.status}>"
+    
+    def to_dict(self):
+        """Convert model to dictionary."""
+        processed = (self.completed_items or 0) + (self.failed_items or 0)
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "transformation_type": self.transformation_type,
+            "additional_instructions": self.additional_instructions,
+            "quality": self.quality,
+            "status": self.status,
+            "total_items": self.total_items,
+            "completed_items": self.completed_items,
+            "failed_items": self.failed_items,
+            "progress": round(processed / self.total_items, 4) if self.total_items else 1.0,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None
+        }
+
+class TransformationJobItem(Base):
+    """Model for one text within a bulk transformation job."""
+    __tablename__ = "transformation_job_items"
+    __table_args__ = (
+        Index("ix_job_items_job_index", "job_id", "item_index"),
+        Index("ix_job_items_job_status", "job_id", "status"),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    job_id = Column(String(36), ForeignKey("transformation_jobs.id", ondelete="CASCADE"), nullable=False)
+    item_index = Column(Integer, nullable=False)
+    
+    # Transformation data
+    original_text = Column(Text, nullable=False)
+    transformed_text = Column(Text, nullable=True)
+    
+    # pending -> completed | failed | cancelled
+    status = Column(String(20), nullable=False, default="pending")
+    error = Column(Text, nullable=True)
+    processing_time = Column(Float, nullable=True)
+    engine = Column(String(50), nullable=True)
+    
+    def to_dict(self):
+        """Convert model to dictionary."""
+        return {
+            "index": self.item_index,
+            "original_text": self.original_text,
+            "transformed_text": self.transformed_text,
+            "status": self.status,
+            "error": self.error,
+            "processing_time": self.processing_time,
+            "engine": self.engine
+        }
+
+class HistoryVersion(Base):
+    """Per-user counter bumped whenever that user's history changes."""
+    __tablename__ = "history_versions"
+    
+    user_id = Column(String(100), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class UsageRollup(Base):
+    """Daily (UTC) usage counters per user and transformation type.
+
+    Incremented in the same transaction as each history write, so /stats
+    reads a few rollup rows instead of aggregating the history table.
+    """
+    __tablename__ = "usage_rollups"
+    __table_args__ = (
+        Index("ix_usage_rollups_user_day", "user_id", "day"),
+    )
+    
+    day = Column(Date, primary_key=True)
+    user_id = Column(String(100), primary_key=True)
+    transformation_type = Column(String(50), primary_key=True)
+    
+    requests = Column(Integer, nullable=False, default=0)
+    words_in = Column(Integer, nullable=False, default=0)
+    words_out = Column(Integer, nullable=False, default=0)
+    processing_time = Column(Float, nullable=False, default=0.0)
+    cache_hits = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -13,12 +13,23 @@ class TransformationType(str, Enum):
     EMOJI = "emoji"
     TWEETIFY = "tweetify"
 
+class QualityMode(str, Enum):
+    STANDARD = "standard"
+    FAST = "fast"
+
+class ExportFormat(str, Enum):
+    JSONL = "jsonl"
+    CSV = "csv"
+
 class TextTransformRequest(BaseModel):
     text: str = Field(..., min_length=1, max_length=5000, description="Text to transform")
     transformation_type: TransformationType = Field(..., description="Type of transformation to apply")
     additional_instructions: Optional[str] = Field(None, max_length=500, description="Additional custom instructions")
     user_id: Optional[str] = Field(default="anonymous", description="User ID for history tracking")
     original_text: Optional[str] = Field(None, max_length=5000, description="Original text for multi-transform chains")
+    quality: QualityMode = Field(QualityMode.STANDARD, description="Use 'fast' to prefer the local engine where available")
+    include_diff: bool = Field(False, description="Include word-level diff spans in the response")
+    timeout: Optional[float] = Field(None, gt=0, description="Seconds the client will wait (overrides X-Request-Timeout)")
     
     class Config:
         json_schema_extra = {
@@ -31,6 +42,15 @@ class TextTransformRequest(BaseModel):
             }
         }
 
+class DiffSpan(BaseModel):
+    op: str = Field(..., description="One of equal, insert, delete, replace")
+    original_text: str
+    transformed_text: str
+    original_start: int
+    original_end: int
+    transformed_start: int
+    transformed_end: int
+
 class TextTransformResponse(BaseModel):
     original_text: str
     transformed_text: str
@@ -39,6 +59,13 @@ class TextTransformResponse(BaseModel):
     word_count_original: int
     word_count_transformed: int
     history_id: Optional[str] = None
+    engine: str = Field("groq", description="Provider that produced the result, or 'local'")
+    model: Optional[str] = Field(None, description="Upstream model used, if any")
+    prompt_version: Optional[str] = Field(None, description="Prompt template version used, if any")
+    diff: Optional[List[DiffSpan]] = None
+    similarity: Optional[float] = Field(None, description="Estimated word-set similarity to the input (0-1)")
+    length_ratio: Optional[float] = Field(None, description="Transformed/original character length ratio")
+    quality_flags: List[str] = Field(default_factory=list, description="Quality gate outliers, e.g. unchanged or drift")
     
     class Config:
         json_schema_extra = {
@@ -49,28 +76,108 @@ class TextTransformResponse(BaseModel):
                 "processing_time": 1.23,
                 "word_count_original": 7,
                 "word_count_transformed": 7,
-                "history_id": "abc123"
+                "history_id": "abc123",
+                "engine": "groq",
+                "similarity": 0.4,
+                "length_ratio": 1.24,
+                "quality_flags": []
             }
         }
 
+class DocumentTransformRequest(BaseModel):
+    text: str = Field(..., min_length=1, description="Long document to transform")
+    transformation_type: TransformationType = Field(..., description="Type of transformation to apply")
+    additional_instructions: Optional[str] = Field(None, max_length=500, description="Additional custom instructions")
+    user_id: Optional[str] = Field(default="anonymous", description="User ID for history tracking")
+    quality: QualityMode = Field(QualityMode.STANDARD, description="Use 'fast' to prefer the local engine where available")
+    stream: bool = Field(False, description="Stream chunks as newline-delimited JSON")
+    timeout: Optional[float] = Field(None, gt=0, description="Seconds the client will wait (overrides X-Request-Timeout)")
+
+class DocumentTransformResponse(BaseModel):
+    original_text: str
+    transformed_text: str
+    transformation_type: TransformationType
+    processing_time: float = Field(..., description="Processing time in seconds")
+    word_count_original: int
+    word_count_transformed: int
+    total_chunks: int
+    cached_chunks: int
+    local_chunks: int = 0
+    skipped_chunks: int = Field(0, description="Chunks left untransformed because the deadline passed")
+    history_id: Optional[str] = None
+
 class BatchTransformRequest(BaseModel):
     texts: List[str] = Field(..., min_items=1, max_items=10)
     transformation_type: TransformationType
     additional_instructions: Optional[str] = None
     user_id: Optional[str] = Field(default="anonymous")
+    quality: QualityMode = QualityMode.STANDARD
+    timeout: Optional[float] = Field(None, gt=0, description="Seconds the client will wait (overrides X-Request-Timeout)")
 
 class BatchTransformResponse(BaseModel):
     results: List[TextTransformResponse]
     total_processing_time: float
     successful_transformations: int
     failed_transformations: int
+    deadline_exceeded: bool = Field(False, description="Some texts were not transformed before the deadline")
+
+class DiffRequest(BaseModel):
+    original_text: str = Field(..., description="Text before transformation")
+    transformed_text: str = Field(..., description="Text after transformation")
+
+class DiffResponse(BaseModel):
+    spans: List[DiffSpan]
+    insertions: int
+    deletions: int
+    replacements: int
+    tokens_original: int
+    tokens_transformed: int
+
+class JobCreateRequest(BaseModel):
+    texts: List[str] = Field(..., min_items=1, description="Texts to transform")
+    transformation_type: TransformationType
+    additional_instructions: Optional[str] = Field(None, max_length=500)
+    user_id: Optional[str] = Field(default="anonymous")
+    quality: QualityMode = QualityMode.STANDARD
+
+class JobResponse(BaseModel):
+    id: str
+    user_id: str
+    transformation_type: str
+    additional_instructions: Optional[str]
+    quality: str
+    status: str
+    total_items: int
+    completed_items: int
+    failed_items: int
+    progress: float
+    created_at: str
+    updated_at: Optional[str]
+    finished_at: Optional[str]
+
+class JobItemResult(BaseModel):
+    index: int
+    original_text: str
+    transformed_text: Optional[str]
+    status: str
+    error: Optional[str]
+    processing_time: Optional[float]
+    engine: Optional[str]
+
+class JobResultsResponse(BaseModel):
+    job_id: str
+    status: str
+    items: List[JobItemResult]
+    total_count: int
+    page: int
+    page_size: int
+    has_more: bool
 
 class HealthResponse(BaseModel):
     status: str
     app_name: str
     version: str
     groq_api_status: str
-    langchain_status: str
     database_status: str
     timestamp: str
 
@@ -91,8 +198,11 @@ class HistoryItem(BaseModel):
     word_count_original: int
     word_count_transformed: int
     is_saved: bool
+    tags: Optional[List[str]] = None
+    prompt_version: Optional[str] = None
     created_at: str
     updated_at: Optional[str]
+    diff: Optional[List[DiffSpan]] = None
     
     class Config:
         from_attributes = True
@@ -108,4 +218,28 @@ class SaveHistoryRequest(BaseModel):
     history_id: str
 
 class DeleteHistoryRequest(BaseModel):
-    history_ids: List[str]
\ No newline at end of file
+    history_ids: List[str]
+
+class BulkHistoryAction(str, Enum):
+    SAVE = "save"
+    UNSAVE = "unsave"
+    TAG = "tag"
+
+class BulkHistoryRequest(BaseModel):
+    user_id: str = Field(default="anonymous", description="Only this user's items are changed")
+    history_ids: List[str] = Field(..., min_items=1, max_items=500)
+    action: BulkHistoryAction
+    tags: Optional[List[str]] = Field(None, max_items=20, description="For action=tag: replaces the items' tags ([] clears them)")
+
+class BulkHistoryResult(BaseModel):
+    history_id: str
+    status: str  # updated | not_found
+
+class BulkHistoryResponse(BaseModel):
+    action: BulkHistoryAction
+    updated_count: int
+    not_found_count: int
+    results: List[BulkHistoryResult]
+
+class ProfilingConfigRequest(BaseModel):
+    sample_rate: float = Field(..., ge=0, le=1, description="Fraction of requests to profile (0 disables sampling)")
@@ -0,0 +1,141 @@
+import math
+import time
+import logging
+from typing import Optional, Dict, Any, List
+from app.core.config import settings
+from app.core.responses import ORJSONResponse
+from app.utils.helpers import create_error_response
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+# Routes that queue upstream work; everything else is always admitted
+ROUTE_PRIORITIES = {
+    ("POST", "/api/v1/transform"): INTERACTIVE,
+    ("POST", "/api/v1/transform/document"): BULK,
+    ("POST", "/api/v1/batch-transform"): BULK,
+    ("POST", "/api/v1/batch-transform/stream"): BULK,
+}
+
+class AdmissionController:
+    """Sheds transform requests early when in-flight work or latency is too high.
+
+    Interactive requests may use the whole in-flight budget; bulk requests
+    only a share of it, and none while interactive latency is above target.
+    """
+
+    def __init__(self):
+        # Admission times (monotonic) of the requests currently in flight
+        self.started: Dict[str, List[float]] = {INTERACTIVE: [], BULK: []}
+        self.latency: Dict[str, Optional[float]] = {INTERACTIVE: None, BULK: None}
+        self.sampled_at: Dict[str, float] = {INTERACTIVE: 0.0, BULK: 0.0}
+
+    def _limit(self, priority: str) -> int:
+        if priority == BULK:
+            return max(1, int(settings.admission_max_in_flight * settings.admission_bulk_share))
+        return settings.admission_max_in_flight
+
+    def _average(self, priority: str) -> Optional[float]:
+        """Moving average, decayed by the time since its last sample while idle."""
+        latency = self.latency[priority]
+        if latency is None or self.started[priority]:
+            return latency
+        idle = time.monotonic() - self.sampled_at[priority]
+        return latency * 0.5 ** (idle / settings.admission_latency_half_life)
+
+    def _latency(self, priority: str) -> Optional[float]:
+        """Moving average, or the age of the oldest in-flight request if larger."""
+        latency = self._average(priority)
+        if self.started[priority]:
+            # A hung request has taken at least this long already
+            pending = time.monotonic() - min(self.started[priority])
+            latency = pending if latency is None else max(latency, pending)
+        return latency
+
+    def _overloaded(self) -> bool:
+        latency = self._latency(INTERACTIVE)
+        return latency is not None and latency > settings.admission_target_latency
+
+    def try_admit(self, priority: str, started: float) -> Optional[str]:
+        """Reserve a slot admitted at `started`; return a rejection reason instead if over capacity."""
+        total = sum(len(started_at) for started_at in self.started.values())
+        if total >= self._limit(priority):
+            reason = "queue_full"
+        elif priority == BULK and self._overloaded():
+            reason = "latency"
+        else:
+            self.started[priority].append(started)
+            metrics.increment("requests_admitted", priority=priority)
+            return None
+        metrics.increment("requests_shed", priority=priority, reason=reason)
+        return reason
+
+    def release(self, priority: str, started: float):
+        """Free the slot admitted at `started` and fold its duration into the latency average."""
+        previous = self._average(priority)
+        self.started[priority].remove(started)
+        duration = time.monotonic() - started
+        alpha = settings.admission_latency_alpha
+        self.latency[priority] = duration if previous is None else alpha * duration + (1 - alpha) * previous
+        self.sampled_at[priority] = time.monotonic()
+
+    def retry_after(self, priority: str) -> int:
+        """Seconds a shed client should wait: about one interactive request's latency."""
+        seconds = max(1.0, self._latency(INTERACTIVE) or 1.0)
+        if priority == BULK:
+            seconds *= 2
+        return math.ceil(seconds)
+
+    def get_stats(self) -> Dict[str, Any]:
+        latency = {priority: self._latency(priority) for priority in self.latency}
+        return {
+            "in_flight": {priority: len(started_at) for priority, started_at in self.started.items()},
+            "limits": {priority: self._limit(priority) for priority in self.started},
+            "latency_ewma": {
+                priority: round(value, 3) if value is not None else None
+                for priority, value in latency.items()
+            },
+            "overloaded": self._overloaded()
+        }
+
+class AdmissionMiddleware:
+    """ASGI middleware applying the admission controller to transform routes.
+
+    Slots are held until the response body is fully sent, so streaming
+    routes count as in flight for their whole duration.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        priority = None
+        if scope["type"] == "http" and settings.admission_enabled:
+            priority = ROUTE_PRIORITIES.get((scope["method"], scope["path"]))
+        if priority is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.monotonic()
+        reason = admission_controller.try_admit(priority, start_time)
+        if reason is not None:
+            retry_after = admission_controller.retry_after(priority)
+            logger.warning(f"Shedding {priority} request to {scope['path']} ({reason}), retry in {retry_after}s")
+            response = ORJSONResponse(
+                create_error_response("Server is busy, please retry shortly.", 503),
+                status_code=503,
+                headers={"Retry-After": str(retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            admission_controller.release(priority, start_time)
+
+# Global admission controller instance
+admission_controller = AdmissionController()
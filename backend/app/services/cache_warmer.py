@@ -0,0 +1,138 @@
+import time
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Tuple
+from sqlalchemy import desc, func
+from app.core.config import settings
+from app.core.database import SessionLocal, limit_statement_time
+from app.models.database import TransformationHistory
+from app.models.schemas import TransformationType
+from app.services.prompt_registry import prompt_registry
+from app.utils.helpers import cache, estimate_tokens, tokens_for_chars
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class CacheWarmer:
+    """Refills the response cache from recent history after a restart."""
+
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.report: Dict[str, Any] = {"status": "disabled"}
+
+    def start(self):
+        """Warm the cache in the background; requests are served meanwhile."""
+        if not settings.cache_warmup_enabled or self.task is not None:
+            return
+        self.report = {"status": "running"}
+        self.task = asyncio.create_task(self._warm())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+    async def _warm(self):
+        start_time = time.monotonic()
+        try:
+            # The query runs in a thread; entries are inserted on the event loop
+            # so the cache dict is never mutated concurrently
+            rows = await asyncio.wait_for(
+                asyncio.to_thread(self._frequent_results),
+                settings.cache_warmup_timeout
+            )
+            loaded, size_bytes = self._load(rows)
+            self.report = {
+                "status": "completed",
+                "loaded": loaded,
+                "candidates": len(rows),
+                "size_mb": round(size_bytes / (1024 * 1024), 3),
+                "duration_seconds": round(time.monotonic() - start_time, 3)
+            }
+            logger.info(
+                f"🔥 Cache warm-up loaded {loaded} entries "
+                f"({self.report['size_mb']} MB) in {self.report['duration_seconds']}s"
+            )
+        except asyncio.TimeoutError:
+            self.report = {"status": "timed_out", "loaded": 0, "duration_seconds": settings.cache_warmup_timeout}
+            logger.warning(f"Cache warm-up gave up after {settings.cache_warmup_timeout}s")
+        except Exception as e:
+            self.report = {"status": "failed", "loaded": 0, "error": str(e)}
+            logger.error(f"Cache warm-up failed: {str(e)}")
+
+    def _frequent_results(self) -> List[Dict[str, Any]]:
+        """Latest row per cache key for the most repeated recent requests, most used first."""
+        since = datetime.utcnow() - timedelta(hours=settings.cache_warmup_window_hours)
+        limit = min(settings.cache_warmup_max_entries, cache.max_size)
+        current_versions = {t.value: prompt_registry.version(t) for t in TransformationType}
+
+        db = SessionLocal()
+        try:
+            limit_statement_time(db, settings.cache_warmup_timeout)
+            recent = (
+                TransformationHistory.cache_key.isnot(None),
+                TransformationHistory.created_at >= since
+            )
+            ranked = db.query(
+                TransformationHistory.cache_key,
+                TransformationHistory.transformation_type,
+                TransformationHistory.prompt_version
+            ).filter(*recent).group_by(
+                TransformationHistory.cache_key,
+                TransformationHistory.transformation_type,
+                TransformationHistory.prompt_version
+            ).order_by(
+                desc(func.count()),
+                desc(func.max(TransformationHistory.created_at))
+            ).limit(limit).all()
+            # Keys built with a since-replaced prompt version can never hit
+            keys = [
+                key for key, transformation_type, prompt_version in ranked
+                if current_versions.get(transformation_type) == prompt_version
+            ]
+
+            # Latest result per key, fetched in pages to stay under parameter limits
+            latest: Dict[str, Dict[str, Any]] = {}
+            for i in range(0, len(keys), 500):
+                page = db.query(
+                    TransformationHistory.cache_key,
+                    TransformationHistory.transformed_text,
+                    TransformationHistory.transformation_type,
+                    TransformationHistory.processing_time,
+                    TransformationHistory.additional_instructions,
+                    func.length(TransformationHistory.original_text).label("original_chars")
+                ).filter(
+                    *recent,
+                    TransformationHistory.cache_key.in_(keys[i:i + 500])
+                ).order_by(desc(TransformationHistory.created_at)).all()
+                for row in page:
+                    latest.setdefault(row.cache_key, row._asdict())
+            return [latest[key] for key in keys if key in latest]
+        finally:
+            db.close()
+
+    def _load(self, rows: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """Insert rows in rank order until the cache or memory budget is full."""
+        budget = int(settings.cache_warmup_max_mb * 1024 * 1024)
+        loaded = size_bytes = 0
+        for row in rows:
+            key, result = row['cache_key'], row['transformed_text']
+            entry_bytes = len(key) + len(result.encode())
+            if size_bytes + entry_bytes > budget:
+                break
+            # Same estimate as SimpleCache.set (chain rows store the chain's first input)
+            tokens = (
+                tokens_for_chars(row['original_chars'])
+                + estimate_tokens(row['additional_instructions'] or "")
+                + estimate_tokens(result)
+            )
+            if not cache.warm(key, result, row['transformation_type'], row['processing_time'], tokens):
+                break
+            loaded += 1
+            size_bytes += entry_bytes
+        return loaded, size_bytes
+
+# Global cache warmer instance
+cache_warmer = CacheWarmer()
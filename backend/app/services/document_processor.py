@@ -0,0 +1,248 @@
+import re
+import time
+import zlib
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, AsyncIterator
+from app.core.config import settings
+from app.models.schemas import TransformationType, QualityMode
+from app.services.text_processor_simple import text_processor
+from app.services.prompt_registry import prompt_registry
+from app.utils.helpers import cache, sanitize_text
+from app.utils.deadline import Deadline, DeadlineExceeded
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+@dataclass
+class DocumentChunk:
+    """A piece of a long document and the separator that follows it."""
+    text: str
+    separator: str = ""
+
+def _pack(pieces: List[str], max_chars: int) -> List[str]:
+    """Greedily join pieces with spaces into strings of at most max_chars."""
+    packed = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + 1 + len(piece) > max_chars:
+            packed.append(current)
+            current = piece
+        else:
+            current = f"{current} {piece}" if current else piece
+    if current:
+        packed.append(current)
+    return packed
+
+def _split_paragraph(paragraph: str, max_chars: int) -> List[str]:
+    """Split an oversized paragraph at sentence, then word boundaries."""
+    pieces = []
+    for sentence in SENTENCE_END.split(paragraph):
+        if len(sentence) <= max_chars:
+            pieces.append(sentence)
+            continue
+        for word in sentence.split():
+            # A single "word" longer than a chunk has to be cut hard
+            pieces.extend(word[i:i + max_chars] for i in range(0, len(word), max_chars))
+    return _pack(pieces, max_chars)
+
+def split_into_chunks(text: str, max_chars: Optional[int] = None) -> List[DocumentChunk]:
+    """Split a document into chunks at paragraph and sentence boundaries."""
+    max_chars = max_chars or settings.document_chunk_size
+    chunks: List[DocumentChunk] = []
+    group: List[str] = []
+    group_size = 0
+
+    def flush():
+        nonlocal group, group_size
+        if group:
+            chunks.append(DocumentChunk("\n\n".join(group), "\n\n"))
+            group, group_size = [], 0
+
+    for raw_paragraph in PARAGRAPH_BREAK.split(text):
+        paragraph = sanitize_text(raw_paragraph)
+        if not paragraph:
+            continue
+
+        if len(paragraph) > max_chars:
+            flush()
+            pieces = _split_paragraph(paragraph, max_chars)
+            chunks.extend(DocumentChunk(piece, " ") for piece in pieces)
+            chunks[-1].separator = "\n\n"
+            continue
+
+        if group and group_size + 2 + len(paragraph) > max_chars:
+            flush()
+        group.append(paragraph)
+        group_size += len(paragraph) + (2 if group_size else 0)
+
+        # Content-defined boundary: close the chunk after roughly one in four
+        # paragraphs based on their content, so an edit early in a document
+        # does not shift every later chunk boundary and invalidate its cache.
+        if group_size >= max_chars // 4 and zlib.crc32(paragraph.encode()) % 4 == 0:
+            flush()
+
+    flush()
+    if chunks:
+        chunks[-1].separator = ""
+    return chunks
+
+def reassemble(chunks: List[DocumentChunk], transformed: List[str]) -> str:
+    """Join transformed chunks back together in their original order."""
+    return "".join(
+        text + chunk.separator for chunk, text in zip(chunks, transformed)
+    ).strip()
+
+class DocumentProcessor:
+    """Transforms long documents chunk by chunk through the text processor."""
+
+    async def _transform_chunk(
+        self,
+        chunk: DocumentChunk,
+        transformation_type: TransformationType,
+        additional_instructions: Optional[str] = None,
+        quality: QualityMode = QualityMode.STANDARD,
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
+        """Transform one chunk, reusing the per-chunk cache when possible.
+        
+        A chunk the deadline cuts off is returned unchanged and marked skipped.
+        """
+        prompt_version = prompt_registry.version(transformation_type)
+        cached_entry = cache.get_entry(chunk.text, transformation_type.value, additional_instructions, prompt_version)
+        if cached_entry:
+            return {
+                "transformed_text": cached_entry['result'],
+                "cached": True,
+                "engine": cached_entry['meta'].get('engine', "cache"),
+                "model": cached_entry['meta'].get('model')
+            }
+
+        try:
+            result = await text_processor.transform_text(
+                chunk.text,
+                transformation_type,
+                additional_instructions,
+                quality,
+                deadline
+            )
+        except DeadlineExceeded:
+            return {"transformed_text": chunk.text, "cached": False, "engine": "none", "model": None, "skipped": True}
+        if result['engine'] != "local":
+            cache.set(
+                chunk.text,
+                transformation_type.value,
+                result['transformed_text'],
+                additional_instructions,
+                result['prompt_version'],
+                processing_time=result['processing_time'],
+                meta={"engine": result['engine'], "model": result.get('model')}
+            )
+        return {
+            "transformed_text": result['transformed_text'],
+            "cached": False,
+            "engine": result['engine'],
+            "model": result.get('model')
+        }
+
+    def _start_chunks(
+        self,
+        chunks: List[DocumentChunk],
+        transformation_type: TransformationType,
+        additional_instructions: Optional[str] = None,
+        quality: QualityMode = QualityMode.STANDARD,
+        deadline: Optional[Deadline] = None
+    ) -> List[asyncio.Task]:
+        """Schedule every chunk at once; the upstream limiter bounds concurrency."""
+        return [
+            asyncio.create_task(
+                self._transform_chunk(chunk, transformation_type, additional_instructions, quality, deadline)
+            )
+            for chunk in chunks
+        ]
+
+    async def transform_document(
+        self,
+        text: str,
+        transformation_type: TransformationType,
+        additional_instructions: Optional[str] = None,
+        quality: QualityMode = QualityMode.STANDARD,
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
+        """Transform a long document and return the reassembled result.
+        
+        Chunks still pending at the deadline keep their original text; if none
+        finished in time, DeadlineExceeded is raised instead.
+        """
+        start_time = time.time()
+        chunks = split_into_chunks(text)
+        logger.info(f"Transforming document in {len(chunks)} chunks with type: {transformation_type}")
+
+        tasks = self._start_chunks(chunks, transformation_type, additional_instructions, quality, deadline)
+        try:
+            results = await asyncio.gather(*tasks)
+        except Exception as e:
+            for task in tasks:
+                task.cancel()
+            logger.error(f"Error during document transformation: {str(e)}")
+            raise Exception(f"Document transformation failed: {str(e)}")
+
+        skipped_chunks = sum(1 for res in results if res.get('skipped'))
+        if skipped_chunks == len(chunks):
+            raise DeadlineExceeded("Deadline exceeded before any chunk was transformed")
+        if skipped_chunks:
+            logger.warning(f"Deadline passed: returning document with {skipped_chunks}/{len(chunks)} chunks untransformed")
+
+        original_text = reassemble(chunks, [chunk.text for chunk in chunks])
+        transformed_text = reassemble(chunks, [res['transformed_text'] for res in results])
+        processing_time = time.time() - start_time
+
+        logger.info(f"Document transformation completed in {processing_time:.2f} seconds")
+        return {
+            "original_text": original_text,
+            "transformed_text": transformed_text,
+            "transformation_type": transformation_type,
+            "processing_time": round(processing_time, 2),
+            "word_count_original": len(original_text.split()),
+            "word_count_transformed": len(transformed_text.split()),
+            "total_chunks": len(chunks),
+            "cached_chunks": sum(1 for res in results if res['cached']),
+            "local_chunks": sum(1 for res in results if res['engine'] == "local"),
+            "skipped_chunks": skipped_chunks
+        }
+
+    async def stream_document(
+        self,
+        text: str,
+        transformation_type: TransformationType,
+        additional_instructions: Optional[str] = None,
+        quality: QualityMode = QualityMode.STANDARD,
+        deadline: Optional[Deadline] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield transformed chunks in document order as soon as each is ready."""
+        chunks = split_into_chunks(text)
+        tasks = self._start_chunks(chunks, transformation_type, additional_instructions, quality, deadline)
+        try:
+            for index, (chunk, task) in enumerate(zip(chunks, tasks)):
+                result = await task
+                yield {
+                    "index": index,
+                    "total_chunks": len(chunks),
+                    "original_text": chunk.text,
+                    "transformed_text": result['transformed_text'],
+                    "separator": chunk.separator,
+                    "cached": result['cached'],
+                    "engine": result['engine'],
+                    "model": result['model'],
+                    "skipped": result.get('skipped', False)
+                }
+        finally:
+            for task in tasks:
+                task.cancel()
+
+# Global document processor instance
+document_processor = DocumentProcessor()
@@ -0,0 +1,44 @@
+import logging
+from datetime import datetime
+from typing import Iterable
+from sqlalchemy.orm import Session
+from app.core.database import upsert_insert
+from app.models.database import HistoryVersion
+
+logger = logging.getLogger(__name__)
+
+class HistoryVersionTracker:
+    """Per-user history versions used as weak ETags for history listings.
+
+    Writers call bump() in the same transaction as the history change, so
+    the version and the rows commit (or roll back) together.
+    """
+
+    def get(self, db: Session, user_id: str) -> int:
+        """Current version for a user (0 if their history never changed)."""
+        version = db.query(HistoryVersion.version)\
+            .filter(HistoryVersion.user_id == user_id)\
+            .scalar()
+        return version or 0
+
+    def bump(self, db: Session, user_ids: Iterable[str]):
+        """Increment the version of each user; does not commit."""
+        now = datetime.utcnow()
+        insert = upsert_insert(db)
+        for user_id in set(user_ids):
+            if insert is not None:
+                db.execute(insert(HistoryVersion).values(
+                    user_id=user_id, version=1, updated_at=now
+                ).on_conflict_do_update(
+                    index_elements=[HistoryVersion.user_id],
+                    set_={"version": HistoryVersion.version + 1, "updated_at": now}
+                ))
+                continue
+            updated = db.query(HistoryVersion)\
+                .filter(HistoryVersion.user_id == user_id)\
+                .update({"version": HistoryVersion.version + 1, "updated_at": now}, synchronize_session=False)
+            if not updated:
+                db.add(HistoryVersion(user_id=user_id, version=1, updated_at=now))
+
+# Global history version tracker instance
+history_versions = HistoryVersionTracker()
@@ -0,0 +1,261 @@
+import time
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List
+from sqlalchemy import and_, or_, func
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.database import TransformationJob, TransformationJobItem
+from app.models.schemas import TransformationType, QualityMode
+from app.services.text_processor_simple import text_processor
+from app.services.prompt_registry import prompt_registry
+from app.utils.helpers import cache, prepare_text
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = ("completed", "cancelled")
+
+class JobManager:
+    """Background worker pool for bulk transformation jobs stored in the database."""
+
+    def __init__(self):
+        self.queue: Optional[asyncio.Queue] = None
+        self.workers: List[asyncio.Task] = []
+
+    async def start(self):
+        """Start workers; unfinished jobs are requeued in the background."""
+        if self.workers:
+            return
+        self.queue = asyncio.Queue()
+        self.workers = [
+            asyncio.create_task(self._worker(i))
+            for i in range(settings.job_workers)
+        ]
+        # Keep the database query off the startup path
+        self.workers.append(asyncio.create_task(self._requeue_unfinished()))
+
+    async def _requeue_unfinished(self):
+        """Requeue jobs left unfinished by a previous process."""
+        db = SessionLocal()
+        try:
+            # Every worker process requeues; _claim lets only one of them run each job
+            pending = db.query(TransformationJob.id).filter(
+                self._claimable(datetime.utcnow())
+            ).order_by(TransformationJob.created_at).all()
+            for (job_id,) in pending:
+                self.queue.put_nowait(job_id)
+            if pending:
+                logger.info(f"Requeued {len(pending)} unfinished jobs")
+        except Exception as e:
+            logger.error(f"Failed to requeue jobs: {str(e)}")
+        finally:
+            db.close()
+
+    async def stop(self):
+        """Stop workers; unfinished jobs resume on next start."""
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+    def submit(
+        self,
+        db: Session,
+        texts: List[str],
+        transformation_type: TransformationType,
+        additional_instructions: Optional[str] = None,
+        quality: QualityMode = QualityMode.STANDARD,
+        user_id: str = "anonymous"
+    ) -> TransformationJob:
+        """Persist a job and its items, then queue it for the workers."""
+        job = TransformationJob(
+            user_id=user_id,
+            transformation_type=transformation_type.value,
+            additional_instructions=additional_instructions,
+            quality=quality.value,
+            status="queued",
+            total_items=len(texts)
+        )
+        db.add(job)
+        db.flush()
+        db.bulk_insert_mappings(TransformationJobItem, [
+            {"job_id": job.id, "item_index": i, "original_text": text, "status": "pending"}
+            for i, text in enumerate(texts)
+        ])
+        db.commit()
+        db.refresh(job)
+
+        # Without running workers the job stays queued until the next start
+        if self.queue is not None:
+            self.queue.put_nowait(job.id)
+        logger.info(f"Queued job {job.id} with {len(texts)} items")
+        return job
+
+    def cancel(self, db: Session, job: TransformationJob) -> TransformationJob:
+        """Cancel a job; workers stop after their current page of items."""
+        if job.status in FINISHED_STATUSES:
+            return job
+        job.status = "cancelled"
+        job.finished_at = datetime.utcnow()
+        db.query(TransformationJobItem).filter(
+            TransformationJobItem.job_id == job.id,
+            TransformationJobItem.status == "pending"
+        ).update({"status": "cancelled"}, synchronize_session=False)
+        db.commit()
+        db.refresh(job)
+        logger.info(f"Cancelled job {job.id}")
+        return job
+
+    def _claimable(self, now: datetime):
+        """Queued jobs, or running jobs whose worker stopped updating them."""
+        stale_before = now - timedelta(seconds=settings.job_stale_after)
+        return or_(
+            TransformationJob.status == "queued",
+            and_(
+                TransformationJob.status == "running",
+                func.coalesce(TransformationJob.updated_at, TransformationJob.created_at) < stale_before
+            )
+        )
+
+    def _claim(self, db: Session, job_id: str) -> bool:
+        """Atomically mark a job running; False if another worker owns it."""
+        now = datetime.utcnow()
+        claimed = db.query(TransformationJob).filter(
+            TransformationJob.id == job_id,
+            self._claimable(now)
+        ).update({"status": "running", "updated_at": now}, synchronize_session=False)
+        db.commit()
+        return claimed == 1
+
+    async def _worker(self, worker_id: int):
+        while True:
+            job_id = await self.queue.get()
+            try:
+                await self._run_job(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Worker {worker_id} failed on job {job_id}: {str(e)}")
+            finally:
+                self.queue.task_done()
+
+    async def _run_job(self, job_id: str):
+        """Process a job's pending items page by page until done or cancelled."""
+        db = SessionLocal()
+        try:
+            if not self._claim(db, job_id):
+                return
+            job = db.query(TransformationJob).filter(TransformationJob.id == job_id).first()
+
+            transformation_type = TransformationType(job.transformation_type)
+            quality = QualityMode(job.quality)
+            page_size = settings.job_item_concurrency * 4
+
+            while True:
+                items = db.query(TransformationJobItem).filter(
+                    TransformationJobItem.job_id == job_id,
+                    TransformationJobItem.status == "pending"
+                ).order_by(TransformationJobItem.item_index).limit(page_size).all()
+                if not items:
+                    break
+
+                results = await self._process_items(
+                    items,
+                    transformation_type,
+                    job.additional_instructions,
+                    quality
+                )
+
+                # Stop without overwriting if the job was cancelled meanwhile
+                db.refresh(job)
+                if job.status == "cancelled":
+                    logger.info(f"Job {job_id} cancelled; stopping worker")
+                    return
+
+                completed = failed = 0
+                for item, result in zip(items, results):
+                    if result.get("error"):
+                        item.status = "failed"
+                        item.error = result["error"]
+                        failed += 1
+                    else:
+                        item.status = "completed"
+                        item.transformed_text = result["transformed_text"]
+                        item.processing_time = result["processing_time"]
+                        item.engine = result["engine"]
+                        completed += 1
+                job.completed_items += completed
+                job.failed_items += failed
+                db.commit()
+
+            # Conditional, so a cancel committed after the last page is not overwritten
+            finished = db.query(TransformationJob).filter(
+                TransformationJob.id == job_id,
+                TransformationJob.status == "running"
+            ).update({"status": "completed", "finished_at": datetime.utcnow()}, synchronize_session=False)
+            db.commit()
+            if not finished:
+                logger.info(f"Job {job_id} was cancelled before it could complete")
+                return
+            logger.info(f"Job {job_id} completed: {job.completed_items} ok, {job.failed_items} failed")
+        finally:
+            db.close()
+
+    async def _process_items(
+        self,
+        items: List[TransformationJobItem],
+        transformation_type: TransformationType,
+        additional_instructions: Optional[str],
+        quality: QualityMode
+    ) -> List[Dict[str, Any]]:
+        """Transform a page of items concurrently through the cache and limiter."""
+        semaphore = asyncio.Semaphore(settings.job_item_concurrency)
+        prompt_version = prompt_registry.version(transformation_type)
+
+        async def process(item: TransformationJobItem) -> Dict[str, Any]:
+            async with semaphore:
+                start_time = time.time()
+                try:
+                    prepared = prepare_text(item.original_text)
+                except ValueError as e:
+                    return {"error": str(e)}
+                cached_result = cache.get(
+                    prepared,
+                    transformation_type.value,
+                    additional_instructions,
+                    prompt_version
+                )
+                if cached_result:
+                    return {
+                        "transformed_text": cached_result,
+                        "processing_time": round(time.time() - start_time, 4),
+                        "engine": "cache"
+                    }
+                try:
+                    result = await text_processor.transform_text(
+                        prepared,
+                        transformation_type,
+                        additional_instructions,
+                        quality
+                    )
+                except Exception as e:
+                    return {"error": str(e)}
+                if result['engine'] != "local":
+                    cache.set(
+                        prepared,
+                        transformation_type.value,
+                        result['transformed_text'],
+                        additional_instructions,
+                        result['prompt_version'],
+                        processing_time=result['processing_time'],
+                        meta={"engine": result['engine'], "model": result.get('model')}
+                    )
+                return result
+
+        return await asyncio.gather(*[process(item) for item in items])
+
+# Global job manager instance
+job_manager = JobManager()
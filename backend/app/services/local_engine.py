@@ -0,0 +1,149 @@
+import re
+from typing import Optional
+from app.models.schemas import TransformationType
+
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+SPACE_BEFORE_PUNCT = re.compile(r"\s+([,.!?;:])")
+MISSING_SPACE_AFTER_PUNCT = re.compile(r"(?<=[,!?;:])(?=[A-Za-z])|(?<=\.)(?=[A-Z][a-z])")
+REPEATED_PUNCT = re.compile(r"([!?,;:])\1+")
+WORD = re.compile(r"[A-Za-z']+")
+
+# Only shorthand that is never a real word ("id", "wont", "cant", "u", "r" are left alone)
+SHORTHAND = {
+    "i": "I",
+    "im": "I'm",
+    "ive": "I've",
+    "pls": "please",
+    "plz": "please",
+    "thx": "thanks",
+    "dont": "don't",
+    "didnt": "didn't",
+    "doesnt": "doesn't",
+    "isnt": "isn't",
+    "wasnt": "wasn't",
+    "couldnt": "couldn't",
+    "wouldnt": "wouldn't",
+    "shouldnt": "shouldn't",
+}
+# Standalone lowercase tokens only, so "user_id", "ID" or "x.dont.com" are untouched
+SHORTHAND_PATTERN = re.compile(r"(?<!\S)(" + "|".join(SHORTHAND) + r")(?=[,.!?;:)]*(?:\s|$))")
+
+EMOJI_KEYWORDS = {
+    "happy": "😊", "love": "❤️", "thanks": "🙏", "thank": "🙏", "congrats": "🎉",
+    "congratulations": "🎉", "party": "🥳", "birthday": "🎂", "coffee": "☕",
+    "food": "🍽️", "pizza": "🍕", "music": "🎵", "work": "💼", "meeting": "📅",
+    "idea": "💡", "money": "💰", "travel": "✈️", "home": "🏠", "sun": "☀️",
+    "rain": "🌧️", "fire": "🔥", "great": "👍", "awesome": "🤩", "sad": "😢",
+    "sorry": "😔", "launch": "🚀", "success": "🏆", "win": "🏆", "book": "📚",
+    "learn": "🧠", "code": "💻", "email": "📧", "phone": "📱", "time": "⏰",
+    "morning": "🌅", "night": "🌙", "weekend": "🎉", "goal": "🎯", "question": "❓",
+}
+
+STOPWORDS = {
+    "the", "and", "for", "are", "but", "not", "you", "your", "with", "have",
+    "this", "that", "from", "they", "will", "would", "there", "their", "what",
+    "about", "which", "when", "were", "been", "into", "than", "then", "them",
+    "just", "very", "also", "some", "could", "should", "while", "these", "those",
+}
+
+TWEET_LIMIT = 280
+
+class LocalTransformEngine:
+    """Rule-based approximations of the cheap transformation types."""
+
+    SUPPORTED_TYPES = {
+        TransformationType.GRAMMAR_FIX,
+        TransformationType.BULLET,
+        TransformationType.TWEETIFY,
+        TransformationType.EMOJI,
+    }
+
+    def supports(self, transformation_type: TransformationType) -> bool:
+        """Check whether a transformation type has a local approximation."""
+        return transformation_type in self.SUPPORTED_TYPES
+
+    def transform(
+        self,
+        text: str,
+        transformation_type: TransformationType,
+        additional_instructions: Optional[str] = None
+    ) -> str:
+        """Apply the local approximation; additional instructions are ignored."""
+        handlers = {
+            TransformationType.GRAMMAR_FIX: self._grammar_fix,
+            TransformationType.BULLET: self._bullet,
+            TransformationType.TWEETIFY: self._tweetify,
+            TransformationType.EMOJI: self._emoji,
+        }
+        handler = handlers.get(transformation_type)
+        if not handler:
+            raise ValueError(f"No local engine for transformation type: {transformation_type}")
+        if transformation_type == TransformationType.TWEETIFY:
+            return handler(" ".join(text.split()))
+        # Keep paragraph breaks intact, e.g. for long-document chunks
+        paragraphs = (" ".join(p.split()) for p in PARAGRAPH_BREAK.split(text))
+        return "\n\n".join(handler(p) for p in paragraphs if p)
+
+    def _split_sentences(self, text: str) -> list:
+        return [sentence for sentence in SENTENCE_END.split(text) if sentence]
+
+    def _grammar_fix(self, text: str) -> str:
+        text = SHORTHAND_PATTERN.sub(lambda match: SHORTHAND[match.group(0)], text)
+        text = SPACE_BEFORE_PUNCT.sub(r"\1", text)
+        text = REPEATED_PUNCT.sub(r"\1", text)
+        text = " ".join(self._space_after_punct(token) for token in text.split(" "))
+        sentences = [s[0].upper() + s[1:] for s in self._split_sentences(text)]
+        text = " ".join(sentences)
+        if text and text[-1] not in ".!?":
+            text += "."
+        return text
+
+    def _space_after_punct(self, token: str) -> str:
+        # URLs, emails and times (digit:digit never matches) keep their punctuation
+        if "://" in token or "@" in token:
+            return token
+        return MISSING_SPACE_AFTER_PUNCT.sub(" ", token)
+
+    def _bullet(self, text: str) -> str:
+        return "\n".join(f"• {sentence}" for sentence in self._split_sentences(text))
+
+    def _tweetify(self, text: str) -> str:
+        tags = [f"#{word.capitalize()}" for word in self._keywords(text, 2)]
+        # Hashtags may take at most half the tweet; drop the ones that do not fit
+        while tags and len(" ".join(tags)) + 1 > TWEET_LIMIT // 2:
+            tags.pop()
+        hashtags = " ".join(tags)
+        budget = max(0, TWEET_LIMIT - (len(hashtags) + 1 if hashtags else 0))
+        if len(text) > budget:
+            cut = text[:max(0, budget - 1)]
+            # Break at a word boundary unless the text is one long word
+            if " " in cut:
+                cut = cut.rsplit(" ", 1)[0]
+            text = cut.rstrip(",;:") + "…"
+        return f"{text} {hashtags}".strip()
+
+    def _keywords(self, text: str, limit: int) -> list:
+        """Pick the longest distinct non-stopwords, in order of appearance."""
+        seen = list(dict.fromkeys(
+            word for word in (w.strip("'").lower() for w in WORD.findall(text))
+            if len(word) > 3 and word not in STOPWORDS
+        ))
+        longest = sorted(seen, key=len, reverse=True)[:limit]
+        return [word for word in seen if word in longest]
+
+    def _emoji(self, text: str) -> str:
+        used = set()
+
+        def add_emoji(match: re.Match) -> str:
+            word = match.group(0)
+            emoji = EMOJI_KEYWORDS.get(word.lower())
+            if not emoji or emoji in used:
+                return word
+            used.add(emoji)
+            return f"{word} {emoji}"
+
+        return WORD.sub(add_emoji, text)
+
+# Global local engine instance
+local_engine = LocalTransformEngine()
@@ -0,0 +1,200 @@
+import os
+import asyncio
+import hashlib
+import time
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Tuple
+from app.core.config import settings
+from app.core.http_client import http_client
+from app.models.schemas import TransformationType
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class ModelProvider:
+    """Base class for a chat-completion provider."""
+
+    def __init__(self, name: str, models: Optional[List[str]] = None):
+        self.name = name
+        self.models = models or []
+
+    async def complete(self, model: str, messages: List[Dict[str, str]], timeout: float) -> str:
+        raise NotImplementedError
+
+class OpenAICompatibleProvider(ModelProvider):
+    """Any provider exposing an OpenAI-style /chat/completions endpoint."""
+
+    def __init__(self, name: str, base_url: str, api_key: str = "", models: Optional[List[str]] = None):
+        super().__init__(name, models)
+        self.url = base_url.rstrip("/") + "/chat/completions"
+        self.headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        }
+
+    async def complete(self, model: str, messages: List[Dict[str, str]], timeout: float) -> str:
+        payload = {
+            "messages": messages,
+            "model": model,
+            "temperature": settings.temperature,
+            "max_tokens": settings.max_tokens,
+            "stream": False
+        }
+        response = await http_client.client.post(self.url, json=payload, headers=self.headers, timeout=timeout)
+
+        if response.status_code != 200:
+            raise Exception(f"{self.name} API error: {response.status_code} - {response.text}")
+
+        data = response.json()
+        return data["choices"][0]["message"]["content"].strip()
+
+class MockProvider(ModelProvider):
+    """Offline provider for tests and local development.
+
+    Returns the last message content in upper case after a fixed delay,
+    or raises when fail_rate triggers. Deterministic for a given input.
+    """
+
+    def __init__(self, name: str = "mock", latency: float = 0.0, fail_rate: float = 0.0, models: Optional[List[str]] = None):
+        super().__init__(name, models or ["mock-model"])
+        self.latency = latency
+        self.fail_rate = fail_rate
+
+    async def complete(self, model: str, messages: List[Dict[str, str]], timeout: float) -> str:
+        await asyncio.sleep(min(self.latency, timeout))
+        content = messages[-1]["content"]
+        if self.fail_rate and int(hashlib.md5(content.encode()).hexdigest(), 16) % 1000 < self.fail_rate * 1000:
+            raise Exception(f"{self.name} API error: simulated failure")
+        return content.upper()
+
+@dataclass
+class RouteStats:
+    """Rolling latency and error samples for one provider/model pair."""
+    samples: deque = field(default_factory=lambda: deque(maxlen=settings.router_window))
+    last_probe: float = 0.0
+
+    def record(self, latency: float, ok: bool):
+        if ok and not self.healthy:
+            # A successful probe: start the error window afresh
+            self.samples.clear()
+        self.samples.append((latency, ok))
+
+    def probe_due(self) -> bool:
+        """Claim the next probe of an unhealthy route once the interval has passed."""
+        now = time.monotonic()
+        if now - self.last_probe < settings.router_probe_interval:
+            return False
+        self.last_probe = now
+        return True
+
+    @property
+    def error_rate(self) -> float:
+        if not self.samples:
+            return 0.0
+        return sum(1 for _, ok in self.samples if not ok) / len(self.samples)
+
+    @property
+    def avg_latency(self) -> float:
+        latencies = [latency for latency, ok in self.samples if ok]
+        # Untried routes sort first so they get sampled at least once
+        return sum(latencies) / len(latencies) if latencies else 0.0
+
+    @property
+    def healthy(self) -> bool:
+        if len(self.samples) < settings.router_min_samples:
+            return True
+        return self.error_rate <= settings.router_max_error_rate
+
+class ModelRouter:
+    """Registry of providers that routes each request to the fastest healthy model."""
+
+    def __init__(self):
+        self.providers: Dict[str, ModelProvider] = {}
+        self.stats: Dict[Tuple[str, str], RouteStats] = {}
+
+    def register(self, provider: ModelProvider):
+        """Add or replace a provider."""
+        self.providers[provider.name] = provider
+        logger.info(f"Registered model provider: {provider.name}")
+
+    def _parse_route(self, route: str) -> Tuple[str, str]:
+        """Split 'provider:model' (or a bare model on the default provider)."""
+        if ":" in route:
+            provider, model = route.split(":", 1)
+            return provider, model
+        return settings.default_provider, route
+
+    def candidates(self, transformation_type: Optional[TransformationType] = None) -> List[Tuple[ModelProvider, str]]:
+        """Return routes for a type, healthy ones first, fastest first.
+
+        An unhealthy route is put first for one request per probe interval, so
+        it can recover; the next route is still there as its fallback.
+        """
+        preferences = []
+        if transformation_type is not None:
+            preferences = settings.model_preferences.get(transformation_type.value, [])
+        routes = [self._parse_route(route) for route in preferences]
+        default_route = (settings.default_provider, settings.default_model)
+        if default_route not in routes:
+            routes.append(default_route)
+
+        routes = [(p, m) for p, m in routes if p in self.providers]
+        if not routes:
+            raise Exception(f"No registered provider for {transformation_type}")
+
+        def rank(route):
+            stats = self.stats.get(route) or RouteStats()
+            if not stats.healthy and stats.probe_due():
+                return (0, 0.0)
+            return (1 if stats.healthy else 2, stats.avg_latency)
+
+        return [(self.providers[p], m) for p, m in sorted(routes, key=rank)]
+
+    def record(self, provider: ModelProvider, model: str, latency: float, ok: bool):
+        """Record the outcome of one upstream call."""
+        self.stats.setdefault((provider.name, model), RouteStats()).record(latency, ok)
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Summarise rolling stats per provider/model."""
+        return [
+            {
+                "provider": provider,
+                "model": model,
+                "samples": len(stats.samples),
+                "avg_latency": round(stats.avg_latency, 3),
+                "error_rate": round(stats.error_rate, 3),
+                "healthy": stats.healthy
+            }
+            for (provider, model), stats in self.stats.items()
+        ]
+
+def create_router() -> ModelRouter:
+    """Build the router from settings: Groq, a mock provider outside production and any extras."""
+    router = ModelRouter()
+    router.register(OpenAICompatibleProvider(
+        "groq",
+        "https://api.groq.com/openai/v1",
+        settings.groq_api_key
+    ))
+    if not settings.is_production or settings.default_provider == "mock":
+        # The canned provider is for development and tests, never a silent production fallback
+        router.register(MockProvider())
+    for name, config in settings.providers.items():
+        if config.get("base_url", "").startswith("mock://"):
+            router.register(MockProvider(
+                name,
+                latency=float(config.get("latency", 0.0)),
+                fail_rate=float(config.get("fail_rate", 0.0))
+            ))
+            continue
+        router.register(OpenAICompatibleProvider(
+            name,
+            config["base_url"],
+            os.getenv(config.get("api_key_env", ""), config.get("api_key", ""))
+        ))
+    return router
+
+# Global model router instance
+model_router = create_router()
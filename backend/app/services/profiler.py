@@ -0,0 +1,165 @@
+import io
+import time
+import uuid
+import random
+import pstats
+import marshal
+import cProfile
+import logging
+import tracemalloc
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional, Dict, Any, Deque
+from fastapi import Request, Response
+from app.core.config import settings
+from app.core.security import is_admin_token
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ProfileRecord:
+    """cProfile stats for one sampled request."""
+    method: str
+    path: str
+    status_code: int
+    duration: float
+    profile: cProfile.Profile
+    trigger: str
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status_code": self.status_code,
+            "duration_ms": round(self.duration * 1000, 1),
+            "trigger": self.trigger,
+            "created_at": self.created_at.isoformat()
+        }
+
+    def text(self, sort: str, limit: int) -> str:
+        out = io.StringIO()
+        pstats.Stats(self.profile, stream=out).sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def dump(self) -> bytes:
+        """Bytes in the format of pstats.Stats.dump_stats (snakeviz, pstats.Stats(path))."""
+        return marshal.dumps(pstats.Stats(self.profile).stats)
+
+class Profiler:
+    """Samples requests with cProfile and tracks memory growth with tracemalloc.
+
+    Profiling is off unless a sample rate is set or an admin sends X-Profile;
+    the per-request cost while off is one header lookup and one comparison.
+    """
+
+    def __init__(self):
+        self.sample_rate = settings.profiling_sample_rate
+        self.profiles: Deque[ProfileRecord] = deque(maxlen=settings.profiling_max_profiles)
+        self.busy = False
+        self.skipped = 0
+        self.memory_baseline: Optional[tracemalloc.Snapshot] = None
+
+    def _trigger(self, request: Request) -> Optional[str]:
+        if request.headers.get("x-profile") and is_admin_token(request.headers.get("x-admin-token")):
+            return "header"
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        """Run call_next, profiling it if the request is flagged or sampled."""
+        trigger = self._trigger(request)
+        if trigger is None:
+            return await call_next(request)
+        if self.busy:
+            # cProfile hooks the whole thread, so only one profile runs at a time
+            self.skipped += 1
+            return await call_next(request)
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler (e.g. a debugger) already owns the thread
+            self.skipped += 1
+            return await call_next(request)
+
+        # Other requests interleaving on this worker are included in the profile
+        self.busy = True
+        start_time = time.perf_counter()
+        try:
+            response = await call_next(request)
+        finally:
+            profile.disable()
+            self.busy = False
+
+        record = ProfileRecord(
+            method=request.method,
+            path=request.url.path,
+            status_code=response.status_code,
+            duration=time.perf_counter() - start_time,
+            profile=profile,
+            trigger=trigger
+        )
+        self.profiles.append(record)
+        response.headers["X-Profile-Id"] = record.id
+        logger.info(f"🔬 Profiled {record.method} {record.path} ({trigger}) as {record.id}")
+        return response
+
+    def get(self, profile_id: str) -> Optional[ProfileRecord]:
+        return next((record for record in self.profiles if record.id == profile_id), None)
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "sample_rate": self.sample_rate,
+            "profiles": len(self.profiles),
+            "max_profiles": self.profiles.maxlen,
+            "skipped_while_busy": self.skipped,
+            "memory_tracing": tracemalloc.is_tracing()
+        }
+
+    def memory_snapshot(self, limit: int = 20, rebase: bool = False) -> Dict[str, Any]:
+        """Start tracing on first call; afterwards report growth since the baseline."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(settings.profiling_traceback_frames)
+            self.memory_baseline = self._take_snapshot()
+            return {"status": "started", "message": "Baseline taken; call again to see growth"}
+
+        snapshot = self._take_snapshot()
+        growth = snapshot.compare_to(self.memory_baseline, "lineno")[:limit]
+        current, peak = tracemalloc.get_traced_memory()
+        if rebase:
+            self.memory_baseline = snapshot
+        return {
+            "status": "tracing",
+            "traced_mb": round(current / (1024 * 1024), 3),
+            "peak_mb": round(peak / (1024 * 1024), 3),
+            "top_growth": [
+                {
+                    "location": str(stat.traceback[0]),
+                    "size_diff_kb": round(stat.size_diff / 1024, 1),
+                    "size_kb": round(stat.size / 1024, 1),
+                    "count_diff": stat.count_diff
+                }
+                for stat in growth
+            ]
+        }
+
+    def _take_snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+
+    def stop_memory_tracing(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.memory_baseline = None
+
+# Global profiler instance
+profiler = Profiler()
@@ -0,0 +1,185 @@
+import logging
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List
+from app.core.config import settings
+from app.models.schemas import TransformationType
+from app.utils.helpers import estimate_tokens
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """A versioned prompt for one transformation type."""
+    version: str
+    instruction: str
+    legacy: bool = False
+
+    def build_messages(self, text: str, additional_instructions: Optional[str] = None) -> List[Dict[str, str]]:
+        """Render chat messages for the provider."""
+        if self.legacy:
+            prompt = self.instruction.format(
+                text=text,
+                additional_instructions=additional_instructions or "None"
+            )
+            return [{"role": "user", "content": prompt}]
+
+        # Static instruction first so the provider can reuse its cached prefix.
+        # Caller-supplied instructions stay in the user turn, delimited from
+        # the text, so they cannot act as system instructions.
+        content = text
+        if additional_instructions:
+            content = f"Text:\n{text}\n\nAdditional instructions:\n{additional_instructions}"
+        return [
+            {"role": "system", "content": self.instruction},
+            {"role": "user", "content": content}
+        ]
+
+# v1: the original inline templates, kept verbatim for rollback and comparison
+LEGACY_PROMPTS = {
+    TransformationType.GRAMMAR_FIX: """
+            Fix the grammar, spelling, and punctuation errors in the following text while preserving its original meaning and tone:
+
+            Text: {text}
+            
+            Additional instructions: {additional_instructions}
+            
+            Return only the corrected text without any explanations or quotes.
+            """,
+            
+    TransformationType.FORMAL: """
+            Rewrite the following text in a formal, professional tone suitable for business communication:
+
+            Text: {text}
+            
+            Additional instructions: {additional_instructions}
+            
+            Return only the formalized text without any explanations or quotes.
+            """,
+            
+    TransformationType.FRIENDLY: """
+            Rewrite the following text in a warm, friendly, and conversational tone:
+
+            Text: {text}
+            
+            Additional instructions: {additional_instructions}
+            
+            Return only the friendly version without any explanations or quotes.
+            """,
+            
+    TransformationType.SHORTEN: """
+            Make the following text more concise while preserving all key information and meaning:
+
+            Text: {text}
+            
+            Additional instructions: {additional_instructions}
+            
+            Return only the shortened text without any explanations or quotes.
+            """,
+            
+    TransformationType.EXPAND: """
+            Expand and elaborate on the following text, adding relevant details and explanations while maintaining the core message:
+
+            Text: {text}
+            
+            Additional instructions: {additional_instructions}
+            
+            Return only the expanded text without any explanations or quotes.
+            """,
+            
+    TransformationType.BULLET: """
+            Convert the following text into a clear, well-organized bullet point format:
+
+            Text: {text}
+            
+            Additional instructions: {additional_instructions}
+            
+            Return only the bullet points without any explanations or quotes. Use • for bullet points.
+            """,
+            
+    TransformationType.EMOJI: """
+            Enhance the following text by adding appropriate emojis to make it more engaging and expressive:
+
+            Text: {text}
+            
+            Additional instructions: {additional_instructions}
+            
+            Return only the text with emojis without any explanations or quotes.
+            """,
+            
+    TransformationType.TWEETIFY: """
+            Transform the following text into an engaging tweet (under 280 characters) with appropriate hashtags and emojis:
+
+            Text: {text}
+            
+            Additional instructions: {additional_instructions}
+            
+            Return only the tweet without any explanations or quotes.
+            """
+}
+
+COMPACT_PROMPTS = {
+    TransformationType.GRAMMAR_FIX: "Fix the grammar, spelling, and punctuation errors in the user's text while preserving its original meaning and tone. Return only the corrected text without any explanations or quotes.",
+    TransformationType.FORMAL: "Rewrite the user's text in a formal, professional tone suitable for business communication. Return only the formalized text without any explanations or quotes.",
+    TransformationType.FRIENDLY: "Rewrite the user's text in a warm, friendly, and conversational tone. Return only the friendly version without any explanations or quotes.",
+    TransformationType.SHORTEN: "Make the user's text more concise while preserving all key information and meaning. Return only the shortened text without any explanations or quotes.",
+    TransformationType.EXPAND: "Expand and elaborate on the user's text, adding relevant details and explanations while maintaining the core message. Return only the expanded text without any explanations or quotes.",
+    TransformationType.BULLET: "Convert the user's text into a clear, well-organized bullet point format. Return only the bullet points without any explanations or quotes. Use • for bullet points.",
+    TransformationType.EMOJI: "Enhance the user's text by adding appropriate emojis to make it more engaging and expressive. Return only the text with emojis without any explanations or quotes.",
+    TransformationType.TWEETIFY: "Transform the user's text into an engaging tweet (under 280 characters) with appropriate hashtags and emojis. Return only the tweet without any explanations or quotes.",
+}
+
+DEFAULT_VERSION = "v2"
+
+class PromptRegistry:
+    """Versioned prompt templates per transformation type."""
+
+    def __init__(self):
+        self.templates: Dict[TransformationType, Dict[str, PromptTemplate]] = {}
+        for transformation_type, template in LEGACY_PROMPTS.items():
+            self.register(transformation_type, PromptTemplate("v1", template, legacy=True))
+        for transformation_type, instruction in COMPACT_PROMPTS.items():
+            self.register(transformation_type, PromptTemplate("v2", instruction))
+
+    def register(self, transformation_type: TransformationType, template: PromptTemplate):
+        """Add a template version for a type."""
+        self.templates.setdefault(transformation_type, {})[template.version] = template
+
+    def version(self, transformation_type: TransformationType) -> str:
+        """Active version for a type; PROMPT_VERSIONS can pin another one."""
+        return settings.prompt_versions.get(transformation_type.value, DEFAULT_VERSION)
+
+    def get(self, transformation_type: TransformationType, version: Optional[str] = None) -> PromptTemplate:
+        """Look up a template, defaulting to the active version."""
+        versions = self.templates.get(transformation_type)
+        if not versions:
+            raise ValueError(f"Unsupported transformation type: {transformation_type}")
+        version = version or self.version(transformation_type)
+        if version not in versions:
+            raise ValueError(f"Unknown prompt version {version} for {transformation_type.value}")
+        return versions[version]
+
+    def _overhead_tokens(self, template: PromptTemplate, additional_instructions: Optional[str]) -> int:
+        """Tokens a template adds on top of the user's text."""
+        messages = template.build_messages("", additional_instructions)
+        return sum(estimate_tokens(message["content"]) for message in messages)
+
+    def token_savings(self) -> Dict[str, Dict[str, Any]]:
+        """Per-type prompt overhead of v1 against the active version."""
+        report = {}
+        for transformation_type in self.templates:
+            legacy = self.get(transformation_type, "v1")
+            active = self.get(transformation_type)
+            legacy_tokens = self._overhead_tokens(legacy, None)
+            active_tokens = self._overhead_tokens(active, None)
+            report[transformation_type.value] = {
+                "active_version": active.version,
+                "legacy_tokens": legacy_tokens,
+                "active_tokens": active_tokens,
+                "saved_tokens": legacy_tokens - active_tokens,
+                "saved_percent": round(100 * (legacy_tokens - active_tokens) / legacy_tokens, 1)
+            }
+        return report
+
+# Global prompt registry instance
+prompt_registry = PromptRegistry()
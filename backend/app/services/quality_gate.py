@@ -0,0 +1,130 @@
+import asyncio
+import logging
+from typing import Optional, Dict, Any, List
+from app.core.config import settings
+from app.models.schemas import TransformationType, QualityMode
+from app.services.text_processor_simple import text_processor
+from app.utils.similarity import similarity_scorer
+from app.utils.deadline import Deadline
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Per-type bounds on similarity (estimated word-set Jaccard) and on the
+# transformed/original character length ratio. Settings.quality_thresholds
+# overrides individual values.
+DEFAULT_THRESHOLDS: Dict[str, Dict[str, Any]] = {
+    "grammar_fix": {"min_similarity": 0.2, "min_length_ratio": 0.5, "max_length_ratio": 2.0, "allow_unchanged": True},
+    "formal": {"min_similarity": 0.05, "min_length_ratio": 0.3, "max_length_ratio": 4.0},
+    "friendly": {"min_similarity": 0.05, "min_length_ratio": 0.3, "max_length_ratio": 4.0},
+    "shorten": {"min_similarity": 0.05, "min_length_ratio": 0.05, "max_length_ratio": 1.05},
+    "expand": {"min_similarity": 0.05, "min_length_ratio": 1.0, "max_length_ratio": 20.0},
+    "bullet": {"min_similarity": 0.1, "min_length_ratio": 0.3, "max_length_ratio": 3.0},
+    "emoji": {"min_similarity": 0.3, "min_length_ratio": 0.9, "max_length_ratio": 3.0},
+    "tweetify": {"min_similarity": 0.02, "max_chars": 280},
+}
+
+# Result fields the gate sets; cached results keep them alongside the text
+QUALITY_FIELDS = ("similarity", "length_ratio", "quality_flags")
+
+class QualityGate:
+    """Scores transformation results and flags or retries outliers."""
+
+    def start(self):
+        """Set up the scorer in a background thread; requests are served meanwhile."""
+        if settings.quality_gate_enabled:
+            asyncio.get_running_loop().run_in_executor(None, similarity_scorer.warm_up)
+
+    def thresholds(self, transformation_type: TransformationType) -> Dict[str, Any]:
+        """Merge configured overrides onto the defaults for a type."""
+        return {
+            **DEFAULT_THRESHOLDS.get(transformation_type.value, {}),
+            **settings.quality_thresholds.get(transformation_type.value, {})
+        }
+
+    def _flags(self, result: Dict[str, Any], limits: Dict[str, Any]) -> List[str]:
+        flags = []
+        similarity = result['similarity']
+        length_ratio = result['length_ratio']
+        if result['transformed_text'].strip() == result['original_text'].strip():
+            if not limits.get("allow_unchanged"):
+                flags.append("unchanged")
+        elif similarity < limits.get("min_similarity", 0.0):
+            flags.append("drift")
+        if length_ratio < limits.get("min_length_ratio", 0.0):
+            flags.append("too_short")
+        if length_ratio > limits.get("max_length_ratio", float("inf")):
+            flags.append("too_long")
+        if len(result['transformed_text']) > limits.get("max_chars", float("inf")):
+            flags.append("over_char_limit")
+        return flags
+
+    def score(self, results: List[Dict[str, Any]], transformation_type: TransformationType) -> List[int]:
+        """Attach scores and flags to results in place; return flagged indices."""
+        scored = [i for i, result in enumerate(results) if not result.get('failed')]
+        similarity, length_ratio = similarity_scorer.score_batch(
+            [results[i]['original_text'] for i in scored],
+            [results[i]['transformed_text'] for i in scored]
+        )
+        limits = self.thresholds(transformation_type)
+
+        flagged = []
+        for position, i in enumerate(scored):
+            result = results[i]
+            result['similarity'] = round(float(similarity[position]), 3)
+            result['length_ratio'] = round(float(length_ratio[position]), 3)
+            result['quality_flags'] = self._flags(result, limits)
+            if result['quality_flags']:
+                flagged.append(i)
+        return flagged
+
+    async def review(
+        self,
+        results: List[Dict[str, Any]],
+        transformation_type: TransformationType,
+        additional_instructions: Optional[str] = None,
+        deadline: Optional[Deadline] = None
+    ) -> List[Dict[str, Any]]:
+        """Score results and, in retry mode, re-run flagged upstream results once.
+        
+        Retries share the request's deadline; one that runs out keeps the original.
+        """
+        if not settings.quality_gate_enabled or not results:
+            return results
+
+        flagged = self.score(results, transformation_type)
+        if flagged:
+            logger.warning(f"Quality gate flagged {len(flagged)}/{len(results)} {transformation_type.value} results")
+
+        retryable = [
+            i for i in flagged
+            if results[i].get('engine') != "local" and not results[i].get('cached')
+        ]
+        if settings.quality_gate_action != "retry" or not retryable:
+            return results
+        if deadline is not None and deadline.expired:
+            logger.warning(f"Skipping {len(retryable)} quality retries: deadline passed")
+            return results
+
+        retries = await asyncio.gather(*[
+            text_processor.transform_text(
+                results[i]['original_text'],
+                transformation_type,
+                additional_instructions,
+                QualityMode.STANDARD,
+                deadline
+            )
+            for i in retryable
+        ], return_exceptions=True)
+        candidates = [(i, r) for i, r in zip(retryable, retries) if not isinstance(r, Exception)]
+        self.score([r for _, r in candidates], transformation_type)
+
+        for i, retry in candidates:
+            if len(retry['quality_flags']) < len(results[i]['quality_flags']):
+                retry['processing_time'] = round(results[i]['processing_time'] + retry['processing_time'], 2)
+                retry['retried'] = True
+                results[i] = retry
+        return results
+
+# Global quality gate instance
+quality_gate = QualityGate()
@@ -1,163 +1,198 @@
+import json
 import time
+import hashlib
 import logging
-from typing import Optional, Dict, Any
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Tuple, AsyncIterator, Union
 import asyncio
-import httpx
 from app.core.config import settings
-from app.models.schemas import TransformationType
+from app.models.schemas import TransformationType, QualityMode
+from app.services.local_engine import local_engine
+from app.services.model_router import model_router
+from app.services.prompt_registry import prompt_registry
+from app.utils.metrics import metrics
+from app.utils.deadline import Deadline, DeadlineExceeded
+from app.utils.cancellation import ClientDisconnected
+from app.utils.timing import span
+from app.utils.helpers import PreparedText
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _unpack(text: Union[str, PreparedText]) -> Tuple[str, int]:
+    """Text and word count, reusing a PreparedText's count."""
+    if isinstance(text, PreparedText):
+        return text.text, text.word_count
+    return text, len(text.split())
+
+@dataclass
+class UpstreamFlight:
+    """One in-flight upstream call shared by every request that needs it."""
+    task: asyncio.Future
+    waiters: int = 0
+
 class SimpleTextProcessor:
-    """Simple text processor using direct Groq API calls without LangChain."""
+    """Simple text processor using direct OpenAI-compatible API calls without LangChain."""
     
     def __init__(self):
-        self.base_url = "https://api.groq.com/openai/v1/chat/completions"
-        self.headers = {
-            "Authorization": f"Bearer {settings.groq_api_key}",
-            "Content-Type": "application/json"
-        }
+        # Caps concurrent upstream calls across all routes
+        self.upstream_limiter = asyncio.Semaphore(settings.max_concurrent_upstream)
+        self.in_flight: Dict[str, UpstreamFlight] = {}
+    
+    async def _call_upstream_shared(
+        self,
+        messages: List[Dict[str, str]],
+        transformation_type: Optional[TransformationType] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, str]:
+        """Single-flight wrapper: identical concurrent calls share one upstream task.
         
-        # Define transformation prompts
-        self.transformation_prompts = {
-            TransformationType.GRAMMAR_FIX: """
-            Fix the grammar, spelling, and punctuation errors in the following text while preserving its original meaning and tone:
-
-            Text: {text}
-            
-            Additional instructions: {additional_instructions}
-            
-            Return only the corrected text without any explanations or quotes.
-            """,
-            
-            TransformationType.FORMAL: """
-            Rewrite the following text in a formal, professional tone suitable for business communication:
-
-            Text: {text}
-            
-            Additional instructions: {additional_instructions}
-            
-            Return only the formalized text without any explanations or quotes.
-            """,
-            
-            TransformationType.FRIENDLY: """
-            Rewrite the following text in a warm, friendly, and conversational tone:
-
-            Text: {text}
-            
-            Additional instructions: {additional_instructions}
-            
-            Return only the friendly version without any explanations or quotes.
-            """,
-            
-            TransformationType.SHORTEN: """
-            Make the following text more concise while preserving all key information and meaning:
-
-            Text: {text}
-            
-            Additional instructions: {additional_instructions}
-            
-            Return only the shortened text without any explanations or quotes.
-            """,
-            
-            TransformationType.EXPAND: """
-            Expand and elaborate on the following text, adding relevant details and explanations while maintaining the core message:
-
-            Text: {text}
-            
-            Additional instructions: {additional_instructions}
-            
-            Return only the expanded text without any explanations or quotes.
-            """,
-            
-            TransformationType.BULLET: """
-            Convert the following text into a clear, well-organized bullet point format:
-
-            Text: {text}
-            
-            Additional instructions: {additional_instructions}
-            
-            Return only the bullet points without any explanations or quotes. Use • for bullet points.
-            """,
-            
-            TransformationType.EMOJI: """
-            Enhance the following text by adding appropriate emojis to make it more engaging and expressive:
-
-            Text: {text}
-            
-            Additional instructions: {additional_instructions}
-            
-            Return only the text with emojis without any explanations or quotes.
-            """,
-            
-            TransformationType.TWEETIFY: """
-            Transform the following text into an engaging tweet (under 280 characters) with appropriate hashtags and emojis:
-
-            Text: {text}
-            
-            Additional instructions: {additional_instructions}
-            
-            Return only the tweet without any explanations or quotes.
-            """
-        }
+        Waiters await the task through a shield, so a cancelled waiter (e.g. its
+        client disconnected or its deadline passed) only cancels the call when no
+        other waiter is left. The task itself runs under the first caller's deadline.
+        """
+        key = hashlib.blake2b(
+            json.dumps([transformation_type, messages]).encode(),
+            digest_size=16
+        ).hexdigest()
+        flight = self.in_flight.get(key)
+        if flight is None:
+            flight = UpstreamFlight(asyncio.ensure_future(self._call_upstream(messages, transformation_type, deadline)))
+            self.in_flight[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget_flight(key, flight))
+        else:
+            metrics.increment("upstream_coalesced")
+        
+        flight.waiters += 1
+        try:
+            with span("flight"):
+                if deadline is None:
+                    return await asyncio.shield(flight.task)
+                return await deadline.run(asyncio.shield(flight.task), "upstream call")
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+                metrics.increment("upstream_cancelled")
+                logger.info("Cancelled upstream call: no request is waiting for it")
     
-    async def _call_groq_api(self, prompt: str) -> str:
-        """Make a direct API call to Groq."""
-        payload = {
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "model": settings.default_model,
-            "temperature": settings.temperature,
-            "max_tokens": settings.max_tokens,
-            "stream": False
-        }
+    def _forget_flight(self, key: str, flight: UpstreamFlight):
+        if self.in_flight.get(key) is flight:
+            del self.in_flight[key]
+    
+    async def _call_upstream(
+        self,
+        messages: List[Dict[str, str]],
+        transformation_type: Optional[TransformationType] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, str]:
+        """Call the fastest healthy model, falling back to the next one on error.
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.base_url,
-                json=payload,
-                headers=self.headers,
-                timeout=30.0
-            )
-            
-            if response.status_code != 200:
-                raise Exception(f"Groq API error: {response.status_code} - {response.text}")
-            
-            data = response.json()
-            return data["choices"][0]["message"]["content"].strip()
+        With a deadline, each attempt (including the wait for the limiter) gets
+        only the remaining budget and no further attempt starts once it is spent.
+        """
+        last_error = None
+        routes = model_router.candidates(transformation_type)[:settings.router_max_attempts]
+        
+        async def attempt(provider, model: str, timeout: float) -> str:
+            with span("queue"):
+                await self.upstream_limiter.acquire()
+            # Timed from here so routing latency excludes the wait for the limiter;
+            # a deadline cancelling the call is not counted against the route
+            start_time = time.time()
+            try:
+                with span("upstream"):
+                    content = await provider.complete(model, messages, timeout=timeout)
+            except Exception:
+                model_router.record(provider, model, time.time() - start_time, ok=False)
+                raise
+            finally:
+                self.upstream_limiter.release()
+            model_router.record(provider, model, time.time() - start_time, ok=True)
+            return content
+        
+        for provider, model in routes:
+            try:
+                if deadline is None:
+                    content = await attempt(provider, model, settings.upstream_timeout)
+                else:
+                    content = await deadline.run(
+                        attempt(provider, model, deadline.cap(settings.upstream_timeout)),
+                        f"{provider.name}:{model}"
+                    )
+                return {"content": content, "provider": provider.name, "model": model}
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                logger.warning(f"{provider.name}:{model} failed: {str(e)}")
+                last_error = e
+        
+        raise last_error
     
-    async def transform_text(
+    async def _call_groq_api(self, prompt: str, transformation_type: Optional[TransformationType] = None) -> str:
+        """Send a single user prompt upstream and return the completion text."""
+        result = await self._call_upstream([{"role": "user", "content": prompt}], transformation_type)
+        return result["content"]
+    
+    def _use_local_engine(self, transformation_type: TransformationType, quality: QualityMode) -> bool:
+        """Decide up front whether to skip Groq for the local engine."""
+        if not local_engine.supports(transformation_type):
+            return False
+        if quality == QualityMode.FAST:
+            return True
+        return (
+            settings.local_fallback_enabled
+            and settings.local_fallback_when_saturated
+            and self.upstream_limiter.locked()
+        )
+    
+    def _transform_locally(
         self,
         text: str,
         transformation_type: TransformationType,
-        additional_instructions: Optional[str] = None
+        additional_instructions: Optional[str],
+        start_time: float,
+        word_count: int
+    ) -> Dict[str, Any]:
+        """Build a result from the local engine."""
+        transformed_text = local_engine.transform(text, transformation_type, additional_instructions)
+        processing_time = time.time() - start_time
+        return {
+            "original_text": text,
+            "transformed_text": transformed_text,
+            "transformation_type": transformation_type,
+            "processing_time": round(processing_time, 4),
+            "word_count_original": word_count,
+            "word_count_transformed": len(transformed_text.split()),
+            "engine": "local"
+        }
+    
+    async def transform_text(
+        self,
+        text: Union[str, PreparedText],
+        transformation_type: TransformationType,
+        additional_instructions: Optional[str] = None,
+        quality: QualityMode = QualityMode.STANDARD,
+        deadline: Optional[Deadline] = None
     ) -> Dict[str, Any]:
         """Transform text using the specified transformation type."""
         start_time = time.time()
+        text, word_count = _unpack(text)
+        
+        if self._use_local_engine(transformation_type, quality):
+            logger.info(f"Transforming text locally with type: {transformation_type}")
+            return self._transform_locally(text, transformation_type, additional_instructions, start_time, word_count)
         
         try:
             # Get the prompt template
-            prompt_template = self.transformation_prompts.get(transformation_type)
-            if not prompt_template:
-                raise ValueError(f"Unsupported transformation type: {transformation_type}")
-            
-            # Format the prompt
-            prompt = prompt_template.format(
-                text=text,
-                additional_instructions=additional_instructions or "None"
-            )
+            template = prompt_registry.get(transformation_type)
+            messages = template.build_messages(text, additional_instructions)
             
-            # Call Groq API
-            logger.info(f"Transforming text with type: {transformation_type}")
-            transformed_text = await self._call_groq_api(prompt)
+            logger.info(f"Transforming text with type: {transformation_type} (prompt {template.version})")
+            upstream = await self._call_upstream_shared(messages, transformation_type, deadline)
             
             # Clean up the response
-            transformed_text = transformed_text.strip()
+            transformed_text = upstream["content"].strip()
             if transformed_text.startswith('"') and transformed_text.endswith('"'):
                 transformed_text = transformed_text[1:-1]
             
@@ -168,24 +203,35 @@ class SimpleTextProcessor:
                 "transformed_text": transformed_text,
                 "transformation_type": transformation_type,
                 "processing_time": round(processing_time, 2),
-                "word_count_original": len(text.split()),
-                "word_count_transformed": len(transformed_text.split())
+                "word_count_original": word_count,
+                "word_count_transformed": len(transformed_text.split()),
+                "engine": upstream["provider"],
+                "model": upstream["model"],
+                "prompt_version": template.version
             }
             
             logger.info(f"Transformation completed in {processing_time:.2f} seconds")
             return result
             
+        except (DeadlineExceeded, ClientDisconnected):
+            # Nobody is waiting for a result; don't do more work or report success
+            raise
         except Exception as e:
             logger.error(f"Error during text transformation: {str(e)}")
+            if settings.local_fallback_enabled and local_engine.supports(transformation_type):
+                logger.warning(f"Falling back to local engine for {transformation_type}")
+                return self._transform_locally(text, transformation_type, additional_instructions, start_time, word_count)
             raise Exception(f"Text transformation failed: {str(e)}")
     
     async def batch_transform(
         self,
         texts: list,
         transformation_type: TransformationType,
-        additional_instructions: Optional[str] = None
+        additional_instructions: Optional[str] = None,
+        quality: QualityMode = QualityMode.STANDARD,
+        deadline: Optional[Deadline] = None
     ) -> Dict[str, Any]:
-        """Transform multiple texts at once."""
+        """Transform multiple texts at once; texts still pending at the deadline fail."""
         start_time = time.time()
         results = []
         successful = 0
@@ -194,7 +240,7 @@ class SimpleTextProcessor:
         # Process texts concurrently
         tasks = []
         for text in texts:
-            task = self.transform_text(text, transformation_type, additional_instructions)
+            task = self.transform_text(text, transformation_type, additional_instructions, quality, deadline)
             tasks.append(task)
         
         # Wait for all tasks to complete
@@ -202,16 +248,9 @@ class SimpleTextProcessor:
         
         for i, result in enumerate(task_results):
             if isinstance(result, Exception):
-                logger.error(f"Failed to transform text: {texts[i][:50]}... Error: {str(result)}")
+                logger.error(f"Failed to transform text: {str(texts[i])[:50]}... Error: {str(result)}")
                 failed += 1
-                results.append({
-                    "original_text": texts[i],
-                    "transformed_text": f"Error: {str(result)}",
-                    "transformation_type": transformation_type,
-                    "processing_time": 0,
-                    "word_count_original": len(texts[i].split()),
-                    "word_count_transformed": 0
-                })
+                results.append(self._failed_result(texts[i], transformation_type, result))
             else:
                 successful += 1
                 results.append(result)
@@ -222,7 +261,53 @@ class SimpleTextProcessor:
             "results": results,
             "total_processing_time": round(total_processing_time, 2),
             "successful_transformations": successful,
-            "failed_transformations": failed
+            "failed_transformations": failed,
+            "deadline_exceeded": any(isinstance(result, DeadlineExceeded) for result in task_results)
+        }
+    
+    async def iter_batch_transform(
+        self,
+        texts: list,
+        transformation_type: TransformationType,
+        additional_instructions: Optional[str] = None,
+        quality: QualityMode = QualityMode.STANDARD,
+        deadline: Optional[Deadline] = None
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (index, result) for multiple texts in completion order."""
+        async def run(index: int, text: str) -> Tuple[int, Dict[str, Any]]:
+            try:
+                return index, await self.transform_text(
+                    text, transformation_type, additional_instructions, quality, deadline
+                )
+            except Exception as e:
+                logger.error(f"Failed to transform text: {str(text)[:50]}... Error: {str(e)}")
+                return index, self._failed_result(text, transformation_type, e)
+        
+        tasks = [asyncio.create_task(run(i, text)) for i, text in enumerate(texts)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    def _failed_result(
+        self,
+        text: Union[str, PreparedText],
+        transformation_type: TransformationType,
+        error: Exception
+    ) -> Dict[str, Any]:
+        """Placeholder result for a text that could not be transformed."""
+        text, word_count = _unpack(text)
+        return {
+            "original_text": text,
+            "transformed_text": f"Error: {str(error)}",
+            "transformation_type": transformation_type,
+            "processing_time": 0,
+            "word_count_original": word_count,
+            "word_count_transformed": 0,
+            "failed": True,
+            "deadline_exceeded": isinstance(error, DeadlineExceeded)
         }
     
     async def health_check(self) -> Dict[str, str]:
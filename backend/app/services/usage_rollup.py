@@ -0,0 +1,128 @@
+import logging
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Iterable, Optional, Dict, Any, Tuple
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+from app.core.database import upsert_insert
+from app.models.database import TransformationHistory, UsageRollup
+
+logger = logging.getLogger(__name__)
+
+COUNTERS = ("requests", "words_in", "words_out", "processing_time", "cache_hits")
+
+class UsageRollupTracker:
+    """Maintains usage_rollups incrementally and serves /stats from it.
+
+    Writers call record() in the same transaction as the history insert, so
+    counters and rows commit (or roll back) together. Deleting history does
+    not decrement usage; rebuild() recomputes from what history remains.
+    """
+
+    def record(self, db: Session, records: Iterable[TransformationHistory]):
+        """Add history records to their day's counters; does not commit."""
+        increments: Dict[Tuple[date, str, str], Dict[str, float]] = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+        for record in records:
+            day = (record.created_at or datetime.utcnow()).date()
+            counters = increments[(day, record.user_id, record.transformation_type)]
+            counters["requests"] += 1
+            counters["words_in"] += record.word_count_original or 0
+            counters["words_out"] += record.word_count_transformed or 0
+            counters["processing_time"] += record.processing_time or 0.0
+            counters["cache_hits"] += 1 if record.cache_hit else 0
+
+        now = datetime.utcnow()
+        insert = upsert_insert(db)
+        for (day, user_id, transformation_type), counters in increments.items():
+            key = {"day": day, "user_id": user_id, "transformation_type": transformation_type}
+            if insert is not None:
+                statement = insert(UsageRollup).values(**key, **counters, updated_at=now)
+                db.execute(statement.on_conflict_do_update(
+                    index_elements=[UsageRollup.day, UsageRollup.user_id, UsageRollup.transformation_type],
+                    set_={
+                        **{name: getattr(UsageRollup, name) + getattr(statement.excluded, name) for name in COUNTERS},
+                        "updated_at": now
+                    }
+                ))
+                continue
+            updated = db.query(UsageRollup).filter_by(**key).update(
+                {**{name: getattr(UsageRollup, name) + value for name, value in counters.items()}, "updated_at": now},
+                synchronize_session=False
+            )
+            if not updated:
+                db.add(UsageRollup(**key, **counters, updated_at=now))
+
+    def rebuild(self, db: Session, since: Optional[date] = None) -> int:
+        """Recompute rollups (from `since`, else all) from raw history; does not commit."""
+        deleted = db.query(UsageRollup)
+        history = db.query(
+            func.date(TransformationHistory.created_at).label("day"),
+            TransformationHistory.user_id,
+            TransformationHistory.transformation_type,
+            func.count().label("requests"),
+            func.coalesce(func.sum(TransformationHistory.word_count_original), 0).label("words_in"),
+            func.coalesce(func.sum(TransformationHistory.word_count_transformed), 0).label("words_out"),
+            func.coalesce(func.sum(TransformationHistory.processing_time), 0.0).label("processing_time"),
+            func.sum(case((TransformationHistory.cache_hit == True, 1), else_=0)).label("cache_hits")
+        ).filter(TransformationHistory.created_at.isnot(None))
+        if since is not None:
+            deleted = deleted.filter(UsageRollup.day >= since)
+            history = history.filter(TransformationHistory.created_at >= datetime.combine(since, datetime.min.time()))
+        deleted.delete(synchronize_session=False)
+
+        now = datetime.utcnow()
+        rows = history.group_by(
+            func.date(TransformationHistory.created_at),
+            TransformationHistory.user_id,
+            TransformationHistory.transformation_type
+        ).all()
+        for row in rows:
+            values = row._asdict()
+            # SQLite's date() returns text
+            if isinstance(values["day"], str):
+                values["day"] = date.fromisoformat(values["day"])
+            db.add(UsageRollup(**values, updated_at=now))
+        logger.info(f"Rebuilt {len(rows)} usage rollups" + (f" since {since}" if since else ""))
+        return len(rows)
+
+    def get_stats(self, db: Session, user_id: Optional[str], days: int) -> Dict[str, Any]:
+        """Usage over the last `days` UTC days for one user, or everyone if user_id is None."""
+        since = datetime.utcnow().date() - timedelta(days=days - 1)
+        query = db.query(
+            UsageRollup.day,
+            UsageRollup.transformation_type,
+            *[func.sum(getattr(UsageRollup, name)).label(name) for name in COUNTERS]
+        ).filter(UsageRollup.day >= since)
+        if user_id is not None:
+            query = query.filter(UsageRollup.user_id == user_id)
+        rows = query.group_by(UsageRollup.day, UsageRollup.transformation_type).all()
+
+        totals = dict.fromkeys(COUNTERS, 0)
+        by_type: Dict[str, Dict[str, float]] = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+        by_day: Dict[date, Dict[str, float]] = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+        for row in rows:
+            for name in COUNTERS:
+                value = getattr(row, name) or 0
+                totals[name] += value
+                by_type[row.transformation_type][name] += value
+                by_day[row.day][name] += value
+
+        return {
+            "user_id": user_id,
+            "days": days,
+            "since": since.isoformat(),
+            "totals": self._summarize(totals),
+            "by_type": {name: self._summarize(counters) for name, counters in sorted(by_type.items())},
+            "by_day": [{"day": day.isoformat(), **self._summarize(by_day[day])} for day in sorted(by_day)]
+        }
+
+    def _summarize(self, counters: Dict[str, float]) -> Dict[str, Any]:
+        requests = counters["requests"]
+        return {
+            **counters,
+            "processing_time": round(counters["processing_time"], 3),
+            "cache_hit_rate": round(counters["cache_hits"] / requests, 3) if requests else 0.0
+        }
+
+# Global usage rollup tracker instance
+usage_rollups = UsageRollupTracker()
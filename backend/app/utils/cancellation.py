@@ -0,0 +1,67 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable
+from starlette.requests import Request
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+class ClientDisconnected(Exception):
+    """Raised when a request's work is abandoned because its client left."""
+
+async def _wait_for_disconnect(request: Request):
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+async def run_until_disconnect(request: Request, work: Awaitable[Any], route: str) -> Any:
+    """Await work, cancelling it (and its upstream calls) if the client disconnects."""
+    task = asyncio.ensure_future(work)
+    watcher = asyncio.ensure_future(_wait_for_disconnect(request))
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        watcher.cancel()
+    if task.done():
+        return task.result()
+
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    metrics.increment("requests_cancelled", route=route)
+    logger.info(f"Client disconnected; cancelled {route} request")
+    raise ClientDisconnected(route)
+
+async def stream_until_disconnect(request: Request, stream: AsyncIterator[Any], route: str) -> AsyncIterator[Any]:
+    """Relay a stream, closing it as soon as the client disconnects.
+
+    Without this, a disconnect is only noticed when the next chunk fails to
+    send, which can be long after the client left.
+    """
+    watcher = asyncio.ensure_future(_wait_for_disconnect(request))
+    next_item = None
+    completed = False
+    try:
+        while True:
+            next_item = asyncio.ensure_future(stream.__anext__())
+            await asyncio.wait({next_item, watcher}, return_when=asyncio.FIRST_COMPLETED)
+            if not next_item.done():
+                return
+            try:
+                item = next_item.result()
+            except StopAsyncIteration:
+                completed = True
+                return
+            yield item
+    finally:
+        # Also reached when the server notices the disconnect first and cancels
+        # us, in which case every await below may raise again: record first
+        watcher.cancel()
+        if next_item is not None and not next_item.done():
+            next_item.cancel()
+        if not completed:
+            metrics.increment("requests_cancelled", route=route)
+            logger.info(f"Client disconnected; cancelled {route} stream")
+        if next_item is not None:
+            await asyncio.gather(next_item, return_exceptions=True)
+        await stream.aclose()
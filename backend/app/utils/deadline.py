@@ -0,0 +1,55 @@
+import time
+import asyncio
+from typing import Optional, Awaitable, TypeVar
+from app.core.config import settings
+
+T = TypeVar("T")
+
+class DeadlineExceeded(Exception):
+    """Raised when a request's time budget runs out before a stage finishes."""
+
+class Deadline:
+    """Point in time (monotonic clock) by which a request must be answered."""
+
+    def __init__(self, budget: float):
+        self.budget = budget
+        self.expires_at = time.monotonic() + budget
+
+    @classmethod
+    def from_request(cls, header: Optional[str] = None, field: Optional[float] = None) -> "Deadline":
+        """Budget from the request field, else the header, else the server default."""
+        budget = settings.request_timeout_default
+        if field is not None:
+            budget = field
+        elif header:
+            budget = float(header)
+        if budget <= 0:
+            raise ValueError("timeout must be positive")
+        return cls(min(budget, settings.request_timeout_max))
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self, stage: str):
+        """Raise DeadlineExceeded if there is no budget left for a stage."""
+        if self.expired:
+            raise DeadlineExceeded(f"Deadline exceeded before {stage}")
+
+    def cap(self, timeout: float) -> float:
+        """A stage's own timeout, shortened to the remaining budget."""
+        return min(timeout, self.remaining())
+
+    async def run(self, awaitable: Awaitable[T], stage: str) -> T:
+        """Await within the remaining budget; the awaitable is cancelled on expiry."""
+        if self.expired:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            raise DeadlineExceeded(f"Deadline exceeded before {stage}")
+        try:
+            return await asyncio.wait_for(awaitable, self.remaining())
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(f"Deadline exceeded during {stage}")
@@ -0,0 +1,209 @@
+import re
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple
+from app.core.config import settings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TOKEN = re.compile(r"\w+|[^\w\s]")
+
+def _tokenize(text: str) -> Tuple[List[str], List[int], List[int]]:
+    """Split text into word/punctuation tokens with their character offsets."""
+    tokens, starts, ends = [], [], []
+    for match in TOKEN.finditer(text):
+        tokens.append(match.group(0))
+        starts.append(match.start())
+        ends.append(match.end())
+    return tokens, starts, ends
+
+def _myers(a: List[str], b: List[str], max_edits: int) -> Optional[List[Tuple[str, int, int]]]:
+    """Myers O(ND) shortest edit script; returns None past max_edits."""
+    n, m = len(a), len(b)
+    max_d = min(n + m, max_edits)
+    offset = max_d + 1
+    v = [0] * (2 * max_d + 3)
+    trace = []
+
+    for d in range(max_d + 1):
+        # Only diagonals -d-1..d+1 are read when backtracking step d
+        trace.append(v[offset - d - 1:offset + d + 2])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, n, m)
+    return None
+
+def _backtrack(trace: List[List[int]], n: int, m: int) -> List[Tuple[str, int, int]]:
+    """Walk the saved frontiers back from (n, m) into an edit script."""
+    ops = []
+    x, y = n, m
+    for d in range(len(trace) - 1, -1, -1):
+        frontier = trace[d]
+        k = x - y
+        if k == -d or (k != d and frontier[k - 1 + d + 1] < frontier[k + 1 + d + 1]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = frontier[prev_k + d + 1]
+        prev_y = prev_x - prev_k
+        while x > prev_x and y > prev_y:
+            x -= 1
+            y -= 1
+            ops.append(("equal", x, y))
+        if d > 0:
+            if x == prev_x:
+                ops.append(("insert", x, prev_y))
+            else:
+                ops.append(("delete", prev_x, y))
+        x, y = prev_x, prev_y
+    ops.reverse()
+    return ops
+
+def _edit_script(a: List[str], b: List[str]) -> List[Tuple[str, int, int]]:
+    """Trim the common prefix/suffix, then diff only the middle."""
+    prefix = 0
+    while prefix < len(a) and prefix < len(b) and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while (suffix < len(a) - prefix and suffix < len(b) - prefix
+           and a[-1 - suffix] == b[-1 - suffix]):
+        suffix += 1
+
+    middle_a = a[prefix:len(a) - suffix]
+    middle_b = b[prefix:len(b) - suffix]
+    middle = _myers(middle_a, middle_b, settings.diff_max_edits)
+    if middle is None:
+        # Too different to be worth aligning: treat the middle as one replace
+        middle = [("delete", i, 0) for i in range(len(middle_a))]
+        middle += [("insert", len(middle_a), j) for j in range(len(middle_b))]
+
+    ops = [("equal", i, i) for i in range(prefix)]
+    ops += [(op, i + prefix, j + prefix) for op, i, j in middle]
+    ops += [
+        ("equal", len(a) - suffix + i, len(b) - suffix + i)
+        for i in range(suffix)
+    ]
+    return ops
+
+def compute_word_diff(original: str, transformed: str) -> Dict[str, Any]:
+    """Compute word-level equal/insert/delete/replace spans between two texts."""
+    a, a_starts, a_ends = _tokenize(original)
+    b, b_starts, b_ends = _tokenize(transformed)
+
+    def a_range(i0: int, i1: int) -> Tuple[int, int]:
+        if i0 == i1:
+            pos = a_starts[i0] if i0 < len(a) else len(original)
+            return pos, pos
+        return a_starts[i0], a_ends[i1 - 1]
+
+    def b_range(j0: int, j1: int) -> Tuple[int, int]:
+        if j0 == j1:
+            pos = b_starts[j0] if j0 < len(b) else len(transformed)
+            return pos, pos
+        return b_starts[j0], b_ends[j1 - 1]
+
+    spans = []
+    counts = {"equal": 0, "insert": 0, "delete": 0, "replace": 0}
+
+    def add_span(op: str, i0: int, i1: int, j0: int, j1: int):
+        o_start, o_end = a_range(i0, i1)
+        t_start, t_end = b_range(j0, j1)
+        spans.append({
+            "op": op,
+            "original_text": original[o_start:o_end],
+            "transformed_text": transformed[t_start:t_end],
+            "original_start": o_start,
+            "original_end": o_end,
+            "transformed_start": t_start,
+            "transformed_end": t_end
+        })
+        counts[op] += 1
+
+    # Group the token-level script into runs of equal tokens and the
+    # changes between them; a run with both deletes and inserts is a replace.
+    i = j = 0
+    run_op = None
+    run_i, run_j = 0, 0
+    for op, x, y in _edit_script(a, b) + [("end", len(a), len(b))]:
+        kind = "equal" if op == "equal" else "change"
+        if kind != run_op or op == "end":
+            if run_op == "equal":
+                add_span("equal", run_i, i, run_j, j)
+            elif run_op == "change":
+                if run_i < i and run_j < j:
+                    add_span("replace", run_i, i, run_j, j)
+                elif run_i < i:
+                    add_span("delete", run_i, i, run_j, j)
+                else:
+                    add_span("insert", run_i, i, run_j, j)
+            run_op, run_i, run_j = kind, i, j
+        if op == "equal":
+            i, j = x + 1, y + 1
+        elif op == "delete":
+            i = x + 1
+        elif op == "insert":
+            j = y + 1
+
+    return {
+        "spans": spans,
+        "insertions": counts["insert"],
+        "deletions": counts["delete"],
+        "replacements": counts["replace"],
+        "tokens_original": len(a),
+        "tokens_transformed": len(b)
+    }
+
+class DiffService:
+    """Runs word diffs on a worker pool and caches them by content hash."""
+
+    def __init__(self, max_size: int = 256, workers: int = 2):
+        self.cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.max_size = max_size
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _make_key(self, original: str, transformed: str) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(original.encode())
+        digest.update(b"\0")
+        digest.update(transformed.encode())
+        return digest.hexdigest()
+
+    async def diff(self, original: str, transformed: str) -> Dict[str, Any]:
+        """Return the diff for a pair of texts without blocking the event loop."""
+        key = self._make_key(original, transformed)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="diff"
+            )
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self._executor, compute_word_diff, original, transformed)
+
+        self.cache[key] = result
+        if len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
+        return result
+
+# Global diff service instance
+diff_service = DiffService(
+    max_size=settings.diff_cache_size,
+    workers=settings.diff_workers
+)
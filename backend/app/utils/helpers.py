@@ -1,24 +1,38 @@
+import re
+import sys
+import heapq
 import hashlib
 import time
 import logging
-from typing import Optional, Dict, Any
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Dict, Any, Union
 from app.core.config import settings
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class SimpleCache:
-    """Simple in-memory cache with TTL support."""
+    """Simple in-memory cache with TTL support and per-type effectiveness stats."""
     
     def __init__(self, max_size: int = 1000, ttl: int = 3600):
         self.cache: Dict[str, Dict[str, Any]] = {}
         self.max_size = max_size
         self.ttl = ttl
+        self.reset_stats()
     
-    def _make_key(self, text: str, transformation_type: str, additional_instructions: Optional[str] = None) -> str:
-        """Create a cache key from input parameters."""
-        content = f"{text}|{transformation_type}|{additional_instructions or ''}"
-        return hashlib.md5(content.encode()).hexdigest()
+    def make_key(
+        self,
+        text: Union[str, "PreparedText"],
+        transformation_type: str,
+        additional_instructions: Optional[str] = None,
+        prompt_version: Optional[str] = None
+    ) -> str:
+        """Create a cache key from input parameters (a PreparedText reuses its digest)."""
+        digest = text.digest if isinstance(text, PreparedText) else text_digest(text)
+        content = f"{digest}|{transformation_type}|{additional_instructions or ''}|{prompt_version or ''}"
+        return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
     
     def _cleanup_expired(self):
         """Remove expired cache entries."""
@@ -28,7 +42,7 @@ class SimpleCache:
             if current_time - value.get('timestamp', 0) > self.ttl
         ]
         for key in expired_keys:
-            del self.cache[key]
+            self.stats[self.cache.pop(key)['type']]['expirations'] += 1
     
     def _enforce_size_limit(self):
         """Remove oldest entries if cache exceeds max size."""
@@ -40,71 +54,247 @@ class SimpleCache:
                 key=lambda x: x[1].get('timestamp', 0)
             )
             for key, _ in sorted_entries[:entries_to_remove]:
-                del self.cache[key]
+                self.stats[self.cache.pop(key)['type']]['evictions'] += 1
     
-    def get(self, text: str, transformation_type: str, additional_instructions: Optional[str] = None) -> Optional[str]:
+    def _entry(
+        self,
+        result: str,
+        transformation_type: str,
+        processing_time: float,
+        tokens: int,
+        meta: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        # processing_time and tokens are what one hit saves upstream; meta
+        # describes how the result was produced (engine, model, ...)
+        return {
+            'result': result,
+            'type': transformation_type,
+            'processing_time': processing_time,
+            'tokens': tokens,
+            'meta': meta or {},
+            'hits': 0,
+            'timestamp': time.time()
+        }
+    
+    def get(
+        self,
+        text: Union[str, "PreparedText"],
+        transformation_type: str,
+        additional_instructions: Optional[str] = None,
+        prompt_version: Optional[str] = None
+    ) -> Optional[str]:
         """Get cached transformation result."""
+        entry = self.get_entry(text, transformation_type, additional_instructions, prompt_version)
+        return entry['result'] if entry is not None else None
+    
+    def get_entry(
+        self,
+        text: Union[str, "PreparedText"],
+        transformation_type: str,
+        additional_instructions: Optional[str] = None,
+        prompt_version: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get the cached entry: the result plus the meta it was stored with."""
         self._cleanup_expired()
-        key = self._make_key(text, transformation_type, additional_instructions)
+        key = self.make_key(text, transformation_type, additional_instructions, prompt_version)
+        stats = self.stats[transformation_type]
         
-        if key in self.cache:
+        entry = self.cache.get(key)
+        if entry is not None:
             logger.info(f"Cache hit for transformation type: {transformation_type}")
-            return self.cache[key]['result']
+            entry['hits'] += 1
+            stats['hits'] += 1
+            stats['seconds_saved'] += entry['processing_time']
+            stats['tokens_saved'] += entry['tokens']
+            return entry
         
+        stats['misses'] += 1
         return None
     
-    def set(self, text: str, transformation_type: str, result: str, additional_instructions: Optional[str] = None):
-        """Cache transformation result."""
+    def set(
+        self,
+        text: Union[str, "PreparedText"],
+        transformation_type: str,
+        result: str,
+        additional_instructions: Optional[str] = None,
+        prompt_version: Optional[str] = None,
+        processing_time: float = 0.0,
+        meta: Optional[Dict[str, Any]] = None
+    ):
+        """Cache transformation result, with meta such as the engine and model that produced it."""
         self._cleanup_expired()
         self._enforce_size_limit()
         
-        key = self._make_key(text, transformation_type, additional_instructions)
-        self.cache[key] = {
-            'result': result,
-            'timestamp': time.time()
-        }
+        key = self.make_key(text, transformation_type, additional_instructions, prompt_version)
+        char_count = text.char_count if isinstance(text, PreparedText) else len(text)
+        tokens = tokens_for_chars(char_count) + estimate_tokens(additional_instructions or "") + estimate_tokens(result)
+        self.cache[key] = self._entry(result, transformation_type, processing_time, tokens, meta)
         logger.info(f"Cached result for transformation type: {transformation_type}")
     
+    def warm(
+        self,
+        key: str,
+        result: str,
+        transformation_type: str,
+        processing_time: float = 0.0,
+        tokens: int = 0
+    ) -> bool:
+        """Preload an entry by key without evicting anything; False once full."""
+        if len(self.cache) >= self.max_size:
+            return False
+        self.cache.setdefault(key, self._entry(result, transformation_type, processing_time, tokens))
+        return True
+    
     def clear(self):
         """Clear all cache entries."""
         self.cache.clear()
         logger.info("Cache cleared")
     
-    def get_stats(self) -> Dict[str, Any]:
-        """Get cache statistics."""
+    def reset_stats(self):
+        """Zero the counters and per-entry hit counts; entries are kept."""
+        self.stats: Dict[str, Dict[str, Any]] = defaultdict(lambda: {
+            'hits': 0,
+            'misses': 0,
+            'expirations': 0,
+            'evictions': 0,
+            'seconds_saved': 0.0,
+            'tokens_saved': 0
+        })
+        self.stats_since = datetime.utcnow()
+        for entry in self.cache.values():
+            entry['hits'] = 0
+    
+    def _summarize(self, counters: Dict[str, Any]) -> Dict[str, Any]:
+        lookups = counters['hits'] + counters['misses']
+        return {
+            **counters,
+            'seconds_saved': round(counters['seconds_saved'], 2),
+            'hit_rate': round(counters['hits'] / lookups, 3) if lookups else None
+        }
+    
+    def _memory_bytes(self) -> int:
+        """Approximate size of keys, results and entry dicts."""
+        return sum(
+            sys.getsizeof(key) + sys.getsizeof(entry) + sys.getsizeof(entry['result'])
+            for key, entry in self.cache.items()
+        )
+    
+    def get_stats(self, top: int = 10) -> Dict[str, Any]:
+        """Get cache statistics: totals, per-type counters and the most-hit keys."""
         self._cleanup_expired()
+        totals = {'hits': 0, 'misses': 0, 'expirations': 0, 'evictions': 0, 'seconds_saved': 0.0, 'tokens_saved': 0}
+        for counters in self.stats.values():
+            for name in totals:
+                totals[name] += counters[name]
+        
+        entries_by_type = defaultdict(int)
+        for entry in self.cache.values():
+            entries_by_type[entry['type']] += 1
+        
+        now = time.time()
+        top_keys = heapq.nlargest(top, self.cache.items(), key=lambda item: item[1]['hits'])
         return {
             'total_entries': len(self.cache),
             'max_size': self.max_size,
             'ttl_seconds': self.ttl,
-            'memory_usage_mb': len(str(self.cache)) / (1024 * 1024)
+            'memory_usage_mb': round(self._memory_bytes() / (1024 * 1024), 3),
+            'since': self.stats_since.isoformat(),
+            **self._summarize(totals),
+            'by_type': {
+                transformation_type: {'entries': entries_by_type[transformation_type], **self._summarize(counters)}
+                for transformation_type, counters in sorted(self.stats.items())
+            },
+            'top_keys': [
+                {
+                    'key': key,
+                    'transformation_type': entry['type'],
+                    'hits': entry['hits'],
+                    'seconds_saved': round(entry['hits'] * entry['processing_time'], 2),
+                    'age_seconds': round(now - entry['timestamp'])
+                }
+                for key, entry in top_keys if entry['hits']
+            ]
         }
 
-def validate_text_input(text: str) -> tuple[bool, Optional[str]]:
+def tokens_for_chars(char_count: int) -> int:
+    """Rough token count for a length (about four characters per token)."""
+    return (char_count + 3) // 4
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a text; the one estimator used across the app."""
+    return tokens_for_chars(len(text))
+
+def validate_text_input(text: str, max_length: int = 5000) -> tuple[bool, Optional[str]]:
     """Validate text input."""
     if not text or not text.strip():
         return False, "Text cannot be empty"
     
-    if len(text) > 5000:
-        return False, "Text is too long. Maximum 5000 characters allowed"
+    if len(text) > max_length:
+        return False, f"Text is too long. Maximum {max_length} characters allowed"
     
     if len(text.strip()) < 1:
         return False, "Text must contain at least one character"
     
     return True, None
 
+# Removed case-insensitively, in one pass per round
+DANGEROUS_PATTERN = re.compile(r"</?script|javascript:|onclick=|onerror=", re.IGNORECASE)
+# Substring checks on the lowered text are far cheaper than an IGNORECASE scan,
+# so the regex only runs on text that contains one of these
+_DANGEROUS_MARKERS = ("<script", "</script", "javascript:", "onclick=", "onerror=")
+
+def _sanitize(text: str) -> tuple[str, int]:
+    """Collapse whitespace and strip dangerous patterns; return (text, word count)."""
+    words = text.split()
+    text = ' '.join(words)
+    lowered = text.lower()
+    if not any(marker in lowered for marker in _DANGEROUS_MARKERS):
+        return text, len(words)
+    # Repeat so removals cannot splice a new pattern together ("<scr<scriptipt")
+    while True:
+        text, removed = DANGEROUS_PATTERN.subn('', text)
+        if not removed:
+            break
+    words = text.split()
+    return ' '.join(words), len(words)
+
 def sanitize_text(text: str) -> str:
     """Basic text sanitization."""
-    # Remove excessive whitespace
-    text = ' '.join(text.split())
-    
-    # Remove potential harmful characters (basic cleanup)
-    dangerous_chars = ['<script', '</script', 'javascript:', 'onclick=', 'onerror=']
-    for char in dangerous_chars:
-        text = text.replace(char.lower(), '')
-        text = text.replace(char.upper(), '')
-    
-    return text.strip()
+    return _sanitize(text)[0]
+
+def count_words(text: str) -> int:
+    """Word count of the sanitized text, as prepare_text reports it."""
+    return _sanitize(text)[1]
+
+def text_digest(text: str) -> str:
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+@dataclass(frozen=True)
+class PreparedText:
+    """A request text validated and sanitized once, with the values derived from it."""
+    raw: str
+    text: str
+    word_count: int
+    char_count: int
+    digest: str
+
+    def __str__(self) -> str:
+        return self.text
+
+def prepare_text(raw: str, max_length: int = 5000) -> PreparedText:
+    """Validate and sanitize text in one pass; raises ValueError with the reason."""
+    if len(raw) > max_length:
+        raise ValueError(f"Text is too long. Maximum {max_length} characters allowed")
+    text, word_count = _sanitize(raw)
+    if not text:
+        raise ValueError("Text cannot be empty")
+    return PreparedText(
+        raw=raw,
+        text=text,
+        word_count=word_count,
+        char_count=len(text),
+        digest=text_digest(text)
+    )
 
 def calculate_similarity(text1: str, text2: str) -> float:
     """Calculate basic similarity between two texts."""
@@ -138,6 +328,20 @@ def create_error_response(error_msg: str, status_code: int = 500) -> Dict[str, A
         "timestamp": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
     }
 
+def make_etag(*parts: Any, weak: bool = False) -> str:
+    """Build an ETag from the values that determine a response."""
+    digest = hashlib.blake2b("|".join(str(part) for part in parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
 # Global cache instance
 cache = SimpleCache(
     max_size=settings.max_cache_size,
@@ -0,0 +1,29 @@
+from collections import defaultdict
+from typing import Dict, Tuple
+
+class Metrics:
+    """In-process counters keyed by name and labels (one set per worker)."""
+
+    def __init__(self):
+        self.counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = defaultdict(int)
+
+    def increment(self, name: str, value: float = 1, **labels: str):
+        """Add to a counter, e.g. increment("requests_shed", priority="bulk")."""
+        self.counters[(name, tuple(sorted(labels.items())))] += value
+
+    def get(self, name: str, **labels: str) -> float:
+        return self.counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Counters grouped by name, with labels rendered as 'key=value,...'."""
+        grouped: Dict[str, Dict[str, float]] = defaultdict(dict)
+        for (name, labels), value in sorted(self.counters.items()):
+            label = ",".join(f"{key}={val}" for key, val in labels) or "total"
+            grouped[name][label] = value
+        return dict(grouped)
+
+    def reset(self):
+        self.counters.clear()
+
+# Global metrics instance
+metrics = Metrics()
@@ -0,0 +1,81 @@
+import re
+import threading
+import zlib
+from typing import List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Multiply-shift hashing: MinHash permutations are the top 32 bits of
+# (a * x + b) mod 2**64 for random odd a. uint64 arithmetic wraps, so the
+# modulo is free, which is cheaper than hashing modulo a prime.
+HASH_SHIFT = 32
+WORD = re.compile(r"\w+")
+
+class SimilarityScorer:
+    """MinHash estimates of word-set Jaccard similarity, computed per batch."""
+
+    def __init__(self, num_permutations: int = 64, seed: int = 42):
+        self.num_permutations = num_permutations
+        self.seed = seed
+        self._np = None
+        self._lock = threading.Lock()
+
+    def _numpy(self):
+        """Import numpy and draw the permutations on first use (see warm_up)."""
+        if self._np is not None:
+            return self._np
+        with self._lock:
+            if self._np is not None:
+                return self._np
+            import numpy
+            rng = numpy.random.default_rng(self.seed)
+            size = (self.num_permutations, 1)
+            self.shift = numpy.uint64(HASH_SHIFT)
+            self.a = rng.integers(0, 1 << 64, size=size, dtype=numpy.uint64) | numpy.uint64(1)
+            self.b = rng.integers(0, 1 << 64, size=size, dtype=numpy.uint64)
+            self._np = numpy
+        return self._np
+
+    def warm_up(self):
+        """Pay for the numpy import and permutation setup ahead of the first score."""
+        self.score_batch(["warm up"], ["warm up"])
+
+    def _word_hashes(self, text: str) -> "np.ndarray":
+        """Hash each distinct lowercase word; empty texts get a single sentinel value."""
+        np = self._numpy()
+        # Repeats don't change a set's MinHash, so each word is hashed and permuted once
+        words = set(WORD.findall(text.lower()))
+        if not words:
+            return np.zeros(1, dtype=np.uint64)
+        return np.fromiter(map(zlib.crc32, map(str.encode, words)), dtype=np.uint64, count=len(words))
+
+    def signatures(self, texts: List[str]) -> "np.ndarray":
+        """Return a (len(texts), num_permutations) array of MinHash signatures."""
+        np = self._numpy()
+        shingles = [self._word_hashes(text) for text in texts]
+        offsets = np.cumsum([0] + [len(s) for s in shingles[:-1]])
+        flat = np.concatenate(shingles)
+        # One (permutations x all-words) matrix for the whole batch, then a
+        # segmented min over each text's columns
+        # In place: the temporaries of a * x + b cost more than the arithmetic
+        permuted = self.a * flat
+        permuted += self.b
+        permuted >>= self.shift
+        return np.minimum.reduceat(permuted, offsets, axis=1).T
+
+    def score_batch(self, originals: List[str], transformed: List[str]) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Return similarity and transformed/original length ratios per pair."""
+        np = self._numpy()
+        if not originals:
+            return np.zeros(0), np.zeros(0)
+        signatures = self.signatures(originals + transformed)
+        count = len(originals)
+        similarity = (signatures[:count] == signatures[count:]).mean(axis=1)
+        original_lengths = np.fromiter((len(t) for t in originals), dtype=np.float64, count=count)
+        transformed_lengths = np.fromiter((len(t) for t in transformed), dtype=np.float64, count=count)
+        length_ratio = transformed_lengths / np.maximum(original_lengths, 1.0)
+        return similarity, length_ratio
+
+# Global scorer instance
+similarity_scorer = SimilarityScorer()
@@ -0,0 +1,65 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Dict, List, Tuple
+
+class RequestTimer:
+    """Per-request span durations, rendered as a Server-Timing header.
+
+    Spans with the same name are summed, so work running concurrently within
+    one request (batch items, document chunks) can add up to more than the total.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total: Optional[float] = None
+        self.spans: Dict[str, List[float]] = {}  # name -> [seconds, count]
+
+    def record(self, name: str, seconds: float):
+        entry = self.spans.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+    def finish(self) -> float:
+        self.total = time.perf_counter() - self.started
+        return self.total
+
+    def breakdown(self) -> List[Tuple[str, float, int]]:
+        """(name, milliseconds, count) per span, then the total."""
+        items = [(name, seconds * 1000, count) for name, (seconds, count) in self.spans.items()]
+        if self.total is not None:
+            items.append(("total", self.total * 1000, 1))
+        return items
+
+    def header(self) -> str:
+        return ", ".join(
+            f'{name};desc="x{count}";dur={ms:.1f}' if count > 1 else f"{name};dur={ms:.1f}"
+            for name, ms, count in self.breakdown()
+        )
+
+    def summary(self) -> str:
+        return " ".join(
+            f"{name}={ms:.0f}ms" + (f"(x{count})" if count > 1 else "")
+            for name, ms, count in self.breakdown()
+        )
+
+_current_timer: ContextVar[Optional[RequestTimer]] = ContextVar("request_timer", default=None)
+
+def start_request_timer() -> RequestTimer:
+    """Attach a new timer to the current request context."""
+    timer = RequestTimer()
+    _current_timer.set(timer)
+    return timer
+
+@contextmanager
+def span(name: str):
+    """Time a block into the current request's timer; a no-op outside requests."""
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.record(name, time.perf_counter() - start)
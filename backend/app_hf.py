@@ -21,6 +21,9 @@ if __name__ == "__main__":
     
     print(f"🚀 Starting WordSmith Backend on Hugging Face Spaces (Port: {port})")
     
+    from migrate import migrate
+    migrate()
+    
     uvicorn.run(
         app,
         host="0.0.0.0",
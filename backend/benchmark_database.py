@@ -0,0 +1,93 @@
+"""
+Database engine benchmark for WordSmith Backend
+Runs concurrent history writes (each followed by a history page read) from
+worker processes, as with `run.py --workers N`, against a fresh SQLite file,
+through the previous engine (StaticPool, rollback journal, default locking)
+and the tuned profile from app.core.database.create_db_engine.
+
+    python benchmark_database.py --workers 8 --writes 200
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+# Add the app directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ["DEBUG"] = "false"
+
+from sqlalchemy import create_engine, desc
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import create_db_engine
+from app.models.database import Base, TransformationHistory
+
+TEXT = ("The quick brown fox jumps over the lazy dog. " * 23)[:1000]
+
+def previous_engine(url: str):
+    return create_engine(url, poolclass=StaticPool, connect_args={"check_same_thread": False})
+
+ENGINES = {"previous": previous_engine, "tuned": create_db_engine}
+
+def worker(profile: str, url: str, user_id: str, writes: int):
+    engine = ENGINES[profile](url)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    latencies, errors = [], []
+    for _ in range(writes):
+        start = time.perf_counter()
+        db = Session()
+        try:
+            db.add(TransformationHistory(
+                id=str(uuid.uuid4()),
+                user_id=user_id,
+                original_text=TEXT,
+                transformed_text=TEXT.upper(),
+                transformation_type="formal",
+                processing_time=0.42,
+                word_count_original=200,
+                word_count_transformed=200,
+                created_at=datetime.utcnow()
+            ))
+            db.commit()
+            db.query(TransformationHistory.id)\
+                .filter(TransformationHistory.user_id == user_id)\
+                .order_by(desc(TransformationHistory.created_at))\
+                .limit(20).all()
+            latencies.append(time.perf_counter() - start)
+        except Exception as e:
+            db.rollback()
+            errors.append(type(e).__name__)
+        finally:
+            db.close()
+    engine.dispose()
+    return latencies, errors
+
+def run(profile: str, workers: int, writes: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = ENGINES[profile](url)
+        Base.metadata.create_all(bind=engine)
+        engine.dispose()
+        with multiprocessing.Pool(workers) as pool:
+            start = time.perf_counter()
+            outcomes = pool.starmap(worker, [(profile, url, f"bench-{i}", writes) for i in range(workers)])
+            elapsed = time.perf_counter() - start
+    latencies = sorted(latency for worker_latencies, _ in outcomes for latency in worker_latencies)
+    errors = [error for _, worker_errors in outcomes for error in worker_errors]
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0.0
+    return len(latencies) / elapsed, p99, len(errors)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark concurrent history writes")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=200, help="writes per worker")
+    args = parser.parse_args()
+
+    print(f"{'engine':<10} {'writes/s':>9} {'p99 ms':>8} {'errors':>7}")
+    for name in ENGINES:
+        rate, p99, errors = run(name, args.workers, args.writes)
+        print(f"{name:<10} {rate:>9.0f} {p99:>8.1f} {errors:>7}")
@@ -0,0 +1,104 @@
+"""
+History serialization benchmark for WordSmith Backend
+Times one 100-item /history page (5000-character texts) from query to JSON
+bytes through the previous path and the direct orjson path.
+
+    python benchmark_serialization.py --rounds 200
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+
+# Add the app directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ["DEBUG"] = "false"
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import desc
+from app.core.database import SessionLocal, init_db
+from app.core.responses import ORJSONResponse
+from app.models.database import TransformationHistory
+from app.models.schemas import HistoryItem, HistoryResponse
+from app.api.routes import HISTORY_COLUMNS
+
+PAGE_SIZE = 100
+
+def seed(db, count: int):
+    text = ("The quick brown fox jumps over the lazy dog. " * 112)[:5000]
+    db.add_all([
+        TransformationHistory(
+            id=str(uuid.uuid4()),
+            user_id="bench",
+            original_text=text,
+            transformed_text=text.upper(),
+            transformation_type="formal",
+            processing_time=0.42,
+            word_count_original=len(text.split()),
+            word_count_transformed=len(text.split()),
+            prompt_version="v2",
+            created_at=datetime.utcnow()
+        )
+        for _ in range(count)
+    ])
+    db.commit()
+
+def page_query(db):
+    return db.query(TransformationHistory)\
+        .filter(TransformationHistory.user_id == "bench")\
+        .order_by(desc(TransformationHistory.created_at))\
+        .limit(PAGE_SIZE)
+
+def previous_path(db) -> bytes:
+    """ORM objects -> to_dict() -> HistoryItem -> jsonable_encoder -> json."""
+    items = [HistoryItem(**item.to_dict()) for item in page_query(db).all()]
+    response = HistoryResponse(items=items, total_count=PAGE_SIZE, page=1, page_size=PAGE_SIZE, has_more=False)
+    return json.dumps(jsonable_encoder(response), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def pydantic_path(db) -> bytes:
+    """ORM objects -> to_dict() -> HistoryItem -> model_dump_json (Pydantic's Rust encoder)."""
+    items = [HistoryItem(**item.to_dict()) for item in page_query(db).all()]
+    response = HistoryResponse(items=items, total_count=PAGE_SIZE, page=1, page_size=PAGE_SIZE, has_more=False)
+    return response.model_dump_json().encode("utf-8")
+
+def direct_path(db) -> bytes:
+    """Column rows -> dict -> orjson, as /history does now."""
+    rows = page_query(db).with_entities(*HISTORY_COLUMNS).all()
+    items = [row._asdict() for row in rows]
+    for item in items:
+        item["diff"] = None
+    return ORJSONResponse({
+        "items": items,
+        "total_count": PAGE_SIZE,
+        "page": 1,
+        "page_size": PAGE_SIZE,
+        "has_more": False
+    }).body
+
+def measure(path, db, rounds: int) -> float:
+    path(db)  # warm-up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        path(db)
+        db.expire_all()
+    return (time.perf_counter() - start) / rounds * 1000
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark history page serialization")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    seed(db, PAGE_SIZE)
+
+    assert json.loads(previous_path(db)) == json.loads(direct_path(db)), "payloads differ"
+    print(f"{'path':<10} {'ms/page':>9} {'bytes':>9}")
+    for name, path in (("previous", previous_path), ("pydantic", pydantic_path), ("direct", direct_path)):
+        ms = measure(path, db, args.rounds)
+        print(f"{name:<10} {ms:>9.2f} {len(path(db)):>9}")
+    db.close()
@@ -0,0 +1,120 @@
+"""
+Server mode benchmark for WordSmith Backend
+Starts run.py in development and production mode against the offline mock
+provider and reports throughput and latency for each.
+
+    python benchmark_server.py --requests 2000 --concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def start_server(mode: str, port: int, workers: int, db_path: str) -> subprocess.Popen:
+    """Launch run.py with an isolated database and the mock provider."""
+    env = {
+        **os.environ,
+        "ENVIRONMENT": mode,
+        "PORT": str(port),
+        "WORKERS": str(workers),
+        "DATABASE_URL": f"sqlite:///{db_path}",
+        "DEFAULT_PROVIDER": "mock",
+        # Simulated upstream latency so the event loop has I/O to overlap
+        "PROVIDERS": json.dumps({"mock": {"base_url": "mock://", "latency": "0.05"}}),
+    }
+    return subprocess.Popen(
+        [sys.executable, "run.py"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+
+async def wait_ready(base_url: str, timeout: float = 30.0):
+    deadline = time.time() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.time() < deadline:
+            try:
+                if (await client.get(f"{base_url}/")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+async def run_load(base_url: str, path: str, total: int, concurrency: int) -> dict:
+    """Fire `total` requests with `concurrency` in flight; return latency stats."""
+    latencies = []
+    errors = 0
+    counter = iter(range(total))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        async def user():
+            nonlocal errors
+            for i in counter:
+                start = time.perf_counter()
+                try:
+                    if path == "/api/v1/transform":
+                        # Unique text per request so the response cache never hits
+                        response = await client.post(path, json={
+                            "text": f"benchmark request number {i}",
+                            "transformation_type": "formal"
+                        })
+                    else:
+                        response = await client.get(path)
+                    ok = response.status_code == 200
+                except httpx.TransportError:
+                    ok = False
+                latencies.append(time.perf_counter() - start)
+                if not ok:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*[user() for _ in range(concurrency)])
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests_per_second": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1),
+        "errors": errors
+    }
+
+async def benchmark(args):
+    results = {}
+    for mode in ("development", "production"):
+        with tempfile.TemporaryDirectory() as tmp:
+            server = start_server(mode, args.port, args.workers, os.path.join(tmp, "bench.db"))
+            base_url = f"http://127.0.0.1:{args.port}"
+            try:
+                await wait_ready(base_url)
+                for path in ("/api/v1/transformations", "/api/v1/transform"):
+                    await run_load(base_url, path, min(100, args.requests), args.concurrency)  # warm-up
+                    results[(mode, path)] = await run_load(base_url, path, args.requests, args.concurrency)
+            finally:
+                # SIGTERM exercises the graceful shutdown path
+                server.terminate()
+                server.wait(timeout=60)
+
+    print(f"{'mode':<12} {'endpoint':<26} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+    for (mode, path), stats in results.items():
+        print(f"{mode:<12} {path:<26} {stats['requests_per_second']:>8} "
+              f"{stats['p50_ms']:>8} {stats['p95_ms']:>8} {stats['errors']:>7}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark development vs production server mode")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=0, help="production workers (0 = one per CPU)")
+    parser.add_argument("--port", type=int, default=8765)
+    asyncio.run(benchmark(parser.parse_args()))
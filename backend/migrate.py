@@ -0,0 +1,28 @@
+"""
+WordSmith database migrations
+Creates missing tables and columns. Run once per deploy, before starting
+the server (run.py calls this automatically):
+
+    python migrate.py
+"""
+import os
+import sys
+import time
+
+# Add the app directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+def migrate():
+    """Create tables and add new columns; exits non-zero on failure."""
+    from app.core.database import init_db
+
+    start_time = time.time()
+    try:
+        init_db()
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        sys.exit(1)
+    print(f"✅ Database schema up to date ({time.time() - start_time:.2f}s)")
+
+if __name__ == "__main__":
+    migrate()
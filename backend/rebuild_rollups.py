@@ -0,0 +1,42 @@
+"""
+WordSmith usage rollup rebuild
+Recomputes the daily usage_rollups counters behind /api/v1/stats from raw
+transformation history, e.g. after a bulk import or to drop usage of
+deleted history. Run it while traffic is low; writes during the rebuild of
+the same days may be lost.
+
+    python rebuild_rollups.py                    # all days
+    python rebuild_rollups.py --since 2026-10-01
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+# Add the app directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+def rebuild(since: date = None):
+    """Replace rollups from `since` (else all) in one transaction; exits non-zero on failure."""
+    from app.core.database import SessionLocal
+    from app.services.usage_rollup import usage_rollups
+
+    start_time = time.time()
+    db = SessionLocal()
+    try:
+        count = usage_rollups.rebuild(db, since)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Rollup rebuild failed: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+    print(f"✅ Rebuilt {count} usage rollups ({time.time() - start_time:.2f}s)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute usage rollups from history")
+    parser.add_argument("--since", type=date.fromisoformat, default=None, help="First UTC day to rebuild (YYYY-MM-DD)")
+    args = parser.parse_args()
+    rebuild(args.since)
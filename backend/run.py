@@ -1,31 +1,60 @@
 """
 WordSmith Backend Runner
 Run this script to start the FastAPI server
+
+Development (default): one worker with auto-reload.
+Production (ENVIRONMENT=production, or RENDER set): one worker per usable
+CPU, at most MAX_WORKERS (override with WORKERS), uvloop + httptools, no reloader, and a graceful
+shutdown that drains in-flight requests for GRACEFUL_SHUTDOWN_TIMEOUT seconds.
 """
 import uvicorn
 import os
 import sys
+import importlib.util
 
 # Add the app directory to the Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from app.core.config import settings
+from migrate import migrate
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
 if __name__ == "__main__":
     # Get port from environment variable (Render sets this)
-    port = int(os.environ.get("PORT", 8000))
-    
-    # Check if running in production (Render sets RENDER=true)
-    is_production = os.environ.get("RENDER", False)
-    
-    print("🚀 Starting WordSmith Backend...")
+    port = int(os.environ.get("PORT", settings.port))
+    workers = settings.worker_count
+
+    print(f"🚀 Starting WordSmith Backend ({settings.environment})...")
     print(f"📚 API Documentation will be available at: http://localhost:{port}/docs")
     print(f"🔍 Health Check: http://localhost:{port}/api/v1/health")
+    if settings.is_production:
+        print(f"⚙️  Workers: {workers}, graceful shutdown: {settings.graceful_shutdown_timeout}s")
     print("⚡ Press Ctrl+C to stop the server")
     print("-" * 50)
-    
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",  # Changed from 127.0.0.1
-        port=port,       # Changed from 8000
-        reload=not is_production,  # Disable reload in production
-        log_level="info"
-    )
\ No newline at end of file
+
+    # Apply schema changes once, before any worker (or the reloader) boots
+    migrate()
+
+    if settings.is_production:
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=port,
+            workers=workers,
+            loop="uvloop" if _available("uvloop") else "auto",
+            http="httptools" if _available("httptools") else "auto",
+            reload=False,
+            timeout_graceful_shutdown=settings.graceful_shutdown_timeout,
+            access_log=False,  # requests are already logged by the app middleware
+            log_level="info"
+        )
+    else:
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=port,
+            reload=settings.reload,
+            log_level="info"
+        )
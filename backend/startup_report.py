@@ -0,0 +1,108 @@
+"""
+Startup report for WordSmith Backend
+Shows where cold-start time goes: the slowest imports (from
+`python -X importtime`) and time-to-first-request for a fresh server,
+timed against GET /api/v1/history so the first request opens a database
+connection and runs a query.
+
+    python startup_report.py
+    python startup_report.py --backend-dir /path/to/other/checkout/backend
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def import_profile(backend_dir: str, env: dict, top: int):
+    """Return total app import time and the slowest top-level packages (ms)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=backend_dir, env=env, capture_output=True, text=True
+    )
+    # Children are printed before their parent, so the depth-1 lines seen
+    # since the previous top-level line are app.main's direct imports
+    children = []
+    packages = {}
+    total = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        ms = int(cumulative) / 1000
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            module = name.strip()
+            # Third-party packages are grouped; app modules are listed individually
+            children.append((module if module.startswith("app.") else module.split(".")[0], ms))
+        elif depth == 0:
+            if name.strip() == "app.main":
+                total = ms
+                for package, child_ms in children:
+                    packages[package] = packages.get(package, 0) + child_ms
+            children = []
+    slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+    return total, slowest
+
+def prepare_database(backend_dir: str, env: dict):
+    """Create the schema once, as a deploy's migration step would, outside the timings."""
+    subprocess.run(
+        [sys.executable, "-c", "from app.core.database import init_db; init_db()"],
+        cwd=backend_dir, env=env, check=True, stdout=subprocess.DEVNULL
+    )
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def time_to_first_request(backend_dir: str, env: dict, timeout: float = 60.0) -> float:
+    """Seconds from process spawn until the first successful history query."""
+    port = free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=backend_dir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/api/v1/history?user_id=startup-report", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError("server did not answer in time")
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure WordSmith cold-start time")
+    parser.add_argument("--backend-dir", default=BACKEND_DIR)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # A migrated database, as on a container restarted after a deploy
+        env = {**os.environ, "DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'startup.db')}"}
+        prepare_database(args.backend_dir, env)
+
+        total, slowest = import_profile(args.backend_dir, env, args.top)
+        print(f"📦 Import time: {total:.0f} ms")
+        for package, ms in slowest:
+            print(f"   {package:<28} {ms:>8.1f} ms")
+
+        timings = sorted(time_to_first_request(args.backend_dir, env) for _ in range(args.runs))
+        print(f"⏱️  Time to first request over {args.runs} runs: "
+              f"median {timings[len(timings) // 2] * 1000:.0f} ms, "
+              f"min {timings[0] * 1000:.0f} ms, max {timings[-1] * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    main()
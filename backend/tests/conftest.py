@@ -0,0 +1,63 @@
+import os
+import sys
+import tempfile
+import pytest
+
+# Make the app package importable when pytest runs from the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# A throwaway file database (the app runs in another thread under TestClient)
+# and the offline mock provider instead of Groq
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}")
+os.environ.setdefault("DEBUG", "false")
+os.environ.setdefault("DEFAULT_PROVIDER", "mock")
+os.environ.setdefault("CACHE_WARMUP_ENABLED", "false")
+
+@pytest.fixture
+def client():
+    """TestClient on empty tables, an empty cache and fresh cache and routing stats."""
+    from fastapi.testclient import TestClient
+    from app.core.database import engine, init_db
+    from app.main import app
+    from app.models.database import Base
+    from app.services.model_router import model_router
+    from app.utils.helpers import cache
+
+    Base.metadata.drop_all(bind=engine)
+    init_db()
+    cache.clear()
+    cache.reset_stats()
+    model_router.stats.clear()
+    with TestClient(app) as test_client:
+        yield test_client
+
+@pytest.fixture
+def add_history(client):
+    """Insert history rows directly: add_history(user_id, count, **column_overrides)."""
+    from datetime import datetime
+    from app.core.database import SessionLocal
+    from app.models.database import TransformationHistory
+
+    def add(user_id: str = "anonymous", count: int = 1, **columns) -> list:
+        db = SessionLocal()
+        try:
+            rows = [
+                TransformationHistory(**{
+                    "user_id": user_id,
+                    "original_text": f"original {i}",
+                    "transformed_text": f"transformed {i}",
+                    "transformation_type": "formal",
+                    "processing_time": 0.1,
+                    "word_count_original": 2,
+                    "word_count_transformed": 2,
+                    "created_at": datetime.utcnow(),
+                    **columns
+                })
+                for i in range(count)
+            ]
+            db.add_all(rows)
+            db.commit()
+            return [row.id for row in rows]
+        finally:
+            db.close()
+
+    return add
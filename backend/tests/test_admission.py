@@ -0,0 +1,75 @@
+from app.core.config import settings
+from app.services import admission
+from app.services.admission import AdmissionController, BULK, INTERACTIVE
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+def make_controller(monkeypatch) -> tuple:
+    clock = FakeClock()
+    monkeypatch.setattr(admission.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(settings, "admission_target_latency", 10.0)
+    monkeypatch.setattr(settings, "admission_latency_half_life", 30.0)
+    monkeypatch.setattr(settings, "admission_latency_alpha", 0.2)
+    return clock, AdmissionController()
+
+def run_interactive(controller, clock, duration: float):
+    started = clock.now
+    assert controller.try_admit(INTERACTIVE, started) is None
+    clock.now += duration
+    controller.release(INTERACTIVE, started)
+
+def test_bulk_admitted_again_after_spike_and_idle(monkeypatch):
+    clock, controller = make_controller(monkeypatch)
+
+    # One slow interactive request pushes the average over the target
+    run_interactive(controller, clock, 60.0)
+    assert controller.try_admit(BULK, clock.now) == "latency"
+
+    # No interactive traffic follows; the average decays below the target
+    clock.now += 120.0
+    assert controller.try_admit(BULK, clock.now) is None
+    assert controller.get_stats()["overloaded"] is False
+
+def test_recent_slow_samples_still_shed_bulk(monkeypatch):
+    clock, controller = make_controller(monkeypatch)
+
+    for _ in range(3):
+        run_interactive(controller, clock, 20.0)
+        clock.now += 1.0
+    assert controller.try_admit(BULK, clock.now) == "latency"
+
+def test_hung_interactive_request_keeps_shedding_bulk(monkeypatch):
+    clock, controller = make_controller(monkeypatch)
+    run_interactive(controller, clock, 12.0)
+
+    # The upstream hangs: no sample arrives, but the request is still in flight
+    hung = clock.now
+    assert controller.try_admit(INTERACTIVE, hung) is None
+    clock.now += 60.0
+    assert controller.try_admit(BULK, clock.now) == "latency"
+    assert controller.get_stats()["in_flight"][INTERACTIVE] == 1
+
+    # Once it finishes and traffic stops, the average decays again
+    controller.release(INTERACTIVE, hung)
+    clock.now += 300.0
+    assert controller.try_admit(BULK, clock.now) is None
+
+def test_steady_slow_traffic_does_not_decay_below_target(monkeypatch):
+    clock, controller = make_controller(monkeypatch)
+
+    # One 15 s request starts every 10 s, so one is always in flight
+    in_flight = []
+    for tick in range(60):
+        if in_flight and clock.now - in_flight[0] >= 15.0:
+            controller.release(INTERACTIVE, in_flight.pop(0))
+        if tick % 2 == 0:
+            assert controller.try_admit(INTERACTIVE, clock.now) is None
+            in_flight.append(clock.now)
+        clock.now += 5.0
+    assert controller._average(INTERACTIVE) > 14.0
+    assert controller.try_admit(BULK, clock.now) == "latency"
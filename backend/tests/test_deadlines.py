@@ -0,0 +1,91 @@
+import asyncio
+import time
+import pytest
+from app.core.config import settings
+from app.models.schemas import TransformationType
+from app.services.model_router import model_router, MockProvider
+from app.services.quality_gate import quality_gate
+from app.services.text_processor_simple import text_processor
+from app.utils.deadline import Deadline, DeadlineExceeded
+
+@pytest.fixture
+def slow_provider(monkeypatch):
+    """Route every request to a provider that takes 5 s to answer."""
+    monkeypatch.setitem(model_router.providers, "slow", MockProvider(name="slow", latency=5.0))
+    monkeypatch.setattr(settings, "default_provider", "slow")
+    monkeypatch.setattr(settings, "model_preferences", {})
+
+def test_transform_returns_504_when_the_deadline_passes(client, slow_provider):
+    start = time.monotonic()
+    response = client.post("/api/v1/transform", json={
+        "text": "fix this sentence", "transformation_type": "grammar_fix", "timeout": 0.3
+    })
+    assert response.status_code == 504
+    assert "Deadline exceeded" in response.json()["message"]
+    # Answered at the deadline, without falling back to the local engine
+    assert time.monotonic() - start < 2.0
+
+def test_timeout_header_is_used_without_a_body_field(client, slow_provider):
+    response = client.post(
+        "/api/v1/transform",
+        json={"text": "hello", "transformation_type": "formal"},
+        headers={"X-Request-Timeout": "0.3"}
+    )
+    assert response.status_code == 504
+    assert client.post(
+        "/api/v1/transform",
+        json={"text": "hello", "transformation_type": "formal"},
+        headers={"X-Request-Timeout": "soon"}
+    ).status_code == 400
+
+def test_batch_marks_deadline_exceeded(client, slow_provider):
+    start = time.monotonic()
+    response = client.post("/api/v1/batch-transform", json={
+        "texts": ["first text", "second text"], "transformation_type": "formal", "timeout": 0.3
+    })
+    assert response.status_code == 200
+    body = response.json()
+    assert body["deadline_exceeded"] is True
+    assert body["failed_transformations"] == 2
+    assert time.monotonic() - start < 2.0
+
+def test_deadline_run_cancels_the_awaitable():
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(Deadline(0.05).run(slow(), "slow stage"))
+    assert cancelled == [True]
+
+def test_quality_retry_is_skipped_once_the_deadline_has_passed(monkeypatch):
+    monkeypatch.setattr(settings, "quality_gate_action", "retry")
+    calls = []
+
+    async def transform_text(text, *args, **kwargs):
+        calls.append(text)
+        return {"original_text": text, "transformed_text": "A rewritten text", "processing_time": 0.1, "engine": "mock"}
+
+    monkeypatch.setattr(text_processor, "transform_text", transform_text)
+    # Unchanged output is flagged for formal, so it would be retried
+    results = [{
+        "original_text": "same text",
+        "transformed_text": "same text",
+        "processing_time": 0.1,
+        "engine": "mock"
+    }]
+    deadline = Deadline(0.01)
+    time.sleep(0.02)
+    reviewed = asyncio.run(quality_gate.review(results, TransformationType.FORMAL, deadline=deadline))
+    assert reviewed[0]["quality_flags"] == ["unchanged"]
+    assert calls == []
+
+    # With budget left the same result is retried
+    reviewed = asyncio.run(quality_gate.review(results, TransformationType.FORMAL, deadline=Deadline(30)))
+    assert calls == ["same text"]
+    assert reviewed[0]["retried"] is True
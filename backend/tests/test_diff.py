@@ -0,0 +1,124 @@
+import difflib
+import random
+import pytest
+from app.core.config import settings
+from app.utils.diff import TOKEN, compute_word_diff
+
+def difflib_counts(original: str, transformed: str) -> dict:
+    matcher = difflib.SequenceMatcher(
+        None, TOKEN.findall(original), TOKEN.findall(transformed), autojunk=False
+    )
+    counts = {"insert": 0, "delete": 0, "replace": 0}
+    for tag, *_ in matcher.get_opcodes():
+        if tag != "equal":
+            counts[tag] += 1
+    return counts
+
+def op_counts(result: dict) -> dict:
+    return {
+        "insert": result["insertions"],
+        "delete": result["deletions"],
+        "replace": result["replacements"]
+    }
+
+def edit_size(result: dict) -> int:
+    """Tokens deleted plus tokens inserted across all change spans."""
+    size = 0
+    for span in result["spans"]:
+        if span["op"] != "equal":
+            size += len(TOKEN.findall(span["original_text"]))
+            size += len(TOKEN.findall(span["transformed_text"]))
+    return size
+
+def assert_spans_consistent(original: str, transformed: str, result: dict):
+    """Spans are ordered, slice the inputs at their offsets and cover every token."""
+    o_pos = t_pos = 0
+    o_tokens, t_tokens = [], []
+    for span in result["spans"]:
+        assert span["original_start"] >= o_pos
+        assert span["transformed_start"] >= t_pos
+        assert original[span["original_start"]:span["original_end"]] == span["original_text"]
+        assert transformed[span["transformed_start"]:span["transformed_end"]] == span["transformed_text"]
+        if span["op"] == "equal":
+            assert span["original_text"] == span["transformed_text"]
+        o_pos, t_pos = span["original_end"], span["transformed_end"]
+        o_tokens += TOKEN.findall(span["original_text"])
+        t_tokens += TOKEN.findall(span["transformed_text"])
+    assert o_tokens == TOKEN.findall(original)
+    assert t_tokens == TOKEN.findall(transformed)
+
+@pytest.mark.parametrize("original, transformed, op", [
+    ("", "Hello there, world.", "insert"),
+    ("Hello there, world.", "", "delete"),
+])
+def test_empty_side_is_a_single_span(original, transformed, op):
+    result = compute_word_diff(original, transformed)
+    assert [span["op"] for span in result["spans"]] == [op]
+    assert op_counts(result) == difflib_counts(original, transformed)
+    assert_spans_consistent(original, transformed, result)
+
+def test_both_empty_has_no_spans():
+    result = compute_word_diff("", "")
+    assert result["spans"] == []
+    assert result["tokens_original"] == result["tokens_transformed"] == 0
+
+def test_identical_text_is_one_equal_span():
+    text = "The quick brown fox jumps over the lazy dog."
+    result = compute_word_diff(text, text)
+    assert [span["op"] for span in result["spans"]] == ["equal"]
+    assert result["spans"][0]["original_text"] == text
+    assert op_counts(result) == {"insert": 0, "delete": 0, "replace": 0}
+
+def test_common_prefix_and_suffix_are_trimmed():
+    original = "We should meet on Monday to talk about the plan."
+    transformed = "We should meet on Friday to talk about the plan."
+    result = compute_word_diff(original, transformed)
+    assert [span["op"] for span in result["spans"]] == ["equal", "replace", "equal"]
+    assert result["spans"][0]["original_text"] == "We should meet on"
+    assert result["spans"][1]["original_text"] == "Monday"
+    assert result["spans"][1]["transformed_text"] == "Friday"
+    assert result["spans"][2]["original_text"] == "to talk about the plan."
+    assert op_counts(result) == difflib_counts(original, transformed)
+    assert_spans_consistent(original, transformed, result)
+
+@pytest.mark.parametrize("original, transformed, expected", [
+    ("I like tea.", "I really do like tea.", {"insert": 1, "delete": 0, "replace": 0}),
+    ("I really do like tea.", "I like tea.", {"insert": 0, "delete": 1, "replace": 0}),
+    ("I like green tea a lot.", "I love black coffee a lot.", {"insert": 0, "delete": 0, "replace": 1}),
+    ("one two three four five six", "one 2 three four 5 six",
+     {"insert": 0, "delete": 0, "replace": 2}),
+    ("a b c d e", "a x b c d e y", {"insert": 2, "delete": 0, "replace": 0}),
+    ("a x b c d e y", "a b c d e", {"insert": 0, "delete": 2, "replace": 0}),
+])
+def test_pure_runs_match_difflib(original, transformed, expected):
+    result = compute_word_diff(original, transformed)
+    assert op_counts(result) == expected
+    assert op_counts(result) == difflib_counts(original, transformed)
+    assert_spans_consistent(original, transformed, result)
+
+def test_edit_script_is_never_longer_than_difflib():
+    rng = random.Random(29)
+    vocabulary = ["the", "a", "cat", "dog", "sat", "ran", "on", "mat", ",", "."]
+    for _ in range(200):
+        original = " ".join(rng.choices(vocabulary, k=rng.randint(0, 30)))
+        transformed = " ".join(rng.choices(vocabulary, k=rng.randint(0, 30)))
+        result = compute_word_diff(original, transformed)
+        assert_spans_consistent(original, transformed, result)
+
+        matcher = difflib.SequenceMatcher(
+            None, TOKEN.findall(original), TOKEN.findall(transformed), autojunk=False
+        )
+        difflib_size = sum(
+            (i2 - i1) + (j2 - j1)
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != "equal"
+        )
+        assert edit_size(result) <= difflib_size
+
+def test_past_max_edits_the_middle_is_one_replace(monkeypatch):
+    monkeypatch.setattr(settings, "diff_max_edits", 2)
+    original = "Start here: a b c d e f. End."
+    transformed = "Start here: u v w x y z. End."
+    result = compute_word_diff(original, transformed)
+    assert [span["op"] for span in result["spans"]] == ["equal", "replace", "equal"]
+    assert result["spans"][1]["original_text"] == "a b c d e f"
+    assert_spans_consistent(original, transformed, result)
@@ -0,0 +1,84 @@
+import asyncio
+import json
+import time
+import pytest
+from app.core.config import settings
+from app.main import app
+from app.services.model_router import model_router, MockProvider
+from app.utils.metrics import metrics
+
+class SlowProvider(MockProvider):
+    """Mock provider that records whether its call was cancelled."""
+
+    def __init__(self):
+        super().__init__(name="slow", latency=5.0)
+        self.cancelled = 0
+
+    async def complete(self, model, messages, timeout):
+        try:
+            return await super().complete(model, messages, timeout)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+@pytest.fixture
+def slow_provider(monkeypatch):
+    provider = SlowProvider()
+    monkeypatch.setitem(model_router.providers, "slow", provider)
+    monkeypatch.setattr(settings, "default_provider", "slow")
+    monkeypatch.setattr(settings, "model_preferences", {})
+    return provider
+
+async def post_then_disconnect(path: str, body: dict, disconnect_after: float) -> list:
+    """Send a request straight to the ASGI app and drop the connection mid-flight."""
+    messages = iter([{"type": "http.request", "body": json.dumps(body).encode(), "more_body": False}])
+    sent = []
+
+    async def receive():
+        message = next(messages, None)
+        if message is not None:
+            return message
+        await asyncio.sleep(disconnect_after)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"testserver"), (b"content-type", b"application/json")],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    await app(scope, receive, send)
+    return sent
+
+@pytest.mark.parametrize("path, route, body", [
+    ("/api/v1/transform", "transform", {"text": "hello there", "transformation_type": "formal"}),
+    ("/api/v1/batch-transform", "batch_transform", {"texts": ["one", "two"], "transformation_type": "formal"}),
+    ("/api/v1/transform/document", "transform_document", {"text": "A paragraph.", "transformation_type": "formal"}),
+])
+def test_disconnect_returns_499_and_cancels_upstream(client, slow_provider, path, route, body):
+    cancelled_before = metrics.get("requests_cancelled", route=route)
+    start = time.monotonic()
+    sent = client.portal.call(post_then_disconnect, path, body, 0.2)
+
+    assert sent[0]["type"] == "http.response.start"
+    assert sent[0]["status"] == 499
+    assert time.monotonic() - start < 2.0
+    assert slow_provider.cancelled >= 1
+    assert metrics.get("requests_cancelled", route=route) == cancelled_before + 1
+
+def test_disconnect_writes_no_history(client, slow_provider):
+    client.portal.call(post_then_disconnect, "/api/v1/transform", {
+        "text": "hello there", "transformation_type": "formal", "user_id": "gone"
+    }, 0.2)
+    assert client.get("/api/v1/history", params={"user_id": "gone"}).json()["items"] == []
@@ -0,0 +1,67 @@
+from app.services.document_processor import split_into_chunks, reassemble
+from app.services.model_router import model_router
+
+PARAGRAPHS = [
+    f"Paragraph {i} talks about topic {i * 7 % 13}. "
+    + " ".join(f"Sentence {j} of part {i} is here." for j in range(i % 5 + 2))
+    for i in range(40)
+]
+DOCUMENT = "\n\n".join(PARAGRAPHS)
+
+def texts(chunks) -> list:
+    return [chunk.text for chunk in chunks]
+
+def test_round_trip_on_paragraph_boundaries():
+    chunks = split_into_chunks(DOCUMENT, 500)
+    assert len(chunks) > 1
+    assert all(len(chunk.text) <= 500 for chunk in chunks)
+    assert reassemble(chunks, texts(chunks)) == DOCUMENT
+
+def test_round_trip_on_sentence_boundaries():
+    # One paragraph longer than a chunk is split between sentences
+    long_paragraph = " ".join(f"This is sentence number {i}." for i in range(60))
+    document = f"Intro.\n\n{long_paragraph}\n\nOutro."
+    chunks = split_into_chunks(document, 200)
+    assert all(len(chunk.text) <= 200 for chunk in chunks)
+    assert all(chunk.text.endswith(".") for chunk in chunks)
+    assert reassemble(chunks, texts(chunks)) == document
+
+def test_oversized_word_is_cut_and_rejoined():
+    chunks = split_into_chunks("x" * 450, 200)
+    assert [len(chunk.text) for chunk in chunks] == [200, 200, 50]
+
+def test_boundaries_are_stable_when_text_is_inserted_earlier():
+    before = texts(split_into_chunks(DOCUMENT, 500))
+    after = texts(split_into_chunks("A brand new opening paragraph.\n\n" + DOCUMENT, 500))
+    shared = 0
+    while shared < min(len(before), len(after)) and before[-1 - shared] == after[-1 - shared]:
+        shared += 1
+    # Only the chunks up to the first content-defined boundary change
+    assert shared >= len(before) - 2
+
+def test_second_run_reuses_the_chunk_cache(client, monkeypatch):
+    provider = model_router.providers["mock"]
+    calls = []
+    complete = provider.complete
+
+    async def counting_complete(model, messages, timeout):
+        calls.append(messages[-1]["content"])
+        return await complete(model, messages, timeout)
+
+    monkeypatch.setattr(provider, "complete", counting_complete)
+    body = {"text": DOCUMENT, "transformation_type": "formal"}
+
+    first = client.post("/api/v1/transform/document", json=body).json()
+    assert first["cached_chunks"] == 0
+    assert len(calls) == first["total_chunks"]
+
+    second = client.post("/api/v1/transform/document", json=body).json()
+    assert second["cached_chunks"] == second["total_chunks"]
+    assert second["transformed_text"] == first["transformed_text"]
+    assert len(calls) == first["total_chunks"]
+
+    # An edit in the first paragraph only re-transforms the chunk it is in
+    edited = {**body, "text": DOCUMENT.replace("Paragraph 0 talks", "Paragraph zero talks")}
+    third = client.post("/api/v1/transform/document", json=edited).json()
+    assert third["cached_chunks"] == third["total_chunks"] - 1
+    assert len(calls) == first["total_chunks"] + 1
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+def history_etag(client, user_id: str = "alice") -> str:
+    response = client.get("/api/v1/history", params={"user_id": user_id})
+    assert response.status_code == 200
+    return response.headers["etag"]
+
+def test_history_returns_304_on_matching_if_none_match(client, add_history):
+    add_history("alice", 2)
+    etag = history_etag(client)
+    assert etag.startswith('W/"')
+
+    response = client.get("/api/v1/history", params={"user_id": "alice"}, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+    # The query is part of the tag
+    other_page = client.get("/api/v1/history", params={"user_id": "alice", "page_size": 5}, headers={"If-None-Match": etag})
+    assert other_page.status_code == 200
+
+def test_history_etag_changes_after_a_transform(client):
+    etag = history_etag(client)
+    client.post("/api/v1/transform", json={"text": "hello there", "transformation_type": "formal", "user_id": "alice"})
+    assert history_etag(client) != etag
+
+def test_history_etag_changes_after_a_delete(client, add_history):
+    first, _ = add_history("alice", 2)
+    etag = history_etag(client)
+    client.request("DELETE", "/api/v1/history", json={"history_ids": [first]})
+    assert history_etag(client) != etag
+
+def test_history_etag_changes_after_a_bulk_update(client, add_history):
+    ids = add_history("alice", 2)
+    etag = history_etag(client)
+    client.post("/api/v1/history/bulk", json={"user_id": "alice", "history_ids": ids, "action": "save"})
+    assert history_etag(client) != etag
+
+def test_history_etag_changes_after_cleanup(client, add_history):
+    add_history("alice", 1, created_at=datetime.now() - timedelta(days=30))
+    add_history("bob", 1)
+    alice, bob = history_etag(client, "alice"), history_etag(client, "bob")
+    assert client.delete("/api/v1/history/cleanup").json()["deleted_count"] == 1
+    assert history_etag(client, "alice") != alice
+    # Users whose history did not change keep their tag
+    assert history_etag(client, "bob") == bob
+
+def test_history_etag_unchanged_by_other_users(client, add_history):
+    etag = history_etag(client)
+    ids = add_history("bob", 1)
+    client.post("/api/v1/history/bulk", json={"user_id": "bob", "history_ids": ids, "action": "save"})
+    assert history_etag(client) == etag
+
+def test_transformations_strong_etag_and_304(client):
+    response = client.get("/api/v1/transformations")
+    etag = response.headers["etag"]
+    assert response.status_code == 200 and not etag.startswith("W/")
+
+    cached = client.get("/api/v1/transformations", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    # Weak comparison, as for GET requests
+    assert client.get("/api/v1/transformations", headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+    assert client.get("/api/v1/transformations", headers={"If-None-Match": '"other"'}).status_code == 200
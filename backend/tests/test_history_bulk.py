@@ -0,0 +1,69 @@
+import pytest
+from app.core.database import SessionLocal, engine
+from app.models.database import TransformationHistory
+
+def saved_and_tags(history_id: str) -> tuple:
+    db = SessionLocal()
+    try:
+        row = db.get(TransformationHistory, history_id)
+        return row.is_saved, row.tags
+    finally:
+        db.close()
+
+@pytest.fixture(params=[True, False], ids=["returning", "select-then-update"])
+def update_returning(request, monkeypatch):
+    """Run each test with and without UPDATE ... RETURNING support."""
+    monkeypatch.setattr(engine.dialect, "update_returning", request.param)
+
+def bulk(client, **body) -> dict:
+    response = client.post("/api/v1/history/bulk", json=body)
+    assert response.status_code == 200
+    return response.json()
+
+def test_other_users_items_are_not_updated(client, add_history, update_returning):
+    bob_ids = add_history("bob", 2)
+    result = bulk(client, user_id="alice", history_ids=bob_ids, action="save")
+    assert result["updated_count"] == 0
+    assert result["not_found_count"] == 2
+    assert [item["status"] for item in result["results"]] == ["not_found", "not_found"]
+    assert all(saved_and_tags(history_id) == (False, None) for history_id in bob_ids)
+
+def test_unknown_and_foreign_ids_are_reported_not_found(client, add_history, update_returning):
+    alice_ids = add_history("alice", 2)
+    bob_id, = add_history("bob", 1)
+    history_ids = [alice_ids[0], "missing-id", bob_id, alice_ids[1], alice_ids[0]]
+    result = bulk(client, user_id="alice", history_ids=history_ids, action="save")
+
+    assert result["updated_count"] == 2
+    assert result["not_found_count"] == 2
+    # Duplicates are collapsed, order is kept
+    assert result["results"] == [
+        {"history_id": alice_ids[0], "status": "updated"},
+        {"history_id": "missing-id", "status": "not_found"},
+        {"history_id": bob_id, "status": "not_found"},
+        {"history_id": alice_ids[1], "status": "updated"},
+    ]
+    assert saved_and_tags(alice_ids[0])[0] is True
+    assert saved_and_tags(bob_id)[0] is False
+
+def test_tag_and_unsave(client, add_history, update_returning):
+    history_id, = add_history("alice", 1, is_saved=True)
+    bulk(client, user_id="alice", history_ids=[history_id], action="tag", tags=[" work ", "work", "draft", ""])
+    assert saved_and_tags(history_id) == (True, ["work", "draft"])
+
+    bulk(client, user_id="alice", history_ids=[history_id], action="unsave")
+    assert saved_and_tags(history_id) == (False, ["work", "draft"])
+
+    bulk(client, user_id="alice", history_ids=[history_id], action="tag", tags=[])
+    assert saved_and_tags(history_id) == (False, None)
+
+def test_tags_are_only_accepted_with_tag_action(client, add_history):
+    history_id, = add_history("alice", 1)
+    response = client.post("/api/v1/history/bulk", json={
+        "user_id": "alice", "history_ids": [history_id], "action": "save", "tags": ["x"]
+    })
+    assert response.status_code == 400
+    response = client.post("/api/v1/history/bulk", json={
+        "user_id": "alice", "history_ids": [history_id], "action": "tag"
+    })
+    assert response.status_code == 400
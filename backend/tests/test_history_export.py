@@ -0,0 +1,62 @@
+import csv
+import gzip
+import io
+import json
+from datetime import datetime, timedelta
+import pytest
+from app.core.config import settings
+
+def exported_ids(response, format: str, compressed: bool) -> list:
+    body = gzip.decompress(response.content) if compressed else response.content
+    text = body.decode("utf-8")
+    if format == "csv":
+        rows = list(csv.DictReader(io.StringIO(text)))
+    else:
+        rows = [json.loads(line) for line in text.splitlines()]
+    return [row["id"] for row in rows]
+
+@pytest.mark.parametrize("compressed", [False, True], ids=["plain", "gzip"])
+@pytest.mark.parametrize("format", ["jsonl", "csv"])
+def test_export_pages_through_equal_timestamps(client, add_history, monkeypatch, format, compressed):
+    monkeypatch.setattr(settings, "history_export_batch_size", 3)
+    start = datetime(2026, 1, 1, 12, 0, 0)
+    # Eight rows share one created_at, so page boundaries fall inside the tie
+    ids = add_history("alice", 2, created_at=start - timedelta(minutes=1))
+    ids += add_history("alice", 8, created_at=start)
+    ids += add_history("alice", 3, created_at=start + timedelta(minutes=1))
+    add_history("bob", 4, created_at=start)
+
+    response = client.get("/api/v1/history/export", params={
+        "user_id": "alice", "format": format, "gzip": compressed
+    })
+    assert response.status_code == 200
+    assert response.headers["content-disposition"].endswith(
+        f'history.{format}{".gz" if compressed else ""}"'
+    )
+
+    exported = exported_ids(response, format, compressed)
+    # Every row exactly once, ordered by (created_at, id)
+    assert len(exported) == len(set(exported)) == 13
+    assert exported[:2] == sorted(ids[:2])
+    assert exported[2:10] == sorted(ids[2:10])
+    assert exported[10:] == sorted(ids[10:])
+
+def test_export_filters_by_time_window(client, add_history, monkeypatch):
+    monkeypatch.setattr(settings, "history_export_batch_size", 2)
+    start = datetime(2026, 1, 1, 12, 0, 0)
+    add_history("alice", 3, created_at=start - timedelta(hours=1))
+    inside = add_history("alice", 5, created_at=start)
+    add_history("alice", 3, created_at=start + timedelta(hours=1))
+
+    response = client.get("/api/v1/history/export", params={
+        "user_id": "alice",
+        "since": start.isoformat(),
+        "until": (start + timedelta(minutes=30)).isoformat()
+    })
+    assert exported_ids(response, "jsonl", False) == sorted(inside)
+
+def test_export_of_empty_history(client):
+    csv_export = client.get("/api/v1/history/export", params={"user_id": "nobody", "format": "csv"})
+    assert csv_export.text.splitlines()[0].startswith("id,")
+    assert len(csv_export.text.splitlines()) == 1
+    assert client.get("/api/v1/history/export", params={"user_id": "nobody"}).content == b""
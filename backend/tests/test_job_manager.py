@@ -0,0 +1,46 @@
+import asyncio
+from sqlalchemy.orm import sessionmaker
+from app.core.database import create_db_engine
+from app.models.database import Base, TransformationJob
+from app.models.schemas import TransformationType
+from app.services import job_manager as job_manager_module
+from app.services.job_manager import job_manager
+
+def test_cancel_after_last_page_is_not_overwritten(tmp_path, monkeypatch):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = Session()
+    job = job_manager.submit(db, ["one", "two"], TransformationType.FORMAL)
+    job_id = job.id
+    db.close()
+
+    async def process_items(items, *args):
+        return [
+            {"transformed_text": item.original_text.upper(), "processing_time": 0.0, "engine": "mock"}
+            for item in items
+        ]
+
+    def worker_session():
+        # Cancel from another session right after the worker's last status check
+        session = Session()
+        refresh = session.refresh
+
+        def refresh_then_cancel(instance, *args, **kwargs):
+            refresh(instance, *args, **kwargs)
+            other = Session()
+            job_manager.cancel(other, other.get(TransformationJob, job_id))
+            other.close()
+
+        session.refresh = refresh_then_cancel
+        return session
+
+    monkeypatch.setattr(job_manager, "_process_items", process_items)
+    monkeypatch.setattr(job_manager_module, "SessionLocal", worker_session)
+    asyncio.run(job_manager._run_job(job_id))
+
+    db = Session()
+    assert db.get(TransformationJob, job_id).status == "cancelled"
+    db.close()
+    engine.dispose()
@@ -0,0 +1,36 @@
+import pytest
+from app.models.schemas import TransformationType
+from app.services.local_engine import local_engine, TWEET_LIMIT
+
+def grammar_fix(text: str) -> str:
+    return local_engine.transform(text, TransformationType.GRAMMAR_FIX)
+
+def test_real_words_are_not_treated_as_shorthand():
+    result = grammar_fix("the user id in r package, u know it is his wont")
+    assert "user id" in result
+    assert "r package" in result
+    assert "u know" in result
+    assert "his wont" in result
+
+def test_standalone_lowercase_shorthand_is_expanded():
+    assert grammar_fix("i dont know, thx") == "I don't know, thanks."
+    assert "DONT" in grammar_fix("DONT shout")
+
+def test_urls_emails_and_times_keep_their_punctuation():
+    result = grammar_fix("see http://example.com/a,b or mail me@example.com,thanks at 10:30")
+    assert "http://example.com/a,b" in result
+    assert "me@example.com,thanks" in result
+    assert "10:30" in result
+
+def test_missing_space_after_comma_is_inserted():
+    assert grammar_fix("hello,world") == "Hello, world."
+
+@pytest.mark.parametrize("text", [
+    "x" * 400,
+    "word " + "y" * 400,
+    "a " * 300,
+    "supercalifragilisticexpialidocious " * 10 + "z" * 300,
+])
+def test_tweetify_never_exceeds_limit(text):
+    result = local_engine.transform(text, TransformationType.TWEETIFY)
+    assert 0 < len(result) <= TWEET_LIMIT
@@ -0,0 +1,45 @@
+from app.core.config import settings
+from app.models.schemas import TransformationType
+from app.services import model_router
+from app.services.model_router import ModelRouter, MockProvider, create_router
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+def test_unhealthy_route_is_probed_and_recovers(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(model_router.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(settings, "router_probe_interval", 30.0)
+    monkeypatch.setattr(settings, "default_provider", "primary")
+    monkeypatch.setattr(settings, "default_model", "m1")
+    monkeypatch.setattr(settings, "model_preferences", {"formal": ["backup:m2"]})
+    router = ModelRouter()
+    primary, backup = MockProvider(name="primary"), MockProvider(name="backup")
+    router.register(primary)
+    router.register(backup)
+
+    for _ in range(settings.router_min_samples):
+        router.record(primary, "m1", 1.0, ok=False)
+        router.record(backup, "m2", 1.0, ok=True)
+
+    # The first call claims the probe; later calls inside the interval skip the route
+    assert router.candidates(TransformationType.FORMAL)[0][0] is primary
+    assert router.candidates(TransformationType.FORMAL)[0][0] is backup
+
+    clock.now += 31.0
+    assert router.candidates(TransformationType.FORMAL)[0][0] is primary
+    router.record(primary, "m1", 0.1, ok=True)
+    assert router.stats[("primary", "m1")].healthy
+
+def test_mock_provider_not_registered_in_production(monkeypatch):
+    monkeypatch.setattr(settings, "environment", "production")
+    monkeypatch.setattr(settings, "default_provider", "groq")
+    monkeypatch.setattr(settings, "providers", {})
+    assert "mock" not in create_router().providers
+
+    monkeypatch.setattr(settings, "environment", "development")
+    assert "mock" in create_router().providers
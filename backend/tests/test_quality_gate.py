@@ -0,0 +1,46 @@
+import pytest
+from app.models.schemas import TransformationType
+from app.services.quality_gate import quality_gate
+
+def flags(transformation_type: TransformationType, original: str, transformed: str, similarity: float) -> list:
+    result = {
+        "original_text": original,
+        "transformed_text": transformed,
+        "similarity": similarity,
+        "length_ratio": len(transformed) / max(len(original), 1)
+    }
+    return quality_gate._flags(result, quality_gate.thresholds(transformation_type))
+
+def test_unchanged_is_allowed_only_for_grammar_fix():
+    text = "This sentence is already fine."
+    assert flags(TransformationType.GRAMMAR_FIX, text, text, 1.0) == []
+    assert flags(TransformationType.FORMAL, text, text, 1.0) == ["unchanged"]
+
+@pytest.mark.parametrize("transformation_type, similarity, expected", [
+    (TransformationType.GRAMMAR_FIX, 0.1, ["drift"]),
+    (TransformationType.GRAMMAR_FIX, 0.3, []),
+    (TransformationType.EMOJI, 0.2, ["drift"]),
+    (TransformationType.FORMAL, 0.1, []),
+])
+def test_drift_threshold_per_type(transformation_type, similarity, expected):
+    assert flags(transformation_type, "a" * 100, "b" * 100, similarity) == expected
+
+@pytest.mark.parametrize("transformation_type, length, expected", [
+    (TransformationType.SHORTEN, 50, []),
+    (TransformationType.SHORTEN, 110, ["too_long"]),
+    (TransformationType.EXPAND, 90, ["too_short"]),
+    (TransformationType.EXPAND, 300, []),
+    (TransformationType.FORMAL, 20, ["too_short"]),
+    (TransformationType.FORMAL, 500, ["too_long"]),
+])
+def test_length_ratio_bounds_per_type(transformation_type, length, expected):
+    assert flags(transformation_type, "a" * 100, "b" * length, 0.5) == expected
+
+def test_tweetify_flags_over_char_limit():
+    assert flags(TransformationType.TWEETIFY, "a" * 1000, "b" * 280, 0.5) == []
+    assert flags(TransformationType.TWEETIFY, "a" * 1000, "b" * 281, 0.5) == ["over_char_limit"]
+
+def test_configured_override_wins(monkeypatch):
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "quality_thresholds", {"formal": {"min_similarity": 0.5}})
+    assert flags(TransformationType.FORMAL, "a" * 100, "b" * 100, 0.4) == ["drift"]
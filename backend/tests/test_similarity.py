@@ -0,0 +1,42 @@
+import pytest
+from app.utils.similarity import SimilarityScorer
+
+@pytest.fixture
+def scorer() -> SimilarityScorer:
+    return SimilarityScorer()
+
+def test_identical_text_scores_one(scorer):
+    text = "The quick brown fox jumps over the lazy dog. The dog sleeps."
+    similarity, length_ratio = scorer.score_batch([text], [text])
+    assert similarity[0] == 1.0
+    assert length_ratio[0] == 1.0
+
+def test_disjoint_text_scores_about_zero(scorer):
+    original = " ".join(f"alpha{i}" for i in range(200))
+    transformed = " ".join(f"omega{i}" for i in range(200))
+    similarity, _ = scorer.score_batch([original], [transformed])
+    assert similarity[0] < 0.05
+
+def test_overlap_is_estimated_near_jaccard(scorer):
+    # 100 shared words out of 300 distinct: Jaccard 1/3
+    shared = [f"shared{i}" for i in range(100)]
+    original = " ".join(shared + [f"left{i}" for i in range(100)])
+    transformed = " ".join(shared + [f"right{i}" for i in range(100)])
+    similarity, _ = scorer.score_batch([original], [transformed])
+    assert abs(similarity[0] - 1 / 3) < 0.2
+
+def test_repeats_and_case_do_not_change_the_word_set(scorer):
+    similarity, _ = scorer.score_batch(["Hello world"], ["hello hello WORLD world!"])
+    assert similarity[0] == 1.0
+
+def test_length_ratio_per_pair(scorer):
+    similarity, length_ratio = scorer.score_batch(
+        ["abcd", "abcdefghij", ""],
+        ["abcdefgh", "abcde", "xyz"]
+    )
+    assert list(length_ratio) == [2.0, 0.5, 3.0]
+    assert len(similarity) == 3
+
+def test_empty_batch(scorer):
+    similarity, length_ratio = scorer.score_batch([], [])
+    assert len(similarity) == 0 and len(length_ratio) == 0
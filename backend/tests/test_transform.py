@@ -0,0 +1,25 @@
+from app.utils.helpers import prepare_text
+
+# Sanitizing drops "javascript:" entirely, so a raw split over-counts by one
+RAW = "  hello   javascript: world  "
+
+def history_item(client, user_id: str) -> dict:
+    return client.get("/api/v1/history", params={"user_id": user_id}).json()["items"][0]
+
+def test_chain_word_count_matches_prepared_text(client):
+    expected = prepare_text(RAW).word_count
+    client.post("/api/v1/transform", json={
+        "text": "hello world",
+        "original_text": RAW,
+        "transformation_type": "formal",
+        "user_id": "chain"
+    })
+    client.post("/api/v1/transform", json={"text": RAW, "transformation_type": "friendly", "user_id": "single"})
+    assert history_item(client, "chain")["word_count_original"] == expected
+    assert history_item(client, "single")["word_count_original"] == expected
+
+def test_cache_hit_returns_the_same_original_text_as_a_miss(client):
+    body = {"text": RAW, "transformation_type": "formal"}
+    miss = client.post("/api/v1/transform", json=body).json()
+    hit = client.post("/api/v1/transform", json=body).json()
+    assert miss["original_text"] == hit["original_text"] == prepare_text(RAW).text
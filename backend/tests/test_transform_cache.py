@@ -0,0 +1,45 @@
+import json
+import pytest
+from app.core.config import settings
+from app.services.model_router import model_router, MockProvider
+from app.utils.helpers import cache
+
+@pytest.fixture
+def fallback_routes(monkeypatch):
+    """Formal requests fail on "broken" and fall back to "backup"."""
+    monkeypatch.setitem(model_router.providers, "broken", MockProvider(name="broken", fail_rate=1.0))
+    monkeypatch.setitem(model_router.providers, "backup", MockProvider(name="backup"))
+    monkeypatch.setattr(settings, "model_preferences", {"formal": ["broken:b0", "backup:b1"]})
+
+def test_cache_hit_reports_the_provider_that_produced_it(client, fallback_routes):
+    body = {"text": "please send the report today", "transformation_type": "formal"}
+    first = client.post("/api/v1/transform", json=body).json()
+    assert (first["engine"], first["model"]) == ("backup", "b1")
+
+    second = client.post("/api/v1/transform", json=body).json()
+    assert cache.stats["formal"]["hits"] == 1
+    assert (second["engine"], second["model"]) == ("backup", "b1")
+    assert second["transformed_text"] == first["transformed_text"]
+
+def test_document_chunk_cache_hit_reports_the_provider(client, fallback_routes):
+    body = {"text": "First paragraph here.\n\nSecond paragraph here.", "transformation_type": "formal", "stream": True}
+    client.post("/api/v1/transform/document", json=body)
+    lines = client.post("/api/v1/transform/document", json=body).text.splitlines()
+    chunks = [json.loads(line) for line in lines if '"chunk"' in line]
+    assert chunks and all(chunk["cached"] for chunk in chunks)
+    assert all((chunk["engine"], chunk["model"]) == ("backup", "b1") for chunk in chunks)
+
+def test_cache_hit_reuses_quality_scores_without_rescoring(client, monkeypatch):
+    from app.services.quality_gate import quality_gate
+    body = {"text": "hello there my good friend", "transformation_type": "friendly"}
+    first = client.post("/api/v1/transform", json=body)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cache hits must not be re-scored")
+
+    monkeypatch.setattr(quality_gate, "score", fail)
+    second = client.post("/api/v1/transform", json=body)
+    assert second.status_code == 200
+    assert "quality;" not in second.headers["server-timing"]
+    for name in ("similarity", "length_ratio", "quality_flags"):
+        assert second.json()[name] == first.json()[name]
@@ -0,0 +1,101 @@
+from datetime import date, datetime, timedelta
+import pytest
+import rebuild_rollups
+from app.core.database import SessionLocal, engine, init_db
+from app.models.database import Base, TransformationHistory, UsageRollup
+from app.services import usage_rollup as usage_rollup_module
+from app.services.usage_rollup import usage_rollups, COUNTERS
+
+DAY = datetime(2026, 3, 1, 9, 0, 0)
+
+@pytest.fixture
+def db():
+    Base.metadata.drop_all(bind=engine)
+    init_db()
+    session = SessionLocal()
+    yield session
+    session.close()
+
+def history(user_id: str, transformation_type: str, created_at: datetime, words: int, cache_hit: bool = False):
+    return TransformationHistory(
+        user_id=user_id,
+        original_text="x",
+        transformed_text="y",
+        transformation_type=transformation_type,
+        processing_time=0.25,
+        word_count_original=words,
+        word_count_transformed=words + 1,
+        cache_hit=cache_hit,
+        created_at=created_at
+    )
+
+def write(db, records: list):
+    """Insert history and record its usage in one transaction, as the routes do."""
+    db.add_all(records)
+    usage_rollups.record(db, records)
+    db.commit()
+
+def snapshot(db) -> dict:
+    return {
+        (row.day, row.user_id, row.transformation_type): {
+            name: round(getattr(row, name), 6) for name in COUNTERS
+        }
+        for row in db.query(UsageRollup)
+    }
+
+def test_upsert_adds_to_existing_counters(db):
+    write(db, [history("alice", "formal", DAY, 10)])
+    write(db, [history("alice", "formal", DAY + timedelta(hours=2), 5, cache_hit=True)])
+    # Two records for the same key in one batch
+    write(db, [history("alice", "formal", DAY, 1), history("alice", "formal", DAY, 2)])
+
+    assert snapshot(db) == {
+        (DAY.date(), "alice", "formal"): {
+            "requests": 4, "words_in": 18, "words_out": 22, "processing_time": 1.0, "cache_hits": 1
+        }
+    }
+
+def test_incremental_rollups_match_a_full_rebuild(db):
+    for offset in range(3):
+        created_at = DAY + timedelta(days=offset)
+        write(db, [history("alice", "formal", created_at, 10 + offset), history("bob", "shorten", created_at, 4)])
+        write(db, [history("alice", "formal", created_at + timedelta(hours=1), 3, cache_hit=True)])
+        write(db, [history("alice", "emoji", created_at, 7)])
+
+    incremental = snapshot(db)
+    assert usage_rollups.rebuild(db) == len(incremental)
+    db.commit()
+    assert snapshot(db) == incremental
+
+def test_rebuild_since_keeps_earlier_days(db):
+    write(db, [history("alice", "formal", DAY, 10)])
+    write(db, [history("alice", "formal", DAY + timedelta(days=1), 10)])
+    before = snapshot(db)
+
+    # Usage deleted from history only disappears from days that are rebuilt
+    db.query(TransformationHistory).delete()
+    db.commit()
+    usage_rollups.rebuild(db, since=(DAY + timedelta(days=1)).date())
+    db.commit()
+    assert snapshot(db) == {key: value for key, value in before.items() if key[0] == DAY.date()}
+
+def test_fallback_without_on_conflict_matches_upsert(db, monkeypatch):
+    monkeypatch.setattr(usage_rollup_module, "upsert_insert", lambda session: None)
+    write(db, [history("alice", "formal", DAY, 10)])
+    write(db, [history("alice", "formal", DAY, 5), history("bob", "formal", DAY, 1)])
+    incremental = snapshot(db)
+    assert incremental[(DAY.date(), "alice", "formal")]["requests"] == 2
+
+    usage_rollups.rebuild(db)
+    db.commit()
+    assert snapshot(db) == incremental
+
+def test_rebuild_script_matches_incremental_rollups(db, capsys):
+    write(db, [history("alice", "formal", DAY, 10), history("bob", "bullet", DAY, 3)])
+    write(db, [history("alice", "formal", DAY, 2, cache_hit=True)])
+    incremental = snapshot(db)
+
+    rebuild_rollups.rebuild(date(2026, 1, 1))
+    assert "Rebuilt 2 usage rollups" in capsys.readouterr().out
+    db.expire_all()
+    assert snapshot(db) == incremental
@@ -143,6 +143,32 @@ export const saveHistoryItem = async (historyId) => {
   }
 };
 
+// action: 'save' | 'unsave' | 'tag' (tags replaces the items' tags)
+export const updateHistoryItems = async (historyIds, action, tags = null) => {
+  try {
+    const response = await fetch(`${API_BASE_URL}/api/v1/history/bulk`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({
+        user_id: getUserId(),
+        history_ids: historyIds,
+        action,
+        ...(tags !== null && { tags })
+      })
+    });
+    
+    if (!response.ok) {
+      throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+    }
+    
+    const data = await response.json();
+    return { success: true, ...data };
+  } catch (error) {
+    console.error('Bulk history update failed:', error);
+    return { success: false, message: error.message || 'Failed to update items' };
+  }
+};
+
 export const deleteHistoryItems = async (historyIds) => {
   try {
     const response = await fetch(`${API_BASE_URL}/api/v1/history`, {